@@ -1,65 +1,103 @@
-import numpy as np
 import polars as pl
 
+from LongCSVReader import LongCSVReader
+
 class FCFFBuilder:
 
-    def __init__(self) -> None:
-        pass
-    
+    def __init__(self, entity_col: str | None = None) -> None:
+        """
+        `entity_col` names the company column of a multi-entity wide frame (as produced
+        by LongCSVReader(entity_col=...)); period differences then never cross entities.
+        """
+        self.entity_col = entity_col
+
     @staticmethod
-    def compute_delta_nwc(df_wide: pl.DataFrame) -> pl.DataFrame:
+    def delta_nwc_expr(columns: list[str], entity_col: str | None = None) -> pl.Expr:
         """
         ΔNWC = (AR + Inventory - AP)_t - (AR + Inventory - AP)_{t-1}
         Falls back to provided ChangeIn* columns if raw levels are missing.
+        Rows must be sorted by period (within each entity when `entity_col` is given).
         """
-        has_raw = all(c in df_wide.columns for c in ("AccountsReceivable", "Inventory", "AccountsPayable"))
+        has_raw = all(c in columns for c in ("AccountsReceivable", "Inventory", "AccountsPayable"))
         if has_raw:
-            df = df_wide.with_columns(
-                (pl.col("AccountsReceivable").fill_null(0)
-                 + pl.col("Inventory").fill_null(0)
-                 - pl.col("AccountsPayable").fill_null(0)).alias("NWC_level")
-            ).with_columns(
-                (pl.col("NWC_level") - pl.col("NWC_level").shift(1)).alias("DeltaNWC")
-            ).drop("NWC_level")
-        else:
-            for c in ("ChangeInAR", "ChangeInInventory", "ChangeInAP"):
-                if c not in df_wide.columns:
-                    raise ValueError("NWC inputs missing and no change-series found.")
-            df = df_wide.with_columns(
-                (pl.col("ChangeInAR").fill_null(0)
-                 + pl.col("ChangeInInventory").fill_null(0)
-                 - pl.col("ChangeInAP").fill_null(0)).alias("DeltaNWC")
-            )
-        return df
+            level = (pl.col("AccountsReceivable").fill_null(0)
+                     + pl.col("Inventory").fill_null(0)
+                     - pl.col("AccountsPayable").fill_null(0))
+            prev_level = level.shift(1)
+            if entity_col:
+                prev_level = prev_level.over(entity_col)
+            return (level - prev_level).alias("DeltaNWC")
+
+        for c in ("ChangeInAR", "ChangeInInventory", "ChangeInAP"):
+            if c not in columns:
+                raise ValueError("NWC inputs missing and no change-series found.")
+        return (pl.col("ChangeInAR").fill_null(0)
+                + pl.col("ChangeInInventory").fill_null(0)
+                - pl.col("ChangeInAP").fill_null(0)).alias("DeltaNWC")
 
     @staticmethod
-    def estimate_tax_rate(df: pl.DataFrame) -> pl.Series:
+    def tax_rate_expr(columns: list[str]) -> pl.Expr:
         """Effective tax rate per year ≈ TaxExpense / max(EBT, small_positive), clamped to [0, 0.5]."""
-        if "EBT" not in df.columns or "TaxExpense" not in df.columns:
-            return pl.Series([0.21] * df.height)  # fallback
-        ebt_np = np.maximum(df.get_column("EBT").fill_null(0).to_numpy(), 1e-9)
-        tax_np = np.maximum(df.get_column("TaxExpense").fill_null(0).to_numpy(), 0)
-        rate = np.clip(tax_np / ebt_np, 0.0, 0.5)
-        return pl.Series(rate)
+        if "EBT" not in columns or "TaxExpense" not in columns:
+            return pl.lit(0.21).alias("TaxRateEst")  # fallback
+        ebt = pl.max_horizontal(pl.col("EBT").fill_null(0), pl.lit(1e-9))
+        tax = pl.max_horizontal(pl.col("TaxExpense").fill_null(0), pl.lit(0))
+        return (tax / ebt).clip(0.0, 0.5).alias("TaxRateEst")
+
+    @classmethod
+    def compute_delta_nwc(cls, df_wide: pl.DataFrame, entity_col: str | None = None) -> pl.DataFrame:
+        return df_wide.with_columns(cls.delta_nwc_expr(df_wide.columns, entity_col))
 
-    def compute_fcff(self, df_wide: pl.DataFrame) -> pl.DataFrame:
+    @classmethod
+    def estimate_tax_rate(cls, df: pl.DataFrame) -> pl.Series:
+        # with_columns, not select: the 0.21 fallback is a literal and only with_columns
+        # broadcasts it to one value per row
+        return df.with_columns(cls.tax_rate_expr(df.columns).cast(pl.Float64)).get_column("TaxRateEst")
+
+    def fcff_plan(self, lf: pl.LazyFrame) -> pl.LazyFrame:
+        """
+        The whole FCFF computation as one lazy query, so polars can optimise and run
+        it multithreaded over a multi-company frame (or straight from a file scan):
+
+            FCFF = OperatingIncome * (1 - TaxRateEst) + DA - Capex - ΔNWC
+        """
+        columns = lf.collect_schema().names()
         required = ["OperatingIncome", "DepreciationAmortization", "Capex"]
         for c in required:
-            if c not in df_wide.columns:
+            if c not in columns:
                 raise ValueError(f"{c} is required to compute FCFF.")
-        df = self.compute_delta_nwc(df_wide)
-        tax_rate = self.estimate_tax_rate(df)
 
-        df = df.with_columns(pl.Series("TaxRateEst", tax_rate))
+        # Two stages so the windowed ΔNWC and the tax rate are evaluated once and the
+        # FCFF expressions read them back as columns; polars still runs it as one query.
+        return (
+            lf.with_columns([
+                self.delta_nwc_expr(columns, self.entity_col),
+                self.tax_rate_expr(columns),
+            ])
+            .with_columns([
+                (pl.col("OperatingIncome") * (1 - pl.col("TaxRateEst"))).alias("NOPAT"),
+                pl.col("DepreciationAmortization").alias("DA"),
+                pl.col("Capex").alias("CapexOut"),
+            ])
+            .with_columns(
+                (pl.col("NOPAT") + pl.col("DA") - pl.col("CapexOut") - pl.col("DeltaNWC")).alias("FCFF")
+            )
+        )
 
-        df = df.with_columns([
-            (pl.col("OperatingIncome") * (1 - pl.col("TaxRateEst"))).alias("NOPAT"),
-            pl.col("DepreciationAmortization").alias("DA"),
-            pl.col("Capex").alias("CapexOut"),
-        ])
+    def compute_fcff(self, df_wide: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame:
+        return self.fcff_plan(df_wide.lazy()).collect()
 
-        df = df.with_columns(
-            (pl.col("NOPAT") + pl.col("DA") - pl.col("CapexOut") - pl.col("DeltaNWC")).alias("FCFF")
-        )
+    def scan_fcff(self, path: str, memory_map: bool = True) -> pl.LazyFrame:
+        """Lazy FCFF plan over a wide table stored as Parquet, Arrow IPC (memory-mapped) or CSV."""
+        fmt = LongCSVReader._format(path)
+        if fmt == "parquet":
+            lf = pl.scan_parquet(path)
+        elif fmt == "ipc":
+            lf = pl.scan_ipc(path, memory_map=memory_map)
+        else:
+            lf = pl.scan_csv(path)
+        return self.fcff_plan(lf)
 
-        return df
\ No newline at end of file
+    def compute_fcff_from_file(self, path: str, memory_map: bool = True) -> pl.DataFrame:
+        """Runs compute_fcff on a wide table stored as Parquet, Arrow IPC (memory-mapped) or CSV."""
+        return self.scan_fcff(path, memory_map=memory_map).collect()
@@ -1,39 +1,177 @@
+from pathlib import Path
+from typing import Iterable
 import polars as pl
 
 class LongCSVReader:
 
     REQUIRED_COLS = ("Year", "Metric", "Value")
+    PARQUET_SUFFIXES = (".parquet", ".pq")
+    IPC_SUFFIXES = (".arrow", ".ipc", ".feather")
 
-    def __init__(self, infer_schema_length: int = 2000) -> None:
+    def __init__(self, infer_schema_length: int = 2000, entity_col: str | None = None,
+                 period_col: str = "Year", period_dtype: pl.DataType = pl.Int64) -> None:
+        """
+        `entity_col` names an optional ticker/company column for files covering many
+        entities. `period_col`/`period_dtype` select the period column, e.g.
+        ("Year", pl.Int64) or ("Period", pl.Utf8) for fiscal quarters like "2024Q3".
+        """
         self.infer_schema_length = infer_schema_length
+        self.entity_col = entity_col
+        self.period_col = period_col
+        self.period_dtype = period_dtype
 
-    def read_to_df(self, csv_path: str) -> pl.DataFrame:
-        df_long = pl.read_csv(csv_path, infer_schema_length=self.infer_schema_length).drop_nulls()
-        for col in self.REQUIRED_COLS:
+    @property
+    def index_cols(self) -> list[str]:
+        """Row key of the wide table: (entity, period) or just period."""
+        return ([self.entity_col] if self.entity_col else []) + [self.period_col]
+
+    @property
+    def required_cols(self) -> tuple[str, ...]:
+        return tuple(self.index_cols) + ("Metric", "Value")
+
+    def _casts(self) -> list[pl.Expr]:
+        casts = [
+            pl.col("Metric").cast(pl.Utf8),
+            pl.col(self.period_col).cast(self.period_dtype, strict=False),
+            pl.col("Value").cast(pl.Float64, strict=False)
+        ]
+        if self.entity_col:
+            casts.append(pl.col(self.entity_col).cast(pl.Utf8))
+        return casts
+
+    def _valid_rows(self) -> pl.Expr:
+        return (
+            pl.all_horizontal([pl.col(c).is_not_null() for c in self.required_cols])
+            & (pl.col("Metric") != "")
+        )
+
+    def read_to_df(self, csv_path: str, lazy: bool = False,
+                   years: Iterable[int] | None = None, metrics: Iterable[str] | None = None) -> pl.DataFrame:
+        """
+        Reads a long (Year, Metric, Value) CSV and pivots it to one row per Year
+        (one row per entity and period when `entity_col` is set).
+
+        With `lazy=True` the file is scanned instead of loaded: only the required
+        columns are read, the `years`/`metrics` filters are pushed down into the scan,
+        and duplicates are collapsed with the streaming engine before the pivot, so
+        peak memory follows the wide output rather than the input file.
+        Long Parquet and Arrow IPC files (by suffix) always take the scan path.
+        """
+        if lazy or years is not None or metrics is not None or self._format(csv_path) != "csv":
+            return self._pivot(self.scan(csv_path, years=years, metrics=metrics).collect(engine="streaming"))
+
+        df_long = pl.read_csv(csv_path, infer_schema_length=self.infer_schema_length)
+        for col in self.required_cols:
             if col not in df_long.columns:
                 raise ValueError(f"Missing required column: {col}")
-        
+
         df_long = (
             df_long
-            .with_columns([
-                pl.col("Metric").cast(pl.Utf8),
-                pl.col("Year").cast(pl.Int64, strict=False),
-                pl.col("Value").cast(pl.Float64, strict=False)
-            ])
-            .filter(
-                pl.col("Year").is_not_null()
-                & pl.col("Metric").is_not_null()
-                & (pl.col("Metric") != "")
-                & pl.col("Value").is_not_null()
-            )
+            .with_columns(self._casts())
+            .filter(self._valid_rows())
             # If any duplicate (Year, Metric) slip in, keep the first
-            .unique(subset=["Year", "Metric"], keep="first")
+            .unique(subset=self.index_cols + ["Metric"], keep="first", maintain_order=True)
         )
 
-        df_wide = df_long.pivot(values="Value", index="Year", columns="Metric", aggregate_function="first").sort("Year")
-        return df_wide
-    
+        return self._pivot(df_long)
+
+    def scan(self, csv_path: str, years: Iterable[int] | None = None,
+             metrics: Iterable[str] | None = None) -> pl.LazyFrame:
+        """
+        Lazy, de-duplicated long frame (entity, period, Metric, Value) for `csv_path`
+        (a CSV, Parquet or Arrow IPC file).
+
+        CSV columns are read as strings and cast afterwards so a stray value deep in a
+        large file cannot break schema inference; rows that fail the cast are dropped.
+        Parquet and IPC keep their stored dtypes. Either way a row is kept only if every
+        required column is non-null after the cast, the same rule read_to_df applies
+        eagerly. `years` filters the period column.
+        """
+        fmt = self._format(csv_path)
+        if fmt == "parquet":
+            source = pl.scan_parquet(csv_path)
+        elif fmt == "ipc":
+            source = pl.scan_ipc(csv_path, memory_map=True)
+        else:
+            source = pl.scan_csv(csv_path, schema_overrides={c: pl.Utf8 for c in self.required_cols})
+
+        schema = source.collect_schema()
+        for col in self.required_cols:
+            if col not in schema:
+                raise ValueError(f"Missing required column: {col}")
+
+        lf = source.select(self.required_cols).with_columns(self._casts()).filter(self._valid_rows())
+        if years is not None:
+            lf = lf.filter(pl.col(self.period_col).is_in(list(years)))
+        if metrics is not None:
+            lf = lf.filter(pl.col("Metric").is_in(list(metrics)))
+
+        # If any duplicate (Year, Metric) slip in, keep the first in file order. The row
+        # index comes after the filters so they still push down into the scan, and
+        # groups keep first-appearance order so the pivot's columns match the eager path.
+        return (
+            lf.with_row_index("_row")
+            .group_by(self.index_cols + ["Metric"], maintain_order=True)
+            .agg(pl.col("Value").sort_by("_row").first())
+        )
+
+    def _pivot(self, df_long: pl.DataFrame) -> pl.DataFrame:
+        # A single pivot keyed by (entity, period) covers every entity at once; polars
+        # runs the grouping multithreaded, no per-entity Python loop.
+        return (
+            df_long.pivot(values="Value", index=self.index_cols, on="Metric", aggregate_function="first")
+            .sort(self.index_cols)
+        )
+
+    @classmethod
+    def _format(cls, path: str) -> str:
+        suffix = Path(path).suffix.lower()
+        if suffix in cls.PARQUET_SUFFIXES:
+            return "parquet"
+        if suffix in cls.IPC_SUFFIXES:
+            return "ipc"
+        return "csv"
+
     @staticmethod
     def write_csv(df: pl.DataFrame, out_path: str) -> None:
         df.write_csv(out_path)
 
+    @staticmethod
+    def write_parquet(df: pl.DataFrame, out_path: str, compression: str = "zstd",
+                      compression_level: int | None = None) -> None:
+        """Columnar, dtype-preserving output for long or wide frames."""
+        df.write_parquet(out_path, compression=compression, compression_level=compression_level)
+
+    @staticmethod
+    def write_ipc(df: pl.DataFrame, out_path: str, compression: str = "uncompressed") -> None:
+        """
+        Arrow IPC output for long or wide frames. Keep the default "uncompressed" to
+        allow zero-copy memory-mapped reads; "lz4"/"zstd" trade that for smaller files.
+        """
+        df.write_ipc(out_path, compression=compression)
+
+    @classmethod
+    def read_wide(cls, path: str, memory_map: bool = True) -> pl.DataFrame:
+        """
+        Loads a prepared wide table written as Parquet, Arrow IPC or CSV. Uncompressed
+        IPC files are memory-mapped, so re-loading a universe is close to zero-copy.
+        """
+        fmt = cls._format(path)
+        if fmt == "parquet":
+            return pl.read_parquet(path)
+        if fmt == "ipc":
+            return pl.read_ipc(path, memory_map=memory_map)
+        return pl.read_csv(path)
+
+    def write_partitioned(self, df: pl.DataFrame, out_dir: str) -> None:
+        """Writes a wide multi-entity frame as Parquet, one hive partition per entity (<out_dir>/<entity_col>=X/)."""
+        if not self.entity_col:
+            raise ValueError("write_partitioned needs an entity_col.")
+        df.write_parquet(out_dir, partition_by=self.entity_col)
+
+    def read_partitioned(self, out_dir: str, entities: Iterable[str] | None = None) -> pl.LazyFrame:
+        """Lazily scans a directory written by write_partitioned, pruning partitions to `entities`."""
+        lf = pl.scan_parquet(out_dir, hive_partitioning=True)
+        if entities is not None:
+            lf = lf.filter(pl.col(self.entity_col).is_in(list(entities)))
+        return lf.sort(self.index_cols)
@@ -0,0 +1,212 @@
+from itertools import cycle
+from pathlib import Path
+from typing import Iterable, List
+import inspect
+import os
+import subprocess
+import sys
+
+from core import STATS, CachingProvider, FSAccessor, FinancialContext, decode_statement, encode_statement, synthetic
+from ratios import Efficiency, Growth, Leverage, Liquidity, Profitability, RatioPanel
+from valuation import Valuation, WACCCalculator
+from screening import ProcessExecutor, ThreadExecutor, run_batch
+from LongCSVReader import LongCSVReader
+from FCFFBuilder import FCFFBuilder
+
+from fixtures import DERIVED_DROP, long_frame, provider, wide_frame
+from harness import Benchmark
+
+"""
+Benchmark cases for the hot paths: metric resolution, the ratio classes, FCFF and
+WACC, the polars readers/builders at several input sizes, and process startup.
+Everything runs on synthetic statements or generated files, never the network.
+"""
+
+RATIO_CLASSES = (Profitability, Leverage, Liquidity, Efficiency, Growth)
+UNIVERSE = synthetic.symbols(256)
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def _scalar_methods(cls) -> List[str]:
+    """Public methods of a ratio class that take no arguments, e.g. Profitability.net_margin."""
+    return [
+        name for name, fn in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_") and len(inspect.signature(fn).parameters) == 1
+    ]
+
+
+def _contexts(drop: Iterable[str] = ()):
+    """Endless fresh FinancialContexts over a preloaded universe, so each run resolves from scratch."""
+    statements = provider(UNIVERSE, drop)
+    symbols = cycle(UNIVERSE)
+    return lambda: FinancialContext(next(symbols), statements)
+
+
+def _loaded_accessor(drop: Iterable[str] = (), **synthetic) -> FSAccessor:
+    fs = FSAccessor(UNIVERSE[0], provider(UNIVERSE[:1], drop, **synthetic))
+    fs.income
+    fs.balance
+    return fs
+
+
+def _get_metric_fresh(fs: FSAccessor, metric: str):
+    fs._resolved.clear()
+    return fs.get_metric(metric)
+
+
+def _profiled(fn):
+    """Runs `fn` with STATS enabled, to measure the instrumentation overhead."""
+    def run(state):
+        STATS.enable()
+        try:
+            return fn(state)
+        finally:
+            STATS.disable()
+            STATS.reset()
+    return run
+
+
+def accessor_cases() -> List[Benchmark]:
+    return [
+        Benchmark("fs.get_metric direct", lambda fs: _get_metric_fresh(fs, "Total Revenue"),
+                  setup=_loaded_accessor, unit="call", group="accessor"),
+        Benchmark("fs.get_metric derived (EBITDA)", lambda fs: _get_metric_fresh(fs, "EBITDA"),
+                  setup=lambda: _loaded_accessor(DERIVED_DROP), unit="call", group="accessor"),
+        Benchmark("fs.get_metric memoized", lambda fs: fs.get_metric("EBITDA"),
+                  setup=lambda: _loaded_accessor(DERIVED_DROP), unit="call", group="accessor"),
+        Benchmark("fs.resolve_all derived", lambda fs: (fs._resolved.clear(), fs.resolve_all()),
+                  setup=lambda: _loaded_accessor(DERIVED_DROP), unit="ticker", group="accessor"),
+        Benchmark("fs.resolve_all derived profiled", _profiled(lambda fs: (fs._resolved.clear(), fs.resolve_all())),
+                  setup=lambda: _loaded_accessor(DERIVED_DROP), unit="ticker", group="accessor"),
+        Benchmark("fs.resolve_all sparse aliased", lambda fs: (fs._resolved.clear(), fs.resolve_all()),
+                  setup=lambda: _loaded_accessor(sparsity=0.5, alias_rate=0.5, missing_rate=0.1),
+                  unit="ticker", group="accessor"),
+    ]
+
+
+def ratio_cases() -> List[Benchmark]:
+    cases = []
+    for cls in RATIO_CLASSES:
+        methods = _scalar_methods(cls)
+
+        def run(new_context, cls=cls, methods=methods):
+            ratios = cls(new_context())
+            return [getattr(ratios, m)() for m in methods]
+
+        cases.append(Benchmark(f"ratios.{cls.__name__}", run, setup=_contexts, unit="ticker", group="ratios"))
+
+    cases.append(Benchmark(
+        "ratios.RatioPanel 256 tickers",
+        lambda statements: RatioPanel.from_accessors(FSAccessor(s, statements) for s in UNIVERSE).compute(),
+        setup=lambda: provider(UNIVERSE), units=len(UNIVERSE), unit="ticker", group="ratios",
+    ))
+    return cases
+
+
+def valuation_cases() -> List[Benchmark]:
+    return [
+        Benchmark("valuation.fcff_series_from_statements",
+                  lambda new_context: Valuation(new_context()).fcff_series_from_statements(),
+                  setup=_contexts, unit="ticker", group="valuation"),
+        Benchmark("wacc.calculate",
+                  lambda new_context: WACCCalculator(new_context()).calculate(0.04, 0.05),
+                  setup=_contexts, unit="ticker", group="valuation"),
+    ]
+
+
+def batch_cases(tickers: int = 64) -> List[Benchmark]:
+    """
+    run_batch over preloaded statements, analysed on one thread vs process pools of
+    1, 2, 4, ... workers up to the CPU count (including pool startup), so a run on a
+    multi-core machine shows where the process executor starts to pay off.
+    """
+    symbols = UNIVERSE[:tickers]
+    counts = [n for n in (1, 2, 4, 8, 16, 32) if n <= (os.cpu_count() or 1)]
+
+    def screen(statements, executor):
+        return run_batch(symbols, 0.04, 0.05, provider=statements, executor=executor)
+
+    return [
+        Benchmark("bundle encode_statement", encode_statement,
+                  setup=lambda: provider(UNIVERSE[:1]).income(UNIVERSE[0]), unit="statement", group="batch"),
+        Benchmark("bundle decode_statement", decode_statement,
+                  setup=lambda: encode_statement(provider(UNIVERSE[:1]).income(UNIVERSE[0])), unit="statement", group="batch"),
+        Benchmark(f"screening.run_batch thread {tickers} tickers",
+                  lambda statements: screen(statements, ThreadExecutor(1)),
+                  setup=lambda: provider(symbols), units=tickers, unit="ticker", group="batch"),
+    ] + [
+        Benchmark(f"screening.run_batch process x{n} {tickers} tickers",
+                  lambda statements, n=n: screen(statements, ProcessExecutor(n)),
+                  setup=lambda: provider(symbols), units=tickers, unit="ticker", group="batch")
+        for n in counts
+    ]
+
+
+def _csv_fixture(rows: int, workdir: Path) -> str:
+    path = workdir / f"long_{rows}.csv"
+    if not path.exists():
+        long_frame(rows).write_csv(path)
+    return str(path)
+
+
+def io_cases(sizes: Iterable[int], workdir: str | Path) -> List[Benchmark]:
+    """
+    LongCSVReader.read_to_df (eager and lazy) and FCFFBuilder.compute_fcff for each row
+    count in `sizes`. Input CSVs are generated into `workdir` on first use and reused.
+    """
+    workdir = Path(workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+    reader = LongCSVReader()
+    builder = FCFFBuilder(entity_col="Ticker")
+    cases = []
+    for rows in sizes:
+        cases += [
+            Benchmark(f"LongCSVReader.read_to_df eager {rows:.0e}",
+                      lambda path: reader.read_to_df(path),
+                      setup=lambda rows=rows: _csv_fixture(rows, workdir), units=rows, unit="row", group="io"),
+            Benchmark(f"LongCSVReader.read_to_df lazy {rows:.0e}",
+                      lambda path: reader.read_to_df(path, lazy=True),
+                      setup=lambda rows=rows: _csv_fixture(rows, workdir), units=rows, unit="row", group="io"),
+            Benchmark(f"FCFFBuilder.compute_fcff {rows:.0e}",
+                      builder.compute_fcff,
+                      setup=lambda rows=rows: wide_frame(rows), units=rows, unit="row", group="io"),
+        ]
+    return cases
+
+
+def _python(*args: str):
+    """Runs a fresh interpreter in backend/src, failing the case if it exits non-zero."""
+    return lambda _: subprocess.run([sys.executable, *args], cwd=SRC, check=True, capture_output=True)
+
+
+def _warm_cache(workdir: Path) -> Path:
+    """SQLite statement cache holding everything main.py reads for UNIVERSE[0]."""
+    cache_dir = workdir / "startup-cache"
+    context = FinancialContext(UNIVERSE[0], CachingProvider(synthetic.SyntheticProvider(), cache_dir=cache_dir)).load()
+    Valuation(context).dcf_inputs()
+    WACCCalculator(context).inputs()
+    return cache_dir
+
+
+def startup_cases(workdir: str | Path) -> List[Benchmark]:
+    """
+    Wall time of fresh interpreters: importing each package, main.py --help and a
+    single-ticker main.py run served entirely from a warm on-disk cache. Includes
+    interpreter startup; `python benchmarks/importtime.py` breaks a target down by module.
+    """
+    workdir = Path(workdir)
+    cases = [
+        Benchmark(f"startup import {package}", _python("-c", f"import {package}"), unit="process", group="startup")
+        for package in ("core", "ratios", "valuation", "screening")
+    ]
+    cases += [
+        Benchmark("startup main.py --help", _python("main.py", "--help"), unit="process", group="startup"),
+        Benchmark("startup main.py cached ticker",
+                  lambda cache_dir: _python("main.py", "-t", UNIVERSE[0], "--cache-dir", str(cache_dir))(None),
+                  setup=lambda: _warm_cache(workdir), unit="process", group="startup"),
+    ]
+    return cases
+
+
+def all_cases(sizes: Iterable[int], workdir: str | Path) -> List[Benchmark]:
+    return accessor_cases() + ratio_cases() + valuation_cases() + batch_cases() + io_cases(sizes, workdir) + startup_cases(workdir)
@@ -0,0 +1,70 @@
+from typing import Dict, Iterable
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from core import StatementProvider, SyntheticProvider
+
+"""
+Offline fixtures for the benchmarks
+
+Statements come from core.SyntheticProvider, preloaded into memory so the timed
+code measures metric resolution rather than generation. The reader and FCFF
+inputs are built with vectorized NumPy instead, so they scale to 10^8 rows.
+"""
+
+# Rows removed for the "derived" fixtures: each one has to be rebuilt through
+# FSAccessor.METRIC_DEFINITIONS (EBITDA -> EBIT -> Net Income + Interest + Tax, ...)
+DERIVED_DROP = ("EBITDA", "EBIT", "Gross Profit", "Operating Income", "Total Assets", "Total Debt")
+
+
+class PreloadedProvider:
+    """Statements, info and history of `symbols` fetched once from `source` and served from memory."""
+
+    def __init__(self, source: StatementProvider, symbols: Iterable[str]):
+        self._data: Dict[str, tuple] = {
+            s: (source.income(s), source.balance(s), source.info(s), source.history(s)) for s in symbols
+        }
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self._data[symbol][0]
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self._data[symbol][1]
+
+    def info(self, symbol: str) -> dict:
+        return self._data[symbol][2]
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        return self._data[symbol][3]
+
+
+def provider(symbols: Iterable[str], drop: Iterable[str] = (), **synthetic) -> PreloadedProvider:
+    return PreloadedProvider(SyntheticProvider(drop=tuple(drop), **synthetic), symbols)
+
+
+def long_frame(rows: int, metrics: int = 50, seed: int = 0) -> pl.DataFrame:
+    """Long (Year, Metric, Value) frame of `rows` rows, as read by LongCSVReader."""
+    rng = np.random.default_rng(seed)
+    idx = np.arange(rows)
+    names = pl.Series([f"Metric{i}" for i in range(metrics)])
+    return pl.DataFrame({
+        "Year": 1900 + idx // metrics,
+        "Metric": names.gather(idx % metrics),
+        "Value": rng.normal(100.0, 25.0, rows),
+    })
+
+
+def wide_frame(rows: int, periods: int = 20, seed: int = 0) -> pl.DataFrame:
+    """Wide multi-company frame (Ticker, Year, FCFF inputs...) of about `rows` rows, sorted by (Ticker, Year)."""
+    rng = np.random.default_rng(seed)
+    companies = max(rows // periods, 1)
+    n = companies * periods
+    columns = ["OperatingIncome", "DepreciationAmortization", "Capex", "AccountsReceivable",
+               "Inventory", "AccountsPayable", "EBT", "TaxExpense"]
+    return pl.DataFrame({
+        "Ticker": np.char.add("T", np.repeat(np.arange(companies), periods).astype(str)),
+        "Year": np.tile(np.arange(2000, 2000 + periods), companies),
+        **{c: rng.normal(100.0, 50.0, n) for c in columns},
+    })
@@ -0,0 +1,227 @@
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+import gc
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+"""
+Benchmark harness
+
+A Benchmark pairs an untimed `setup()` with a timed `run(state)`. Each sample
+times `number` consecutive runs (calibrated so one sample lasts at least
+`min_sample_time`), and samples are repeated until `repeat` of them or the time
+budget is reached. Latency percentiles are taken over the per-run sample times;
+throughput is `units` per run divided by the median latency.
+
+Peak memory is the growth of the process resident set during one run. On Linux
+the high-water mark is reset through /proc/self/clear_refs so it covers native
+(polars, NumPy) allocations; elsewhere tracemalloc's Python-heap peak is used
+instead. Allocators keep freed memory around, so after the timed runs the growth
+is understated; run.py therefore measures it in a fresh process by default.
+"""
+
+CLEAR_REFS = Path("/proc/self/clear_refs")
+STATUS = Path("/proc/self/status")
+
+
+@dataclass
+class Benchmark:
+    name: str
+    run: Callable[[Any], Any]
+    setup: Callable[[], Any] = lambda: None
+    units: float = 1.0
+    unit: str = "op"
+    group: str = "misc"
+
+
+@dataclass
+class Measurement:
+    name: str
+    group: str
+    unit: str
+    samples: int
+    number: int
+    min_s: float
+    mean_s: float
+    p50_s: float
+    p90_s: float
+    p99_s: float
+    throughput: float  # units per second at the median latency
+    peak_mb: float | None
+    memory_source: str
+
+    def row(self) -> str:
+        peak = f"{self.peak_mb:9.1f}" if self.peak_mb is not None else f"{'n/a':>9}"
+        return (f"{self.name:<44} {_fmt_time(self.p50_s):>10} {_fmt_time(self.p90_s):>10} {_fmt_time(self.p99_s):>10}"
+                f" {self.throughput:>14,.1f} {self.unit + '/s':<10} {peak}")
+
+
+HEADER = f"{'benchmark':<44} {'p50':>10} {'p90':>10} {'p99':>10} {'throughput':>14} {'':<10} {'peak MB':>9}"
+
+
+def _fmt_time(seconds: float) -> str:
+    for scale, suffix in ((1.0, "s"), (1e-3, "ms"), (1e-6, "us")):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f}{suffix}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def _status_kb(field_name: str) -> int | None:
+    try:
+        for line in STATUS.read_text().splitlines():
+            if line.startswith(field_name + ":"):
+                return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def _reset_peak_rss() -> bool:
+    try:
+        CLEAR_REFS.write_text("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_memory(fn: Callable[[], Any]) -> tuple[float | None, str]:
+    """Peak memory growth (MB) while calling `fn` once, and how it was measured."""
+    gc.collect()
+    if _reset_peak_rss():
+        before = _status_kb("VmRSS")
+        fn()
+        peak = _status_kb("VmHWM")
+        if before is not None and peak is not None:
+            return max(peak - before, 0) / 1024, "rss"
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak / 2**20, "tracemalloc"
+
+
+def measure(bench: Benchmark, repeat: int = 30, budget: float = 2.0, min_sample_time: float = 0.01,
+            warmup: int = 1, memory: bool = True) -> Measurement:
+    """Times `bench` as described in the module docstring; `memory=False` skips the in-process peak measurement."""
+    state = bench.setup()
+    call = lambda: bench.run(state)
+    for _ in range(warmup):
+        call()
+
+    # Calibrate: grow `number` until one sample is long enough to time reliably
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            call()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_sample_time or number >= 1_000_000:
+            break
+        number *= 10 if elapsed < min_sample_time / 10 else 2
+
+    samples: List[float] = [elapsed / number]
+    deadline = time.perf_counter() + budget
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while len(samples) < repeat and (time.perf_counter() < deadline or len(samples) < 3):
+            start = time.perf_counter()
+            for _ in range(number):
+                call()
+            samples.append((time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    peak_mb, source = peak_memory(call) if memory else (None, "none")
+    times = np.asarray(samples)
+    p50, p90, p99 = np.percentile(times, [50, 90, 99])
+    return Measurement(
+        name=bench.name,
+        group=bench.group,
+        unit=bench.unit,
+        samples=len(samples),
+        number=number,
+        min_s=float(times.min()),
+        mean_s=float(times.mean()),
+        p50_s=float(p50),
+        p90_s=float(p90),
+        p99_s=float(p99),
+        throughput=bench.units / float(p50) if p50 > 0 else float("inf"),
+        peak_mb=peak_mb,
+        memory_source=source,
+    )
+
+
+def measure_peak(bench: Benchmark) -> tuple[float | None, str]:
+    """Peak memory of a single cold run of `bench` (call in a fresh process for a clean reading)."""
+    state = bench.setup()
+    return peak_memory(lambda: bench.run(state))
+
+
+def environment() -> Dict[str, str]:
+    versions = {}
+    for module in ("numpy", "pandas", "polars"):
+        mod = sys.modules.get(module)
+        if mod is not None:
+            versions[module] = getattr(mod, "__version__", "?")
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": str(os.cpu_count()),
+        **versions,
+    }
+
+
+@dataclass
+class Baseline:
+    """Stored reference results; a run regresses when it is slower or larger by more than the thresholds."""
+    results: Dict[str, Dict[str, float | None]] = field(default_factory=dict)
+    time_threshold: float = 1.25     # allowed p50 ratio against the baseline
+    memory_threshold: float = 1.5    # allowed peak-memory ratio against the baseline
+    memory_slack_mb: float = 8.0     # absolute slack so tiny cases don't flag allocator noise
+    environment: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "Baseline":
+        with open(path) as f:
+            return cls(**json.load(f))
+
+    def save(self, path: str | Path) -> None:
+        with open(path, "w") as f:
+            json.dump(asdict(self), f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    def update(self, measurements: List[Measurement]) -> None:
+        for m in measurements:
+            self.results[m.name] = {"p50_s": m.p50_s, "p99_s": m.p99_s, "throughput": m.throughput, "peak_mb": m.peak_mb}
+        self.environment = environment()
+
+    def compare(self, measurements: List[Measurement]) -> List[str]:
+        """Human-readable regressions of `measurements` against this baseline (empty when none)."""
+        regressions = []
+        for m in measurements:
+            ref = self.results.get(m.name)
+            if ref is None:
+                continue
+            ratio = m.p50_s / ref["p50_s"] if ref["p50_s"] else 1.0
+            if ratio > self.time_threshold:
+                regressions.append(
+                    f"{m.name}: p50 {_fmt_time(m.p50_s)} vs baseline {_fmt_time(ref['p50_s'])} ({ratio:.2f}x > {self.time_threshold:.2f}x)"
+                )
+            ref_mb = ref.get("peak_mb")
+            if m.peak_mb is not None and ref_mb is not None:
+                limit = ref_mb * self.memory_threshold + self.memory_slack_mb
+                if m.peak_mb > limit:
+                    regressions.append(f"{m.name}: peak {m.peak_mb:.1f} MB vs baseline {ref_mb:.1f} MB (limit {limit:.1f} MB)")
+        return regressions
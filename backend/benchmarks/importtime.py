@@ -0,0 +1,83 @@
+import argparse
+import re
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+HERE = Path(__file__).resolve().parent
+SRC = HERE.parent / "src"
+
+"""
+Import-time breakdown of a startup target, from `python -X importtime`.
+
+    python backend/benchmarks/importtime.py                          # main.py --help
+    python backend/benchmarks/importtime.py core --forbid pandas,polars,yfinance
+    python backend/benchmarks/importtime.py "main.py -t AAPL" --max-ms 600 --top 30
+
+A target is a package to import or a main.py command line, run in backend/src.
+The report lists the slowest top-level imports by cumulative time. --max-ms
+fails when the total import time exceeds the limit and --forbid when any of the
+named modules was imported at all, so both can gate CI.
+"""
+
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile(target: str) -> tuple[List[ImportRecord], int]:
+    """Runs `target` under -X importtime; returns its import records and exit status."""
+    if target.split()[0].endswith(".py"):
+        cmd = [sys.executable, "-X", "importtime", *target.split()]
+    else:
+        cmd = [sys.executable, "-X", "importtime", "-c", f"import {target}"]
+    proc = subprocess.run(cmd, cwd=SRC, capture_output=True, text=True)
+    records = [
+        ImportRecord(m[4], int(m[1]), int(m[2]), len(m[3]) // 2)
+        for m in map(LINE.match, proc.stderr.splitlines()) if m
+    ]
+    return records, proc.returncode
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Break down the import time of a startup target.")
+    parser.add_argument("target", nargs="?", default="main.py --help", help="Package name or main.py command line.")
+    parser.add_argument("--top", default=15, type=int, help="Number of top-level imports to list.")
+    parser.add_argument("--max-ms", type=float, help="Fail if the total import time exceeds this many milliseconds.")
+    parser.add_argument("--forbid", default="", help="Comma-separated modules that must not be imported.")
+    args = parser.parse_args()
+
+    records, returncode = profile(args.target)
+    if returncode != 0:
+        print(f"'{args.target}' exited with status {returncode}")
+        sys.exit(returncode)
+
+    top_level = sorted((r for r in records if r.depth == 0), key=lambda r: -r.cumulative_us)
+    total_ms = sum(r.cumulative_us for r in top_level) / 1e3
+    print(f"{args.target}: {len(records)} modules, {total_ms:.1f} ms of imports")
+    print(f"{'module':<40} {'cumulative ms':>14} {'self ms':>10}")
+    for r in top_level[:args.top]:
+        print(f"{r.module:<40} {r.cumulative_us / 1e3:>14.1f} {r.self_us / 1e3:>10.1f}")
+
+    failures = []
+    imported = {r.module for r in records}
+    for module in filter(None, (m.strip() for m in args.forbid.split(","))):
+        if module in imported:
+            failures.append(f"{module} was imported")
+    if args.max_ms is not None and total_ms > args.max_ms:
+        failures.append(f"imports took {total_ms:.1f} ms, limit {args.max_ms:g} ms")
+    for line in failures:
+        print(f"FAIL: {line}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
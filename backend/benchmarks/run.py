@@ -0,0 +1,131 @@
+import argparse
+import json
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+from dataclasses import asdict
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path[:0] = [str(HERE.parent / "src"), str(HERE.parents[1])]  # backend/src packages and the repo-root modules
+
+from cases import all_cases
+from harness import HEADER, Baseline, environment, measure, measure_peak
+
+"""
+Runs the benchmark suite.
+
+    python backend/benchmarks/run.py                       # all cases, 1e5 and 1e6 rows for the I/O cases
+    python backend/benchmarks/run.py -k ratios --check     # compare a subset against the stored baseline
+    python backend/benchmarks/run.py --rows 1e5,1e6,1e7,1e8 --workdir /data/bench
+    python backend/benchmarks/run.py --save-baseline       # record the current results as the baseline
+
+--check exits with status 1 when any case regresses beyond the baseline thresholds.
+Baselines are machine specific: record one on the machine that runs the checks.
+"""
+
+DEFAULT_BASELINE = HERE / "baseline.json"
+
+
+def parse_sizes(spec: str) -> list[int]:
+    return [int(float(v)) for v in spec.split(",") if v.strip()]
+
+
+def isolated_peak(name: str, args: argparse.Namespace) -> tuple[float | None, str]:
+    """Runs one cold iteration of case `name` in a fresh interpreter and returns its peak memory."""
+    cmd = [sys.executable, __file__, "--peak-of", name, "--rows", ",".join(map(str, args.rows))]
+    if args.workdir:
+        cmd += ["--workdir", args.workdir]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    if proc.returncode != 0:
+        logging.error(f"Peak memory run for '{name}' failed: {proc.stderr.strip()}")
+        return None, "none"
+    peak_mb, source = json.loads(proc.stdout.strip().splitlines()[-1])
+    return peak_mb, source
+
+
+def main():
+    logging.basicConfig(level=logging.ERROR, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="Benchmark the ratio, valuation and FCFF hot paths offline.")
+    parser.add_argument("-k", "--filter", help="Only run cases whose name contains this substring.")
+    parser.add_argument("--rows", default="1e5,1e6", type=parse_sizes, help="Row counts for the reader and FCFF cases (e.g. 1e5,1e6,1e7,1e8).")
+    parser.add_argument("--workdir", help="Directory for generated input files (default: a temporary directory).")
+    parser.add_argument("--repeat", default=30, type=int, help="Maximum samples per case.")
+    parser.add_argument("--budget", default=2.0, type=float, help="Seconds of sampling per case (at least 3 samples are always taken).")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline file to check against or save to.")
+    parser.add_argument("--check", action="store_true", help="Fail if any case regresses against the baseline.")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results in the baseline file.")
+    parser.add_argument("--time-threshold", type=float, help="Allowed p50 slowdown ratio (overrides the baseline's).")
+    parser.add_argument("--memory-threshold", type=float, help="Allowed peak-memory ratio (overrides the baseline's).")
+    parser.add_argument("--json", help="Also write the raw measurements to this file.")
+    parser.add_argument("--memory", default="isolated", choices=("isolated", "inprocess", "off"),
+                        help="Measure peak memory in a fresh process per case (default), after the timed runs, or not at all.")
+    parser.add_argument("--peak-of", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.peak_of:
+        case = next(c for c in all_cases(args.rows, args.workdir) if c.name == args.peak_of)
+        print(json.dumps(measure_peak(case)))
+        return
+
+    # Generated input files live in one directory shared with the peak-memory subprocesses
+    scratch = None
+    if args.workdir is None:
+        args.workdir = scratch = tempfile.mkdtemp(prefix="evw-bench-")
+    try:
+        status = run(parser, args)
+    finally:
+        if scratch:
+            shutil.rmtree(scratch, ignore_errors=True)
+    sys.exit(status)
+
+
+def run(parser: argparse.ArgumentParser, args: argparse.Namespace) -> int:
+    cases = all_cases(args.rows, args.workdir)
+    cases = [c for c in cases if not args.filter or args.filter in c.name]
+    if not cases:
+        parser.error(f"No benchmark matches '{args.filter}'.")
+
+    print(HEADER)
+    measurements = []
+    for case in cases:
+        m = measure(case, repeat=args.repeat, budget=args.budget, memory=args.memory == "inprocess")
+        if args.memory == "isolated":
+            m.peak_mb, m.memory_source = isolated_peak(case.name, args)
+        measurements.append(m)
+        print(m.row(), flush=True)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"environment": environment(), "results": [asdict(m) for m in measurements]}, f, indent=2)
+
+    baseline_path = Path(args.baseline)
+    baseline = Baseline.load(baseline_path) if baseline_path.exists() else Baseline()
+    if args.time_threshold is not None:
+        baseline.time_threshold = args.time_threshold
+    if args.memory_threshold is not None:
+        baseline.memory_threshold = args.memory_threshold
+
+    status = 0
+    if args.check:
+        if not baseline.results:
+            print(f"\nNo baseline at {baseline_path}; run with --save-baseline first.")
+            status = 1
+        else:
+            regressions = baseline.compare(measurements)
+            print(f"\n{len(regressions)} regression(s) against {baseline_path}")
+            for line in regressions:
+                print(f"  {line}")
+            status = 1 if regressions else 0
+
+    if args.save_baseline:
+        baseline.update(measurements)
+        baseline.save(baseline_path)
+        print(f"\nBaseline saved to {baseline_path}")
+    return status
+
+
+if __name__ == "__main__":
+    main()
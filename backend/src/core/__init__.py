@@ -1 +1,20 @@
-from .fs_accessor import FSAccessor, yf
\ No newline at end of file
+from .providers import StatementProvider, YFinanceProvider, FileStatementProvider, yf
+from .instrumentation import STATS, Stats, instrument, timed
+from .diagnostics import Diagnostics, DiagnosticsCollector
+from .fs_accessor import FSAccessor
+from .context import FinancialContext
+from .cache import CachingProvider
+from .market import MarketSnapshot, last_closes
+from .bundle import StatementBundle, decode_statement, encode_statement
+from .remote import AsyncHTTPProvider, HTTPProvider, frame_from_json, frame_to_json
+from .memory import LRUCache, SharedProvider, SingleFlight
+from .lazy import LazyModule, lazy_import
+
+
+def __getattr__(name):
+    # SyntheticProvider pulls in numpy and polars, and `python -m core.synthetic`
+    # must not find core.synthetic already imported by the package
+    if name == "SyntheticProvider":
+        from .synthetic import SyntheticProvider
+        return SyntheticProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import io
+
+from .cached import cached_property
+from .diagnostics import Diagnostics
+from .instrumentation import STATS
+from .lazy import lazy_import
+from .market import MarketSnapshot
+from .providers import StatementProvider
+
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pl = lazy_import("polars")
+
+"""
+Statement bundles: one ticker's inputs in a compact, picklable form.
+
+A StatementBundle is fetched where the I/O happens (the parent process of a
+batch) and shipped to wherever the analysis runs (a worker process). Statements
+travel as Arrow IPC streams written by polars, one Float64 column per period and
+a `Metric` column, instead of pickled pandas objects. The bundle is itself a
+StatementProvider for its symbol, so a FinancialContext over it never refetches.
+"""
+
+
+def encode_statement(statement: pd.DataFrame) -> bytes:
+    """Arrow IPC stream of a yfinance-shaped statement (metrics on the index, one column per period)."""
+    try:
+        values = statement.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        values = statement.apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    columns = {"Metric": pl.Series([str(m) for m in statement.index], dtype=pl.Utf8)}
+    for i, period in enumerate(statement.columns):
+        columns[str(period)] = values[:, i]
+    buffer = io.BytesIO()
+    pl.DataFrame(columns).write_ipc_stream(buffer)
+    return buffer.getvalue()
+
+
+def decode_statement(data: bytes) -> pd.DataFrame:
+    """Inverse of encode_statement; period labels that all parse as dates become a DatetimeIndex again."""
+    frame = pl.read_ipc_stream(io.BytesIO(data))
+    labels = frame.columns[1:]
+    return pd.DataFrame(
+        frame.select(labels).to_numpy() if labels else None,
+        index=frame.get_column("Metric").to_list(),
+        columns=parse_periods(labels),
+    )
+
+
+def parse_periods(labels: list[str]):
+    """Labels as a DatetimeIndex if every one is a date, otherwise unchanged."""
+    try:  # numpy parses the naive ISO timestamps str(pd.Timestamp) produces several times faster than pandas
+        return pd.DatetimeIndex(np.array(labels, dtype="datetime64[ns]"))
+    except ValueError:
+        periods = pd.to_datetime(labels, errors="coerce")
+        return labels if periods.isna().any() else periods
+
+
+@dataclass(frozen=True)
+class StatementBundle:
+    symbol: str
+    income_ipc: bytes
+    balance_ipc: bytes
+    info_dict: dict
+    snapshot: MarketSnapshot
+    # Events recorded while fetching (e.g. no price history), carried to the analysis side
+    diagnostics: Diagnostics | None = field(default=None, compare=False)
+
+    @classmethod
+    def fetch(cls, symbol: str, provider: StatementProvider, close: float | None = None) -> "StatementBundle":
+        """Fetches everything FinancialContext.load reads; a bulk-loaded `close` skips the history request."""
+        diagnostics = Diagnostics(symbol)
+        with STATS.timer("fetch.income"):
+            income = provider.income(symbol)
+        with STATS.timer("fetch.balance"):
+            balance = provider.balance(symbol)
+        with STATS.timer("fetch.info"):
+            info = provider.info(symbol) or {}
+        if close is not None:
+            snapshot = MarketSnapshot.from_info(symbol, info, close)
+        else:
+            snapshot = MarketSnapshot.fetch(symbol, provider, info=info, diagnostics=diagnostics)
+        with STATS.timer("bundle.encode"):
+            return cls(symbol, encode_statement(income), encode_statement(balance), info, snapshot, diagnostics)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.income_ipc) + len(self.balance_ipc)
+
+    # --- StatementProvider for `symbol` ---
+
+    @cached_property
+    def _income(self) -> pd.DataFrame:
+        return decode_statement(self.income_ipc)
+
+    @cached_property
+    def _balance(self) -> pd.DataFrame:
+        return decode_statement(self.balance_ipc)
+
+    def _check(self, symbol: str) -> None:
+        if symbol != self.symbol:
+            raise KeyError(f"Bundle for {self.symbol} has no data for {symbol}.")
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        self._check(symbol)
+        return self._income
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        self._check(symbol)
+        return self._balance
+
+    def info(self, symbol: str) -> dict:
+        self._check(symbol)
+        return self.info_dict
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        self._check(symbol)
+        if self.snapshot.price is None:
+            return pd.DataFrame(columns=["Close"])
+        return pd.DataFrame({"Close": [self.snapshot.price]}, index=[self.snapshot.fetched_at])
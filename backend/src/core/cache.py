@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable
+import threading
+import logging
+import sqlite3
+import pickle
+import time
+
+from .instrumentation import STATS
+from .lazy import lazy_import
+from .providers import StatementProvider
+from .market import last_closes
+
+pd = lazy_import("pandas")
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "evw"
+
+
+class CachingProvider:
+    """
+    StatementProvider decorator that persists another provider's results in SQLite.
+
+    Entries are keyed by (symbol, kind) and expire by kind: statements after
+    `statement_ttl`, `info` after `info_ttl` and price history after `price_ttl`.
+    Statements also carry the latest fiscal period they contain; once the next
+    period is due (`period_length` + `filing_lag` after it) an entry fetched before
+    that date is refetched even if its TTL has not run out. The file is bounded to
+    `max_bytes`, evicting the least recently used entries first.
+    """
+
+    STATEMENTS = ("income", "balance")
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS entries (
+            symbol      TEXT NOT NULL,
+            kind        TEXT NOT NULL,
+            payload     BLOB NOT NULL,
+            size        INTEGER NOT NULL,
+            fetched_at  REAL NOT NULL,
+            accessed_at REAL NOT NULL,
+            last_period TEXT,
+            PRIMARY KEY (symbol, kind)
+        )
+    """
+
+    def __init__(
+        self,
+        inner: StatementProvider,
+        cache_dir: str | Path = DEFAULT_CACHE_DIR,
+        statement_ttl: timedelta = timedelta(days=7),
+        info_ttl: timedelta = timedelta(days=1),
+        price_ttl: timedelta = timedelta(minutes=15),
+        period_length: timedelta = timedelta(days=365),
+        filing_lag: timedelta = timedelta(days=90),
+        max_bytes: int = 512 * 1024 * 1024,
+        refresh: bool = False,
+    ):
+        self.inner = inner
+        self.statement_ttl = statement_ttl
+        self.info_ttl = info_ttl
+        self.price_ttl = price_ttl
+        self.period_length = period_length
+        self.filing_lag = filing_lag
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+
+        self.path = Path(cache_dir) / "statements.sqlite"
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(self.SCHEMA)
+        self._conn.commit()
+
+    # --- StatementProvider ---
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self._cached(symbol, "income", self.statement_ttl, lambda: self.inner.income(symbol))
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self._cached(symbol, "balance", self.statement_ttl, lambda: self.inner.balance(symbol))
+
+    def info(self, symbol: str) -> dict:
+        return self._cached(symbol, "info", self.info_ttl, lambda: self.inner.info(symbol))
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        return self._cached(symbol, f"history:{period}", self.price_ttl, lambda: self.inner.history(symbol, period=period))
+
+    def last_closes(self, symbols: Iterable[str]) -> Dict[str, float | None]:
+        """Serves fresh 1-day closes from the cache and bulk-fetches only the missing symbols."""
+        closes, missing = {}, []
+        for symbol in symbols:
+            hist = self._get(symbol, "history:1d", self.price_ttl)
+            if STATS.enabled:
+                STATS.cache("sqlite", hit=hist is not None)
+            if hist is None:
+                missing.append(symbol)
+            else:
+                closes[symbol] = float(hist["Close"].iloc[-1])
+        if missing:
+            for symbol, price in last_closes(self.inner, missing).items():
+                closes[symbol] = price
+                if price is not None:
+                    self._put(symbol, "history:1d", pd.DataFrame({"Close": [price]}, index=[pd.Timestamp.now().normalize()]))
+        return closes
+
+    # --- Maintenance ---
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drops every entry for `symbol`, or the whole cache if no symbol is given."""
+        with self._lock:
+            if symbol is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE symbol = ?", (symbol,))
+            self._conn.commit()
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # --- Internals ---
+
+    def _cached(self, symbol: str, kind: str, ttl: timedelta, fetch):
+        value = self._get(symbol, kind, ttl)
+        if STATS.enabled:
+            STATS.cache("sqlite", hit=value is not None)
+        if value is None:
+            value = fetch()
+            self._put(symbol, kind, value)
+        return value
+
+    def _get(self, symbol: str, kind: str, ttl: timedelta):
+        if self.refresh:
+            return None
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, fetched_at, last_period FROM entries WHERE symbol = ? AND kind = ?",
+                (symbol, kind),
+            ).fetchone()
+            if row is None or not self._is_fresh(now, row[1], ttl, row[2]):
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed_at = ? WHERE symbol = ? AND kind = ?", (now, symbol, kind)
+            )
+            self._conn.commit()
+        return pickle.loads(row[0])
+
+    def _put(self, symbol: str, kind: str, value) -> None:
+        if self._is_empty(value):
+            # Don't persist failed or empty fetches; the next run should retry them.
+            return
+        now = time.time()
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (symbol, kind, payload, len(payload), now, now,
+                 self._last_period(value) if kind in self.STATEMENTS else None),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _is_fresh(self, now: float, fetched_at: float, ttl: timedelta, last_period: str | None) -> bool:
+        if now - fetched_at >= ttl.total_seconds():
+            return False
+        if last_period is not None:
+            next_due = datetime.fromisoformat(last_period) + self.period_length + self.filing_lag
+            if next_due.timestamp() <= now and fetched_at < next_due.timestamp():
+                return False
+        return True
+
+    @staticmethod
+    def _is_empty(value) -> bool:
+        if value is None:
+            return True
+        if isinstance(value, pd.DataFrame):
+            return value.empty
+        return not value
+
+    @staticmethod
+    def _last_period(statement: pd.DataFrame) -> str | None:
+        periods = pd.to_datetime(statement.columns, errors="coerce").dropna()
+        return periods.max().isoformat() if len(periods) else None
+
+    def _evict(self) -> None:
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        evicted = 0
+        for symbol, kind, size in self._conn.execute(
+            "SELECT symbol, kind, size FROM entries ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM entries WHERE symbol = ? AND kind = ?", (symbol, kind))
+            total -= size
+            evicted += 1
+        logging.debug("Statement cache over %d bytes; evicted %d entries.", self.max_bytes, evicted)
@@ -0,0 +1,31 @@
+"""
+functools.cached_property without the lock
+
+Before Python 3.12, functools.cached_property serializes the first access of a
+property across *all* instances of a class with one shared lock. A batch builds
+one FinancialContext per ticker on a thread pool, so every context's statement
+and info fetch queued behind each other and only one request per property was
+ever in flight. This descriptor caches the same way (in the instance __dict__)
+without taking a lock. Two threads racing on the same instance may both compute
+the value; the first one stored wins. Contexts are not shared between threads
+anyway.
+"""
+
+
+class cached_property:
+
+    def __init__(self, func):
+        self.func = func
+        self.attrname = func.__name__
+        self.__doc__ = func.__doc__
+
+    def __set_name__(self, owner, name):
+        self.attrname = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        cache = instance.__dict__
+        if self.attrname in cache:
+            return cache[self.attrname]
+        return cache.setdefault(self.attrname, self.func(instance))
@@ -0,0 +1,64 @@
+from dataclasses import dataclass, field
+
+from .cached import cached_property
+from .diagnostics import Diagnostics
+from .fs_accessor import FSAccessor
+from .instrumentation import STATS
+from .market import MarketSnapshot
+from .providers import StatementProvider, YFinanceProvider, yf
+
+
+@dataclass
+class FinancialContext:
+    """
+    Per-ticker session shared by the ratio and valuation classes.
+
+    Statements, `info` and the latest close are fetched from `provider` at most
+    once, and every consumer built from the same context reads through the same
+    FSAccessor. A MarketSnapshot fetched elsewhere (e.g. in bulk for a batch) can be
+    passed as `snapshot` so no price request is made at all.
+    """
+    symbol: str
+    provider: StatementProvider = field(default_factory=YFinanceProvider)
+    snapshot: MarketSnapshot | None = field(default=None, repr=False)
+
+    @classmethod
+    def of(cls, source: "yf.Ticker | FinancialContext | str") -> "FinancialContext":
+        """Returns `source` if it already is a context, otherwise wraps a symbol or yf.Ticker in a new one."""
+        if isinstance(source, cls):
+            return source
+        if isinstance(source, str):
+            return cls(source)
+        return cls(source.ticker, YFinanceProvider([source]))
+
+    @cached_property
+    def fs(self) -> FSAccessor:
+        return FSAccessor(self.symbol, self.provider)
+
+    @cached_property
+    def info(self) -> dict:
+        with STATS.timer("fetch.info"):
+            return self.provider.info(self.symbol) or {}
+
+    @cached_property
+    def market(self) -> MarketSnapshot:
+        if self.snapshot is not None:
+            return self.snapshot
+        return MarketSnapshot.fetch(self.symbol, self.provider, info=self.info, diagnostics=self.diagnostics)
+
+    @property
+    def diagnostics(self) -> Diagnostics:
+        """Missing/derived metrics and failed ratios recorded for this ticker; see Diagnostics.emit."""
+        return self.fs.diagnostics
+
+    @property
+    def price(self) -> float | None:
+        return self.market.price
+
+    def load(self) -> "FinancialContext":
+        """Eagerly fetches statements, info and price so later calls never hit the provider."""
+        self.fs.income
+        self.fs.balance
+        self.info
+        self.market
+        return self
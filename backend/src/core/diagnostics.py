@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List
+import logging
+import threading
+
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+"""
+Structured diagnostics
+
+Instead of logging a line for every metric that is missing or derived and every
+ratio that cannot be computed, the FSAccessor, the ratio classes and the
+valuation code record an Event on the ticker's Diagnostics. Messages are kept as
+a template plus arguments and only formatted when read or logged.
+
+A Diagnostics is emitted once per ticker (a single log line summarising it), or
+added to a DiagnosticsCollector that aggregates a batch and can be queried or
+emitted in aggregate afterwards.
+"""
+
+DERIVED = "derived"          # metric rebuilt from its operands
+MISSING = "missing"          # metric neither reported nor derivable
+ERROR = "error"              # calculation error while deriving a metric
+UNAVAILABLE = "unavailable"  # ratio or valuation figure that could not be computed
+FALLBACK = "fallback"        # a default value was used instead of data
+
+KINDS = (DERIVED, MISSING, ERROR, UNAVAILABLE, FALLBACK)
+
+
+@dataclass(frozen=True)
+class Event:
+    symbol: str
+    kind: str
+    subject: str  # metric or ratio name
+    template: str = ""
+    args: tuple = ()
+
+    @property
+    def message(self) -> str:
+        return self.template % self.args if self.args else self.template
+
+
+class _Lazy:
+    """Defers building a log message until a handler actually formats it."""
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return self.fn()
+
+
+@dataclass
+class Diagnostics:
+    """Events recorded for one ticker; only the first event per (kind, subject) is kept."""
+    symbol: str
+    events: List[Event] = field(default_factory=list)
+    _seen: set = field(default_factory=set, init=False, repr=False)
+
+    def __post_init__(self):
+        self._seen.update((e.kind, e.subject) for e in self.events)
+
+    def record(self, kind: str, subject: str, template: str = "", *args) -> None:
+        # A warm context (e.g. in the service) recomputes the same ratios on every
+        # request, so repeats must not grow the list
+        if (kind, subject) not in self._seen:
+            self._seen.add((kind, subject))
+            self.events.append(Event(self.symbol, kind, subject, template, args))
+
+    def merge(self, other: "Diagnostics") -> None:
+        for e in other.events:
+            self.record(e.kind, e.subject, e.template, *e.args)
+
+    def derived(self, metric: str, operands: Iterable[str]) -> None:
+        self.record(DERIVED, metric, "from %s", ", ".join(operands))
+
+    def missing(self, metric: str, template: str = "", *args) -> None:
+        self.record(MISSING, metric, template, *args)
+
+    def unavailable(self, subject: str, template: str = "", *args) -> None:
+        self.record(UNAVAILABLE, subject, template, *args)
+
+    def subjects(self, kind: str) -> List[str]:
+        return list(dict.fromkeys(e.subject for e in self.events if e.kind == kind))
+
+    @property
+    def derived_metrics(self) -> List[str]:
+        return self.subjects(DERIVED)
+
+    @property
+    def missing_metrics(self) -> List[str]:
+        return self.subjects(MISSING)
+
+    @property
+    def has_problems(self) -> bool:
+        return any(e.kind != DERIVED for e in self.events)
+
+    def summary(self) -> Dict[str, List[str]]:
+        """{kind: [subjects]} for every kind with at least one event."""
+        return {kind: subjects for kind in KINDS if (subjects := self.subjects(kind))}
+
+    def describe(self) -> str:
+        parts = []
+        for kind in KINDS:
+            events = [e for e in self.events if e.kind == kind]
+            if events:
+                items = ", ".join(f"{e.subject} ({e.message})" if e.template else e.subject for e in events)
+                parts.append(f"{kind}: {items}")
+        return "; ".join(parts) or "no issues"
+
+    def emit(self, level: int | None = None) -> None:
+        """
+        Logs the whole ticker in one line: WARNING when something is missing or could
+        not be computed, DEBUG when metrics were only derived. Nothing is formatted if
+        the level is disabled.
+        """
+        if not self.events:
+            return
+        if level is None:
+            level = logging.WARNING if self.has_problems else logging.DEBUG
+        logging.log(level, "For ticker %s, %s", self.symbol, _Lazy(self.describe))
+
+
+class DiagnosticsCollector:
+    """Thread-safe aggregate of many tickers' Diagnostics, for batch runs."""
+
+    def __init__(self):
+        self._by_symbol: Dict[str, Diagnostics] = {}
+        self._lock = threading.Lock()
+
+    def add(self, diagnostics: Diagnostics) -> None:
+        with self._lock:
+            self._by_symbol[diagnostics.symbol] = diagnostics
+
+    def get(self, symbol: str) -> Diagnostics | None:
+        return self._by_symbol.get(symbol)
+
+    def __iter__(self):
+        return iter(list(self._by_symbol.values()))
+
+    def __len__(self) -> int:
+        return len(self._by_symbol)
+
+    def counts(self, kind: str) -> Counter:
+        """How many tickers had an event of `kind` for each subject, e.g. counts("missing")["EBITDA"]."""
+        return Counter(subject for d in self for subject in d.subjects(kind))
+
+    def tickers_with(self, kind: str, subject: str | None = None) -> List[str]:
+        return [d.symbol for d in self if any(e.kind == kind and subject in (None, e.subject) for e in d.events)]
+
+    def to_frame(self) -> pd.DataFrame:
+        """One row per event: symbol, kind, subject, message."""
+        rows = [
+            {"symbol": e.symbol, "kind": e.kind, "subject": e.subject, "message": e.message}
+            for d in self for e in d.events
+        ]
+        return pd.DataFrame(rows, columns=["symbol", "kind", "subject", "message"])
+
+    def describe(self, top: int = 10) -> str:
+        lines = []
+        for kind in KINDS:
+            counts = self.counts(kind)
+            if counts:
+                items = ", ".join(f"{subject} x{n}" for subject, n in counts.most_common(top))
+                lines.append(f"{kind} ({sum(counts.values())}): {items}")
+        return "\n".join(lines) or "no issues"
+
+    def emit(self, level: int | None = None, top: int = 10) -> None:
+        """Logs one aggregate summary for the whole batch (WARNING if any ticker has problems, else DEBUG)."""
+        if len(self):
+            if level is None:
+                level = logging.WARNING if any(d.has_problems for d in self) else logging.DEBUG
+            logging.log(level, "Diagnostics for %d tickers:\n%s", len(self), _Lazy(lambda: self.describe(top)))
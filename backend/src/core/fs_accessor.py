@@ -1,14 +1,31 @@
-import yfinance as yf
-from functools import reduce, cached_property
-import pandas as pd
-from typing import Iterable, Tuple
-from dataclasses import dataclass
+from __future__ import annotations
+
+from contextlib import nullcontext
+from functools import reduce
+from typing import Dict, Iterable, Tuple
+from dataclasses import dataclass, field
 import logging
 import operator
 
+from .cached import cached_property
+from .diagnostics import ERROR, Diagnostics
+from .instrumentation import STATS, timed
+from .lazy import lazy_import
+from .metric_graph import MetricGraph
+from .providers import StatementProvider, YFinanceProvider
+
+pd = lazy_import("pandas")
+
+
 @dataclass
 class FSAccessor:
-    ticker: yf.Ticker
+    symbol: str
+    provider: StatementProvider = field(default_factory=YFinanceProvider)
+    # Missing and derived metrics are recorded here instead of being logged one by one
+    diagnostics: Diagnostics | None = field(default=None, repr=False)
+    # Per-accessor memo of resolved metrics (None marks a metric that could not be found or derived)
+    _resolved: Dict[str, pd.Series | None] = field(default_factory=dict, init=False, repr=False)
+    _resolving: set = field(default_factory=set, init=False, repr=False)
 
     METRIC_DEFINITIONS = {
         # Income Statement Metrics
@@ -188,17 +205,26 @@ class FSAccessor:
         },
     }
 
+    GRAPH = MetricGraph(METRIC_DEFINITIONS)
+
+    def __post_init__(self):
+        if self.diagnostics is None:
+            self.diagnostics = Diagnostics(self.symbol)
+
     @cached_property
     def income(self) -> pd.DataFrame:
-        df = self.ticker.financials.copy()
+        with STATS.timer("fetch.income"):
+            df = self.provider.income(self.symbol).copy()
         return self._sort_columns(df)
 
     @cached_property
     def balance(self) -> pd.DataFrame:
-        df = self.ticker.balance_sheet.copy()
+        with STATS.timer("fetch.balance"):
+            df = self.provider.balance(self.symbol).copy()
         return self._sort_columns(df)
     
     @staticmethod
+    @timed("fs.sort_columns")
     def _sort_columns(df: pd.DataFrame) -> pd.DataFrame:
         # yfinance columns are datelike strings; coerce to datetime and sort desc
         cols = pd.to_datetime(df.columns, errors="coerce")
@@ -229,6 +255,45 @@ class FSAccessor:
             raise ValueError(f"Need at least one period. Got: {vals.to_dict()}")
         return float(vals.iloc[0])
     
+    # --- Series helpers (every period at once; columns are sorted latest first) ---
+
+    @staticmethod
+    def average(row: pd.Series | None) -> pd.Series | None:
+        """Average of each period with the period before it, e.g. average total assets."""
+        if row is None:
+            return None
+        vals = row.astype(float)
+        return (vals + vals.shift(-1)) / 2
+
+    @staticmethod
+    def growth(row: pd.Series | None) -> pd.Series | None:
+        """Period-over-period growth: (x_t - x_{t-1}) / x_{t-1}, 0.0 when x_{t-1} is zero."""
+        if row is None:
+            return None
+        vals = row.astype(float)
+        prev = vals.shift(-1)
+        return FSAccessor.divide(vals - prev, prev)
+
+    @staticmethod
+    def divide(num: pd.Series | None, den: pd.Series | None, on_zero: float = 0.0) -> pd.Series | None:
+        """Element-wise num / den aligned on periods; `on_zero` where den is zero, NaN where data is missing."""
+        if num is None or den is None:
+            return None
+        num, den = num.astype(float).align(den.astype(float), join="outer")
+        result = (num / den.where(den != 0)).where(den != 0, on_zero)
+        result = result.where(num.notna() & den.notna())
+        if isinstance(result.index, pd.DatetimeIndex):
+            # An outer join of differing periods sorts them oldest first; keep latest first
+            result = result.sort_index(ascending=False)
+        return result
+
+    @staticmethod
+    def to_frame(columns: dict) -> pd.DataFrame:
+        """Combines ratio series into one frame (periods latest first); None becomes an all-NaN column."""
+        present = {name: s for name, s in columns.items() if s is not None}
+        frame = pd.DataFrame(present).reindex(columns=list(columns))
+        return frame.sort_index(ascending=False)
+
     def get_metric(self, metric_name: str) -> pd.Series | None:
         """
         Retrieves a financial metric series from the income statement or balance sheet.
@@ -239,16 +304,50 @@ class FSAccessor:
            defined in METRIC_DEFINITIONS.
         3. Graceful Failure: If both fail, it returns None.
 
+        Results are memoized per accessor, so each metric is probed and derived at
+        most once. A metric that is reached again while it is still being derived
+        (a cycle in METRIC_DEFINITIONS) is treated as unavailable instead of
+        recursing forever; this is the only cycle protection.
+
         Args:
             metric_name: The standardized name of the metric to retrieve.
 
         Returns:
             A pandas Series for the metric if found or derived, otherwise None.
         """
+        if metric_name in self._resolved:
+            if STATS.enabled:
+                STATS.cache("fs.memo", hit=True)
+            return self._resolved[metric_name]
+
+        if metric_name in self._resolving:
+            logging.debug("For ticker %s, '%s' is already being derived (cycle in METRIC_DEFINITIONS).", self.symbol, metric_name)
+            return None
+
+        if STATS.enabled:
+            STATS.cache("fs.memo", hit=False)
+        # Only the outermost call is timed; operands resolved on the way show up in the lookup counts
+        timer = STATS.timer("fs.get_metric") if not self._resolving else nullcontext()
+        self._resolving.add(metric_name)
+        try:
+            with timer:
+                result = self._resolve(metric_name)
+        finally:
+            self._resolving.discard(metric_name)
+        self._resolved[metric_name] = result
+        return result
+
+    def resolve_all(self) -> Dict[str, pd.Series | None]:
+        """Resolves every defined metric in one pass, operands before the metrics derived from them."""
+        return {name: self.get_metric(name) for name in self.GRAPH.order}
+
+    def _resolve(self, metric_name: str) -> pd.Series | None:
         # 1. Look up the metric definition
         metric_def = self.METRIC_DEFINITIONS.get(metric_name)
         if not metric_def:
-            logging.warning(f"For ticker {self.ticker.ticker}, metric '{metric_name}' is not defined in METRIC_DEFINITIONS.")
+            self.diagnostics.missing(metric_name, "not defined in METRIC_DEFINITIONS")
+            if STATS.enabled:
+                STATS.lookup(metric_name, "failed")
             return None
 
         # 2. Determine which financial statement to use
@@ -257,12 +356,15 @@ class FSAccessor:
         # 3. Direct Lookup
         row = self.get_row(statement_df, metric_def["primary_keys"])
         if row is not None:
+            if STATS.enabled:
+                STATS.lookup(metric_name, "direct")
             return row
 
-        logging.debug(f"For ticker {self.ticker.ticker}, '{metric_name}' not found directly. Attempting derivation.")
+        logging.debug("For ticker %s, '%s' not found directly. Attempting derivation.", self.symbol, metric_name)
 
         # 4. Derivation Fallback
         derivation_rule = metric_def.get("derivation")
+        reason, reason_args = "not reported and no derivation rule", ()
         if derivation_rule:
             op_str = derivation_rule["operator"]
             operands = derivation_rule["operands"]
@@ -271,7 +373,7 @@ class FSAccessor:
             for op_name in operands:
                 op_series = self.get_metric(op_name)
                 if op_series is None:
-                    logging.warning(f"For ticker {self.ticker.ticker}, failed to derive '{metric_name}' because operand '{op_name}' could not be found or derived.")
+                    reason, reason_args = "operand '%s' unavailable", (op_name,)
                     operand_series = [] # Mark as failed
                     break
                 operand_series.append(op_series)
@@ -288,13 +390,19 @@ class FSAccessor:
                         result = reduce(operator.sub, filled_operands)
                     
                     if result is not None:
-                        logging.debug(f"For ticker {self.ticker.ticker}, '{metric_name}' was successfully derived from {operands}.")
+                        self.diagnostics.derived(metric_name, operands)
+                        if STATS.enabled:
+                            STATS.lookup(metric_name, "derived")
                         return result
 
                 except (TypeError, ValueError):
-                    logging.error(f"For ticker {self.ticker.ticker}, a calculation error occurred while deriving '{metric_name}'.")
+                    self.diagnostics.record(ERROR, metric_name, "calculation error while deriving from %s", tuple(operands))
+                    if STATS.enabled:
+                        STATS.lookup(metric_name, "failed")
                     return None
 
         # 5. Graceful Failure
-        logging.warning(f"For ticker {self.ticker.ticker}, the metric '{metric_name}' could not be found or derived.")
+        self.diagnostics.missing(metric_name, reason, *reason_args)
+        if STATS.enabled:
+            STATS.lookup(metric_name, "failed")
         return None
\ No newline at end of file
@@ -0,0 +1,148 @@
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from functools import wraps
+from typing import Dict
+import inspect
+import threading
+import time
+
+"""
+Hot-path instrumentation
+
+STATS collects, while enabled:
+
+- timers: call count, total and max seconds per name, e.g. "fetch.income",
+  "fs.sort_columns", "fs.get_metric" or "Profitability.roe";
+- lookups: per metric, how often FSAccessor found it directly, derived it or failed;
+- caches: hits and misses per cache ("fs.memo", "sqlite").
+
+It is off by default. Disabled, a timed function costs one attribute check and
+hot paths guard their bookkeeping with `if STATS.enabled:`, so nothing is
+recorded or formatted. Enable it with `STATS.enable()` (or main.py --profile),
+read `STATS.snapshot()` for a plain dict or `STATS.report()` for a table.
+"""
+
+LOOKUP_PATHS = ("direct", "derived", "failed")
+
+
+@dataclass
+class TimerStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+
+@dataclass
+class Stats:
+    enabled: bool = False
+    timers: Dict[str, TimerStats] = field(default_factory=lambda: defaultdict(TimerStats))
+    lookups: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: dict.fromkeys(LOOKUP_PATHS, 0)))
+    caches: Dict[str, Dict[str, int]] = field(default_factory=lambda: defaultdict(lambda: {"hit": 0, "miss": 0}))
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def enable(self) -> "Stats":
+        self.enabled = True
+        return self
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self.timers.clear()
+            self.lookups.clear()
+            self.caches.clear()
+
+    # --- Recording (call only when enabled) ---
+
+    def add_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.timers[name].add(seconds)
+
+    def lookup(self, metric: str, path: str) -> None:
+        with self._lock:
+            self.lookups[metric][path] += 1
+
+    def cache(self, name: str, hit: bool) -> None:
+        with self._lock:
+            self.caches[name]["hit" if hit else "miss"] += 1
+
+    def timer(self, name: str):
+        """Context manager timing its block under `name`; a no-op while disabled."""
+        return self._timer(name) if self.enabled else nullcontext()
+
+    @contextmanager
+    def _timer(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.perf_counter() - start)
+
+    # --- Reporting ---
+
+    def snapshot(self) -> dict:
+        """Plain-dict copy of everything recorded so far."""
+        with self._lock:
+            return {
+                "timers": {
+                    name: {"count": t.count, "total_s": t.total, "mean_s": t.total / t.count if t.count else 0.0, "max_s": t.max}
+                    for name, t in self.timers.items()
+                },
+                "lookups": {metric: dict(paths) for metric, paths in self.lookups.items()},
+                "caches": {
+                    name: {**c, "hit_rate": c["hit"] / (c["hit"] + c["miss"]) if c["hit"] + c["miss"] else None}
+                    for name, c in self.caches.items()
+                },
+            }
+
+    def report(self) -> str:
+        """Text tables of the snapshot: slowest timers first, then lookup paths and cache hit rates."""
+        snap = self.snapshot()
+        lines = [f"{'timer':<40} {'calls':>8} {'total ms':>11} {'mean ms':>10} {'max ms':>10}"]
+        for name, t in sorted(snap["timers"].items(), key=lambda kv: -kv[1]["total_s"]):
+            lines.append(f"{name:<40} {t['count']:>8} {t['total_s'] * 1e3:>11.2f} {t['mean_s'] * 1e3:>10.3f} {t['max_s'] * 1e3:>10.3f}")
+        lines.append("")
+        lines.append(f"{'metric':<40} {'direct':>8} {'derived':>8} {'failed':>8}")
+        for metric, paths in sorted(snap["lookups"].items()):
+            lines.append(f"{metric:<40} {paths['direct']:>8} {paths['derived']:>8} {paths['failed']:>8}")
+        lines.append("")
+        lines.append(f"{'cache':<40} {'hits':>8} {'misses':>8} {'hit rate':>8}")
+        for name, c in sorted(snap["caches"].items()):
+            rate = f"{c['hit_rate']:.1%}" if c["hit_rate"] is not None else "n/a"
+            lines.append(f"{name:<40} {c['hit']:>8} {c['miss']:>8} {rate:>8}")
+        return "\n".join(lines)
+
+
+STATS = Stats()
+
+
+def timed(name: str):
+    """Decorator timing every call under `name` while STATS is enabled."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not STATS.enabled:
+                return fn(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                STATS.add_time(name, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def instrument(cls):
+    """Class decorator timing each public method as "<Class>.<method>" (e.g. "Leverage.debt_ratio")."""
+    for name, fn in list(vars(cls).items()):
+        if not name.startswith("_") and inspect.isfunction(fn):
+            setattr(cls, name, timed(f"{cls.__name__}.{name}")(fn))
+    return cls
@@ -0,0 +1,34 @@
+from types import ModuleType
+import importlib
+import sys
+
+"""
+Deferred imports
+
+pandas, polars and yfinance together take most of a second to import, and many
+entry points (main.py --help, a cached run, a worker that only reads files) never
+touch some of them. `pd = lazy_import("pandas")` binds a stand-in module that
+imports the real one on first attribute access and then copies its namespace, so
+after the first use attribute lookups cost the same as on the real module.
+
+Modules using a stand-in must not touch it at import time: annotations that name
+it go behind `from __future__ import annotations` or in quotes.
+"""
+
+
+class LazyModule(ModuleType):
+    """Placeholder for module `name`, imported on first attribute access."""
+
+    def __getattr__(self, attr: str):
+        module = importlib.import_module(self.__name__)
+        self.__dict__.update(module.__dict__)
+        return getattr(module, attr)
+
+    def __repr__(self) -> str:
+        loaded = "loaded" if self.__name__ in sys.modules else "not loaded"
+        return f"<lazy module {self.__name__!r} ({loaded})>"
+
+
+def lazy_import(name: str) -> ModuleType:
+    """The module `name` itself if it is already imported, otherwise a LazyModule for it."""
+    return sys.modules.get(name) or LazyModule(name)
@@ -0,0 +1,80 @@
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, Iterable
+import logging
+
+from .diagnostics import Diagnostics
+from .instrumentation import STATS, timed
+from .providers import StatementProvider
+
+
+@timed("fetch.last_closes")
+def last_closes(provider: StatementProvider, symbols: Iterable[str]) -> Dict[str, float | None]:
+    """
+    Latest close for many symbols, in one bulk request when the provider supports it.
+
+    Providers may implement `last_closes(symbols)`; otherwise this falls back to one
+    `history(period="1d")` call per symbol.
+    """
+    symbols = list(dict.fromkeys(symbols))
+    bulk = getattr(provider, "last_closes", None)
+    if bulk is not None:
+        return bulk(symbols)
+    closes = {}
+    for symbol in symbols:
+        try:
+            closes[symbol] = float(provider.history(symbol, period="1d")["Close"].iloc[-1])
+        except (IndexError, KeyError):
+            closes[symbol] = None
+    return closes
+
+
+@dataclass(frozen=True)
+class MarketSnapshot:
+    """
+    Market data for one symbol, fetched once and shared by every valuation ratio and
+    WACCCalculator.market_values.
+    """
+    symbol: str
+    price: float | None
+    market_cap: float | None
+    shares_outstanding: float | None
+    beta: float | None
+    fetched_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def from_info(cls, symbol: str, info: dict, price: float | None) -> "MarketSnapshot":
+        return cls(
+            symbol=symbol,
+            price=price,
+            market_cap=info.get("marketCap"),
+            shares_outstanding=info.get("sharesOutstanding"),
+            beta=info.get("beta"),
+        )
+
+    @classmethod
+    def fetch(cls, symbol: str, provider: StatementProvider, info: dict | None = None,
+              diagnostics: Diagnostics | None = None) -> "MarketSnapshot":
+        """Fetches the latest close (one history request) and reads the rest from `info`."""
+        if info is None:
+            with STATS.timer("fetch.info"):
+                info = provider.info(symbol) or {}
+        try:
+            with STATS.timer("fetch.history"):
+                price = float(provider.history(symbol, period="1d")["Close"].iloc[-1])
+        except IndexError:
+            if diagnostics is not None:
+                diagnostics.unavailable("Price", "no history returned")
+            else:
+                logging.warning("For ticker %s, could not fetch price per share. No history returned.", symbol)
+            price = None
+        return cls.from_info(symbol, info, price)
+
+    @classmethod
+    def fetch_many(cls, symbols: Iterable[str], provider: StatementProvider) -> Dict[str, "MarketSnapshot"]:
+        """Snapshots for many symbols; last closes are loaded with a single bulk call when supported."""
+        closes = last_closes(provider, symbols)
+        return {
+            symbol: cls.from_info(symbol, provider.info(symbol) or {}, price)
+            for symbol, price in closes.items()
+        }
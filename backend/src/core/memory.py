@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Callable, Dict, Hashable, Iterable, Tuple
+import pickle
+import threading
+import time
+
+from .instrumentation import STATS
+from .lazy import lazy_import
+from .market import last_closes
+from .providers import StatementProvider
+
+pd = lazy_import("pandas")
+
+"""
+In-process request coalescing and caching
+
+When many requests for the same popular tickers run at once (the service, a
+batch with repeated symbols), each builds its own FinancialContext and would
+fetch identical statements. SharedProvider sits between them and the real
+provider:
+
+- SingleFlight: the first caller for a (symbol, kind) key runs the fetch and
+  concurrent callers for the same key wait for it and share its result (or its
+  exception) instead of fetching again.
+- LRUCache: fetched values are then kept in memory, bounded by entry count and
+  approximate bytes, each kind with its own TTL.
+
+Consumers must treat returned frames as read-only; FSAccessor copies them.
+"""
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """At most one in-flight call per key; concurrent callers for a key share its outcome."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], object]) -> Tuple[object, bool]:
+        """Returns (result of fn, shared), where `shared` means another caller's call was joined."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.value, False
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+
+def approximate_size(value) -> int:
+    """Bytes a cached value occupies: frame memory for DataFrames, pickled size otherwise."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class LRUCache:
+    """Thread-safe LRU map bounded by `max_entries` and (approximately) `max_bytes`, with per-entry expiry."""
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[Hashable, Tuple[object, int, float]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """The cached value, or None if absent or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[2] <= time.monotonic():
+                self._drop(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key: Hashable, value, ttl: float) -> None:
+        size = approximate_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, size, time.monotonic() + ttl)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def invalidate(self, match: Callable[[Hashable], bool] | None = None) -> None:
+        """Drops every entry whose key satisfies `match`, or everything."""
+        with self._lock:
+            for key in [k for k in self._entries if match is None or match(k)]:
+                self._drop(key)
+
+    def _drop(self, key: Hashable) -> None:
+        self._bytes -= self._entries.pop(key)[1]
+
+    @property
+    def nbytes(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedProvider:
+    """
+    StatementProvider decorator adding single-flight fetches and an in-memory LRU
+    over `inner` (e.g. a CachingProvider over yfinance).
+
+    Statements are kept for `statement_ttl`, `info` for `info_ttl` and price
+    history for `price_ttl`. Empty results are shared with concurrent callers but
+    not cached, so the next request retries them.
+    """
+
+    def __init__(
+        self,
+        inner: StatementProvider,
+        max_entries: int = 4096,
+        max_bytes: int = 256 * 1024 * 1024,
+        statement_ttl: timedelta = timedelta(hours=6),
+        info_ttl: timedelta = timedelta(hours=1),
+        price_ttl: timedelta = timedelta(minutes=5),
+    ):
+        self.inner = inner
+        self.statement_ttl = statement_ttl
+        self.info_ttl = info_ttl
+        self.price_ttl = price_ttl
+        self.cache = LRUCache(max_entries, max_bytes)
+        self.flight = SingleFlight()
+
+    # --- StatementProvider ---
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self._shared(symbol, "income", self.statement_ttl, lambda: self.inner.income(symbol))
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self._shared(symbol, "balance", self.statement_ttl, lambda: self.inner.balance(symbol))
+
+    def info(self, symbol: str) -> dict:
+        return self._shared(symbol, "info", self.info_ttl, lambda: self.inner.info(symbol))
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        return self._shared(symbol, f"history:{period}", self.price_ttl, lambda: self.inner.history(symbol, period=period))
+
+    def last_closes(self, symbols: Iterable[str]) -> Dict[str, float | None]:
+        """Serves cached 1-day closes and bulk-fetches only the missing symbols."""
+        closes, missing = {}, []
+        for symbol in symbols:
+            hist = self.cache.get((symbol, "history:1d"))
+            if STATS.enabled:
+                STATS.cache("memory", hit=hist is not None)
+            if hist is None:
+                missing.append(symbol)
+            else:
+                closes[symbol] = float(hist["Close"].iloc[-1])
+        if missing:
+            for symbol, price in last_closes(self.inner, missing).items():
+                closes[symbol] = price
+                if price is not None:
+                    hist = pd.DataFrame({"Close": [price]}, index=[pd.Timestamp.now().normalize()])
+                    self.cache.put((symbol, "history:1d"), hist, self.price_ttl.total_seconds())
+        return closes
+
+    # --- Maintenance ---
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Drops every cached entry for `symbol`, or everything if no symbol is given."""
+        self.cache.invalidate(None if symbol is None else (lambda key: key[0] == symbol))
+
+    # --- Internals ---
+
+    def _shared(self, symbol: str, kind: str, ttl: timedelta, fetch):
+        key = (symbol, kind)
+        value = self.cache.get(key)
+        if STATS.enabled:
+            STATS.cache("memory", hit=value is not None)
+        if value is not None:
+            return value
+        value, shared = self.flight.do(key, lambda: self._load(key, ttl, fetch))
+        if STATS.enabled:
+            STATS.cache("singleflight", hit=shared)
+        return value
+
+    def _load(self, key: Tuple[str, str], ttl: timedelta, fetch):
+        value = self.cache.get(key)  # a call for this key may have finished since the miss above
+        if value is None:
+            value = fetch()
+            if not self._is_empty(value):
+                self.cache.put(key, value, ttl.total_seconds())
+        return value
+
+    @staticmethod
+    def _is_empty(value) -> bool:
+        if value is None:
+            return True
+        if isinstance(value, pd.DataFrame):
+            return value.empty
+        return not value
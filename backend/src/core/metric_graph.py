@@ -0,0 +1,60 @@
+from typing import Dict, List, Mapping, Tuple
+
+
+class MetricGraph:
+    """
+    Dependency graph compiled once from FSAccessor.METRIC_DEFINITIONS.
+
+    Each metric points at the operands of its derivation rule. `order` lists every
+    defined metric with its operands first, so resolving metrics in that order only
+    ever recurses inside a cycle (e.g. EBIT -> Tax Provision -> Pretax Income -> EBIT).
+    Cycles need no special handling here: FSAccessor.get_metric treats a metric it
+    reaches again while still deriving it as unavailable.
+    """
+
+    def __init__(self, definitions: Mapping[str, dict]):
+        self.definitions = definitions
+        self.dependencies: Dict[str, Tuple[str, ...]] = {
+            name: tuple(rule["operands"]) if (rule := metric_def.get("derivation")) else ()
+            for name, metric_def in definitions.items()
+        }
+        self.order: Tuple[str, ...] = tuple(
+            name for comp in self._strongly_connected_components() for name in comp if name in definitions
+        )
+
+    def _strongly_connected_components(self) -> List[Tuple[str, ...]]:
+        # Tarjan's algorithm. Components come out dependencies-first, which is the
+        # topological order of the condensed graph we want for resolution.
+        index: Dict[str, int] = {}
+        lowlink: Dict[str, int] = {}
+        stack: List[str] = []
+        on_stack = set()
+        components: List[Tuple[str, ...]] = []
+        position = {name: i for i, name in enumerate(self.definitions)}
+
+        def visit(node: str) -> None:
+            index[node] = lowlink[node] = len(index)
+            stack.append(node)
+            on_stack.add(node)
+            for dep in self.dependencies.get(node, ()):
+                if dep not in index:
+                    visit(dep)
+                    lowlink[node] = min(lowlink[node], lowlink[dep])
+                elif dep in on_stack:
+                    lowlink[node] = min(lowlink[node], index[dep])
+            if lowlink[node] == index[node]:
+                comp = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    comp.append(member)
+                    if member == node:
+                        break
+                # Keep members of a cycle in definition order for stable output
+                comp.sort(key=lambda name: position.get(name, len(position)))
+                components.append(tuple(comp))
+
+        for name in self.definitions:
+            if name not in index:
+                visit(name)
+        return components
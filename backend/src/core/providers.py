@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Dict, Iterable, Protocol, runtime_checkable
+import threading
+import json
+
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+pl = lazy_import("polars")
+yf = lazy_import("yfinance")
+
+
+@runtime_checkable
+class StatementProvider(Protocol):
+    """
+    Source of raw statement data for one symbol.
+
+    Statements are yfinance-shaped: metrics on the index, one column per period.
+    `history` returns a frame indexed by date with at least a `Close` column.
+    """
+
+    def income(self, symbol: str) -> pd.DataFrame: ...
+
+    def balance(self, symbol: str) -> pd.DataFrame: ...
+
+    def info(self, symbol: str) -> dict: ...
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame: ...
+
+
+class YFinanceProvider:
+    """StatementProvider backed by yfinance (one yf.Ticker per symbol, created on first use)."""
+
+    def __init__(self, tickers: Iterable[yf.Ticker] = ()):
+        self._tickers: Dict[str, yf.Ticker] = {t.ticker: t for t in tickers}
+        self._lock = threading.Lock()
+
+    def ticker(self, symbol: str) -> yf.Ticker:
+        with self._lock:
+            if symbol not in self._tickers:
+                self._tickers[symbol] = yf.Ticker(symbol)
+            return self._tickers[symbol]
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self.ticker(symbol).financials
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self.ticker(symbol).balance_sheet
+
+    def info(self, symbol: str) -> dict:
+        return self.ticker(symbol).info or {}
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        return self.ticker(symbol).history(period=period)
+
+    def last_closes(self, symbols: Iterable[str]) -> Dict[str, float | None]:
+        """Latest close for many symbols with a single yf.download request."""
+        symbols = list(symbols)
+        if not symbols:
+            return {}
+        data = yf.download(symbols, period="5d", progress=False, group_by="column")
+        closes = data["Close"] if not data.empty else pd.DataFrame()
+        if isinstance(closes, pd.Series):
+            closes = closes.to_frame(symbols[0])
+        latest = closes.ffill().iloc[-1] if not closes.empty else pd.Series(dtype=float)
+        return {s: (float(latest[s]) if s in latest.index and pd.notna(latest[s]) else None) for s in symbols}
+
+
+class FileStatementProvider:
+    """
+    StatementProvider reading statements saved on disk, for offline and reproducible runs.
+
+    Layout (one directory per symbol):
+        <root>/<SYMBOL>/income.{parquet,csv}    long format: Date or Year, Metric, Value
+        <root>/<SYMBOL>/balance.{parquet,csv}   same as income
+        <root>/<SYMBOL>/info.json               the yfinance `info` dict (optional)
+        <root>/<SYMBOL>/history.csv             Date, Close (optional)
+
+    The long CSV format is the one LongCSVReader reads; a `Year` column is mapped to
+    a fiscal year end of Dec 31.
+    """
+
+    STATEMENTS = ("income", "balance")
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    def _dir(self, symbol: str) -> Path:
+        return self.root / symbol.upper()
+
+    def _read_long(self, symbol: str, statement: str) -> pl.DataFrame | None:
+        base = self._dir(symbol) / statement
+        if base.with_suffix(".parquet").exists():
+            return pl.read_parquet(base.with_suffix(".parquet"))
+        if base.with_suffix(".csv").exists():
+            return pl.read_csv(base.with_suffix(".csv"), infer_schema_length=2000)
+        return None
+
+    def _statement(self, symbol: str, statement: str) -> pd.DataFrame:
+        df_long = self._read_long(symbol, statement)
+        if df_long is None or df_long.is_empty():
+            return pd.DataFrame()
+        if "Date" in df_long.columns:
+            period = pl.col("Date").cast(pl.Utf8).str.to_date(strict=False)
+        elif "Year" in df_long.columns:
+            period = pl.date(pl.col("Year").cast(pl.Int32, strict=False), 12, 31)
+        else:
+            raise ValueError(f"{statement} for {symbol} needs a Date or Year column.")
+        df_long = (
+            df_long
+            .select(period.alias("Period"), pl.col("Metric").cast(pl.Utf8), pl.col("Value").cast(pl.Float64, strict=False))
+            .drop_nulls(["Period", "Metric"])
+        )
+        frame = pd.DataFrame({
+            "Period": pd.to_datetime(df_long.get_column("Period").to_numpy()),
+            "Metric": df_long.get_column("Metric").to_list(),
+            "Value": df_long.get_column("Value").to_numpy(),
+        })
+        wide = frame.pivot_table(index="Metric", columns="Period", values="Value", aggfunc="first", dropna=False)
+        wide.columns.name = None
+        wide.index.name = None
+        return wide
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self._statement(symbol, "income")
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self._statement(symbol, "balance")
+
+    def info(self, symbol: str) -> dict:
+        path = self._dir(symbol) / "info.json"
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        path = self._dir(symbol) / "history.csv"
+        if not path.exists():
+            return pd.DataFrame(columns=["Close"])
+        hist = pd.read_csv(path, index_col="Date", parse_dates=["Date"]).sort_index()
+        return hist.tail(1) if period == "1d" else hist
+
+    def save(self, symbol: str, source: StatementProvider, history_period: str = "1y") -> Path:
+        """Snapshots `symbol` from another provider (e.g. yfinance) into this provider's layout."""
+        target = self._dir(symbol)
+        target.mkdir(parents=True, exist_ok=True)
+        for statement in self.STATEMENTS:
+            wide = getattr(source, statement)(symbol)
+            long = wide.rename_axis(index="Metric", columns="Date").stack(future_stack=True).rename("Value").reset_index()
+            long["Date"] = pd.to_datetime(long["Date"]).dt.strftime("%Y-%m-%d")
+            long[["Date", "Metric", "Value"]].to_csv(target / f"{statement}.csv", index=False)
+        with open(target / "info.json", "w") as f:
+            json.dump(source.info(symbol), f, default=str)
+        hist = source.history(symbol, period=history_period)[["Close"]]
+        if getattr(hist.index, "tz", None) is not None:
+            hist.index = hist.index.tz_localize(None)
+        hist.rename_axis("Date").to_csv(target / "history.csv")
+        return target
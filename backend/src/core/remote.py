@@ -0,0 +1,352 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Iterable, List
+from urllib.parse import quote, urlencode, urlsplit
+import asyncio
+import json
+import logging
+import random
+import ssl
+import threading
+import time
+
+from .bundle import parse_periods
+from .instrumentation import STATS
+from .lazy import lazy_import
+
+pd = lazy_import("pandas")
+
+"""
+Asynchronous HTTP statement provider
+
+AsyncHTTPProvider reads statements from a JSON HTTP API laid out as:
+
+    GET <base_url>/<SYMBOL>/income                -> frame (metrics x periods)
+    GET <base_url>/<SYMBOL>/balance               -> frame (metrics x periods)
+    GET <base_url>/<SYMBOL>/info                  -> the yfinance `info` object
+    GET <base_url>/<SYMBOL>/history?period=1d     -> frame (dates x ["Close"])
+
+A frame is {"index": [...], "columns": [...], "data": [[row values], ...]} with
+null for missing values; frame_to_json/frame_from_json convert pandas frames.
+404 means "no data" (an empty frame or {}). The base URL is the only thing tying
+it to a server, so tests and benchmarks can point it at a local stub.
+
+All requests share one keep-alive ConnectionPool and one TokenBucket, so a batch
+runs at the upstream rate limit instead of at the latency of serial requests.
+Connection errors, timeouts, 429 and 5xx are retried with exponential backoff and
+jitter, honouring Retry-After; a 429 pauses the whole bucket, not just the
+request that got it. Concurrent requests for the same resource share one
+in-flight request.
+
+HTTPProvider wraps it as a regular (blocking) StatementProvider by running the
+event loop on a background thread; any number of threads may call it at once.
+"""
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class HTTPError(Exception):
+    def __init__(self, status: int, url: str, retry_after: float | None = None):
+        super().__init__(f"HTTP {status} for {url}")
+        self.status = status
+        self.url = url
+        self.retry_after = retry_after
+
+
+def frame_to_json(frame: pd.DataFrame) -> dict:
+    values = frame.astype(float).to_numpy()
+    index, columns = (
+        axis.tz_localize(None) if getattr(axis, "tz", None) is not None else axis  # dates travel as naive labels
+        for axis in (frame.index, frame.columns)
+    )
+    return {
+        "index": [str(i) for i in index],
+        "columns": [str(c) for c in columns],
+        "data": [[None if v != v else float(v) for v in row] for row in values],
+    }
+
+
+def frame_from_json(payload: dict | None, date_axis: str = "columns") -> pd.DataFrame:
+    """Inverse of frame_to_json; the labels on `date_axis` ("columns" or "index") are parsed as dates."""
+    if not payload:
+        return pd.DataFrame()
+    index, columns = payload["index"], payload["columns"]
+    if date_axis == "columns":
+        columns = parse_periods(columns)
+    else:
+        index = parse_periods(index)
+    return pd.DataFrame(payload["data"] or None, index=index, columns=columns, dtype=float)
+
+
+class TokenBucket:
+    """Allows `rate` requests per second on average and bursts of up to `burst`."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float) -> None:
+        """Hands out no tokens for `seconds`, e.g. after the server answered 429."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self) -> None:
+        async with self._lock:  # waiters are served in arrival order
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class Response:
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class ConnectionPool:
+    """
+    Minimal HTTP/1.1 client keeping up to `max_connections` keep-alive connections
+    to the host of `base_url` (http or https). Handles Content-Length and chunked
+    bodies; a reused connection the server has since closed is replaced by a fresh one.
+    """
+
+    def __init__(self, base_url: str, max_connections: int = 10, timeout: float = 10.0):
+        url = urlsplit(base_url)
+        if url.scheme not in ("http", "https"):
+            raise ValueError(f"Unsupported URL scheme in {base_url!r}.")
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.ssl = ssl.create_default_context() if url.scheme == "https" else None
+        self.prefix = url.path.rstrip("/")
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(max_connections)
+        self._idle: List[tuple] = []
+
+    async def get(self, path: str) -> Response:
+        async with self._slots:
+            while self._idle:
+                conn = self._idle.pop()
+                try:
+                    return await self._roundtrip(conn, path)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    continue  # stale keep-alive connection
+            with STATS.timer("http.connect"):
+                conn = await asyncio.wait_for(
+                    asyncio.open_connection(self.host, self.port, ssl=self.ssl), self.timeout)
+            return await self._roundtrip(conn, path)
+
+    async def _roundtrip(self, conn: tuple, path: str) -> Response:
+        reader, writer = conn
+        keep = False
+        try:
+            writer.write(
+                f"GET {self.prefix}{path} HTTP/1.1\r\nHost: {self.host}\r\nAccept: application/json\r\n"
+                f"Connection: keep-alive\r\n\r\n".encode("latin-1"))
+            response, keep = await asyncio.wait_for(self._read(reader), self.timeout)
+            return response
+        finally:
+            if keep:
+                self._idle.append(conn)
+            else:
+                writer.close()
+
+    @staticmethod
+    async def _read(reader: asyncio.StreamReader) -> tuple[Response, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise ConnectionError("Connection closed before a response was received.")
+        version, status = status_line.decode("latin-1").split(None, 2)[:2]
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        keep = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while size := int((await reader.readline()).split(b";")[0], 16):
+                chunks.append(await reader.readexactly(size))
+                await reader.readline()
+            while await reader.readline() not in (b"\r\n", b"\n", b""):
+                pass  # trailers
+            body = b"".join(chunks)
+        elif "content-length" in headers:
+            body = await reader.readexactly(int(headers["content-length"]))
+        else:
+            body, keep = await reader.read(), False
+        return Response(int(status), headers, body), keep
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class AsyncHTTPProvider:
+    """
+    Asynchronous StatementProvider over the JSON layout above: `await provider.income(symbol)`.
+
+    `rate`/`burst` configure the shared TokenBucket, `max_connections` the pool;
+    failed requests are retried up to `retries` times, waiting `backoff` * 2^n
+    seconds (with jitter, at most `max_backoff`) or whatever Retry-After asks for.
+    """
+
+    def __init__(self, base_url: str, rate: float = 10.0, burst: int = 10, max_connections: int = 10,
+                 timeout: float = 10.0, retries: int = 4, backoff: float = 0.5, max_backoff: float = 30.0):
+        self.base_url = base_url
+        self.pool = ConnectionPool(base_url, max_connections=max_connections, timeout=timeout)
+        self.bucket = TokenBucket(rate, burst)
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def _coalesced(self, key: str, request: Callable[[], Awaitable]):
+        """Runs `request` once for all concurrent callers asking for `key`."""
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(request())
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        elif STATS.enabled:
+            STATS.cache("http.coalesced", True)
+        return await asyncio.shield(future)  # a cancelled caller must not cancel the others' request
+
+    async def _get_json(self, path: str):
+        """GET `path` as JSON with rate limiting and retries; None on 404."""
+        for attempt in range(self.retries + 1):
+            await self.bucket.acquire()
+            retry_after = None
+            try:
+                with STATS.timer("http.get"):
+                    response = await self.pool.get(path)
+                if response.status == 200:
+                    return response.json()
+                if response.status == 404:
+                    return None
+                retry_after = _seconds(response.headers.get("retry-after"))
+                error = HTTPError(response.status, self.base_url + path, retry_after)
+                if response.status not in RETRY_STATUSES:
+                    raise error
+                if response.status == 429:
+                    self.bucket.pause(retry_after or self._delay(attempt))
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ValueError) as e:
+                error = e
+            if attempt == self.retries:
+                raise error
+            delay = retry_after if retry_after is not None else self._delay(attempt)
+            logging.debug("Retrying %s in %.2fs after %r", path, delay, error)
+            await asyncio.sleep(delay)
+
+    def _delay(self, attempt: int) -> float:
+        return min(self.max_backoff, self.backoff * 2 ** attempt) * random.uniform(0.5, 1.0)
+
+    def _path(self, symbol: str, resource: str, **params) -> str:
+        query = f"?{urlencode(params)}" if params else ""
+        return f"/{quote(symbol.upper(), safe='')}/{resource}{query}"
+
+    async def _fetch(self, symbol: str, resource: str, **params):
+        path = self._path(symbol, resource, **params)
+        return await self._coalesced(path, lambda: self._get_json(path))
+
+    async def income(self, symbol: str) -> pd.DataFrame:
+        return frame_from_json(await self._fetch(symbol, "income"))
+
+    async def balance(self, symbol: str) -> pd.DataFrame:
+        return frame_from_json(await self._fetch(symbol, "balance"))
+
+    async def info(self, symbol: str) -> dict:
+        return await self._fetch(symbol, "info") or {}
+
+    async def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        history = frame_from_json(await self._fetch(symbol, "history", period=period), date_axis="index")
+        return history if not history.empty else pd.DataFrame(columns=["Close"])
+
+    async def last_closes(self, symbols: Iterable[str]) -> Dict[str, float | None]:
+        """Latest close per symbol, requested concurrently."""
+        symbols = list(dict.fromkeys(symbols))
+        histories = await asyncio.gather(*(self.history(s) for s in symbols), return_exceptions=True)
+        return {
+            s: float(h["Close"].iloc[-1]) if isinstance(h, pd.DataFrame) and not h.empty else None
+            for s, h in zip(symbols, histories)
+        }
+
+    async def close(self) -> None:
+        await self.pool.close()
+
+
+def _seconds(retry_after: str | None) -> float | None:
+    try:
+        return max(0.0, float(retry_after)) if retry_after else None
+    except ValueError:
+        return None  # an HTTP date; fall back to the backoff schedule
+
+
+class HTTPProvider:
+    """
+    Blocking StatementProvider facade over AsyncHTTPProvider (same arguments).
+
+    Calls from any thread are scheduled on one event loop running in a daemon
+    thread, so every caller shares the connection pool, the rate limit and the
+    request coalescing. Use many batch workers with it: a waiting thread costs
+    nothing upstream.
+    """
+
+    def __init__(self, base_url: str, **options):
+        self._options = (base_url, options)
+        self._provider: AsyncHTTPProvider | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+
+    def _run(self, coroutine_fn, *args):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="http-provider", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(self._call(coroutine_fn, *args), self._loop).result()
+
+    async def _call(self, coroutine_fn, *args):
+        if self._provider is None:  # created on the loop that will use its locks and connections
+            base_url, options = self._options
+            self._provider = AsyncHTTPProvider(base_url, **options)
+        return await coroutine_fn(self._provider, *args)
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self._run(AsyncHTTPProvider.income, symbol)
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self._run(AsyncHTTPProvider.balance, symbol)
+
+    def info(self, symbol: str) -> dict:
+        return self._run(AsyncHTTPProvider.info, symbol)
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        return self._run(AsyncHTTPProvider.history, symbol, period)
+
+    def last_closes(self, symbols: Iterable[str]) -> Dict[str, float | None]:
+        return self._run(AsyncHTTPProvider.last_closes, list(symbols))
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+            # Its locks, semaphore and connections belong to the stopped loop; a later
+            # call starts a new loop and builds a new provider on it
+            provider, self._provider = self._provider, None
+        if loop is not None:
+            if provider is not None:
+                asyncio.run_coroutine_threadsafe(provider.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
@@ -0,0 +1,218 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable
+import argparse
+import zlib
+
+import numpy as np
+import pandas as pd
+import polars as pl
+
+from .fs_accessor import FSAccessor
+from .providers import FileStatementProvider
+
+"""
+Synthetic financial statements for load tests and offline benchmarks.
+
+SyntheticProvider is a StatementProvider that invents a company per symbol:
+statements are yfinance-shaped (metric names as the index, fiscal year ends as
+columns, latest first) and obey the identities in FSAccessor.METRIC_DEFINITIONS,
+so a derived metric equals the row it replaces. Knobs:
+
+- `sparsity`: chance that a derivable row (one with a derivation rule) is left
+  out, so FSAccessor has to rebuild it. `drop` removes named metrics always.
+- `alias_rate`: chance that a row is emitted under one of its alternate primary
+  keys, e.g. "Operating Revenue" instead of "Total Revenue".
+- `missing_rate`: chance that a single cell is NaN.
+- `seed`: every symbol gets its own generator derived from (seed, symbol), so a
+  symbol's statements don't depend on the order or thread it was requested in.
+
+long_frame() / write_long() emit the same data in the long (Year, Metric, Value)
+format read by LongCSVReader and FileStatementProvider.
+"""
+
+# Extra rows yfinance reports that the derivations and valuation read
+EXTRA_ROWS = {"Gross PPE": "balance", "Accumulated Depreciation": "balance"}
+
+
+@dataclass(frozen=True)
+class SyntheticProvider:
+    periods: int = 4
+    end_year: int = 2024
+    sparsity: float = 0.0
+    alias_rate: float = 0.0
+    missing_rate: float = 0.0
+    drop: tuple = ()  # metric names never emitted
+    seed: int = 0
+
+    def _rng(self, symbol: str, stream: int = 0) -> np.random.Generator:
+        return np.random.default_rng([self.seed, zlib.crc32(symbol.encode()), stream])
+
+    def _company(self, symbol: str) -> Dict[str, np.ndarray]:
+        """Every standardized metric for `symbol`, oldest period first, consistent with the derivation rules."""
+        rng = self._rng(symbol)
+        n = self.periods
+        scale = np.exp(rng.normal(np.log(5e9), 1.5))
+        growth = rng.normal(0.06, 0.04) + rng.normal(0.0, 0.08, n)
+        revenue = scale * np.cumprod(1.0 + np.clip(growth, -0.5, 1.0))
+        wobble = lambda sd=0.02: 1.0 + rng.normal(0.0, sd, n)
+
+        m: Dict[str, np.ndarray] = {"Total Revenue": revenue}
+        m["Cost Of Revenue"] = revenue * rng.uniform(0.3, 0.8) * wobble()
+        m["Gross Profit"] = revenue - m["Cost Of Revenue"]
+        m["Operating Expense"] = m["Gross Profit"] * rng.uniform(0.3, 0.9) * wobble()
+        m["Operating Income"] = m["Gross Profit"] - m["Operating Expense"]
+        m["EBIT"] = m["Operating Income"] * wobble(0.05)
+        m["Depreciation And Amortization"] = revenue * rng.uniform(0.02, 0.08) * wobble()
+        m["EBITDA"] = m["EBIT"] + m["Depreciation And Amortization"]
+
+        m["Total Liabilities"] = revenue * rng.uniform(0.5, 2.0) * wobble()
+        m["Stockholders Equity"] = revenue * rng.uniform(0.3, 1.5) * wobble()
+        m["Total Assets"] = m["Total Liabilities"] + m["Stockholders Equity"]
+        m["Long Term Debt"] = m["Total Liabilities"] * rng.uniform(0.1, 0.5) * wobble()
+        m["Short Term Debt"] = m["Total Liabilities"] * rng.uniform(0.0, 0.15) * wobble()
+        m["Total Debt"] = m["Short Term Debt"] + m["Long Term Debt"]
+        m["Current Assets"] = m["Total Assets"] * rng.uniform(0.2, 0.5) * wobble()
+        m["Current Liabilities"] = m["Current Assets"] * rng.uniform(0.4, 1.2) * wobble()
+        m["Cash And Cash Equivalents"] = m["Current Assets"] * rng.uniform(0.1, 0.4) * wobble()
+        m["Inventory"] = m["Current Assets"] * rng.uniform(0.0, 0.3) * wobble()
+        m["Accounts Receivable"] = m["Current Assets"] * rng.uniform(0.1, 0.3) * wobble()
+        m["Gross PPE"] = m["Total Assets"] * rng.uniform(0.2, 0.6) * wobble()
+        m["Accumulated Depreciation"] = m["Gross PPE"] * rng.uniform(0.2, 0.5) * wobble()
+        m["Net PPE"] = m["Gross PPE"] - m["Accumulated Depreciation"]
+
+        m["Interest Expense"] = m["Total Debt"] * rng.uniform(0.02, 0.07) * wobble()
+        m["Pretax Income"] = m["EBIT"] - m["Interest Expense"]
+        tax_rate = np.clip(rng.normal(0.21, 0.04), 0.0, 0.4) * wobble()
+        m["Tax Rate For Calcs"] = tax_rate
+        m["Tax Provision"] = np.maximum(m["Pretax Income"], 0.0) * tax_rate
+        m["Net Income"] = m["Pretax Income"] - m["Tax Provision"]
+        shares = scale / rng.uniform(10.0, 200.0)
+        m["Diluted EPS"] = m["Net Income"] / shares
+        return m
+
+    def _rows(self, symbol: str, statement: str, values: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """The rows of one statement as emitted: sparsity, aliases and missing cells applied, latest period first."""
+        rng = self._rng(symbol, stream=1 if statement == "income" else 2)
+        defs = FSAccessor.METRIC_DEFINITIONS
+        rows = {}
+        for metric, vals in values.items():
+            spec = defs.get(metric)
+            if (spec["statement"] if spec else EXTRA_ROWS[metric]) != statement:
+                continue
+            if metric in self.drop:
+                continue
+            if spec and spec["derivation"] and rng.random() < self.sparsity:
+                continue
+            key = metric
+            if spec and len(spec["primary_keys"]) > 1 and rng.random() < self.alias_rate:
+                key = str(rng.choice(spec["primary_keys"][1:]))
+            vals = vals[::-1].copy()  # latest first, like yfinance
+            if self.missing_rate:
+                vals[rng.random(self.periods) < self.missing_rate] = np.nan
+            rows[key] = vals
+        return rows
+
+    def _statement(self, symbol: str, statement: str) -> pd.DataFrame:
+        rows = self._rows(symbol, statement, self._company(symbol))
+        columns = pd.to_datetime([f"{self.end_year - i}-12-31" for i in range(self.periods)])
+        return pd.DataFrame.from_dict(rows, orient="index", columns=columns)
+
+    def income(self, symbol: str) -> pd.DataFrame:
+        return self._statement(symbol, "income")
+
+    def balance(self, symbol: str) -> pd.DataFrame:
+        return self._statement(symbol, "balance")
+
+    def info(self, symbol: str) -> dict:
+        rng = self._rng(symbol, stream=3)
+        shares = float(np.exp(rng.normal(np.log(5e8), 1.0)))
+        price = float(rng.uniform(5.0, 500.0))
+        return {
+            "beta": float(np.clip(rng.normal(1.0, 0.3), 0.1, 3.0)),
+            "sharesOutstanding": shares,
+            "marketCap": shares * price,
+            "currentPrice": price,
+        }
+
+    def history(self, symbol: str, period: str = "1d") -> pd.DataFrame:
+        days = 1 if period == "1d" else 252
+        rng = self._rng(symbol, stream=4)
+        last = self.info(symbol)["currentPrice"]
+        walk = np.cumsum(rng.normal(0.0, 0.02, days))
+        closes = last * np.exp(walk - walk[-1])  # random walk ending at the current price
+        index = pd.bdate_range(end=f"{self.end_year + 1}-01-02", periods=days)
+        return pd.DataFrame({"Close": closes}, index=index)
+
+    def last_closes(self, symbols: Iterable[str]) -> Dict[str, float | None]:
+        return {s: self.info(s)["currentPrice"] for s in symbols}
+
+    def long_frame(self, symbols: Iterable[str], statements: Iterable[str] = ("income", "balance"),
+                   entity_col: str | None = "Ticker") -> pl.DataFrame:
+        """Long (entity, Year, Metric, Value) frame for `symbols`; drop `entity_col` for a single-company file."""
+        years = np.arange(self.end_year, self.end_year - self.periods, -1)
+        parts = []
+        for symbol in symbols:
+            values = self._company(symbol)
+            for statement in statements:
+                rows = self._rows(symbol, statement, values)
+                long = pl.DataFrame({
+                    "Year": np.tile(years, len(rows)),
+                    "Metric": np.repeat(list(rows), self.periods),
+                    "Value": np.concatenate(list(rows.values())) if rows else np.array([]),
+                })
+                if entity_col:
+                    long = long.select(pl.lit(symbol).alias(entity_col), pl.all())
+                parts.append(long)
+        return pl.concat(parts) if parts else pl.DataFrame()
+
+    def write_long(self, path: str | Path, symbols: Iterable[str], statements: Iterable[str] = ("income", "balance"),
+                   entity_col: str | None = "Ticker") -> Path:
+        """Writes long_frame() as CSV, Parquet or Arrow IPC, chosen by the file suffix."""
+        path = Path(path)
+        df = self.long_frame(symbols, statements, entity_col)
+        if path.suffix.lower() in (".parquet", ".pq"):
+            df.write_parquet(path)
+        elif path.suffix.lower() in (".arrow", ".ipc", ".feather"):
+            df.write_ipc(path)
+        else:
+            df.write_csv(path)
+        return path
+
+    def save(self, root: str | Path, symbols: Iterable[str]) -> FileStatementProvider:
+        """Snapshots `symbols` into a FileStatementProvider directory (usable with main.py --data-dir)."""
+        target = FileStatementProvider(root)
+        for symbol in symbols:
+            target.save(symbol, self)
+        return target
+
+
+def symbols(n: int) -> list[str]:
+    """`n` distinct synthetic ticker symbols: SYN0000, SYN0001, ..."""
+    return [f"SYN{i:04d}" for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic financial statements for load tests.")
+    parser.add_argument("out", help="Long file (.csv/.parquet/.arrow) or, with --data-dir, a snapshot directory.")
+    parser.add_argument("--tickers", default=100, type=int, help="Number of synthetic companies.")
+    parser.add_argument("--periods", default=4, type=int, help="Fiscal years per company.")
+    parser.add_argument("--sparsity", default=0.0, type=float, help="Chance a derivable row is missing.")
+    parser.add_argument("--alias-rate", default=0.0, type=float, help="Chance a row uses an alternate yfinance name.")
+    parser.add_argument("--missing-rate", default=0.0, type=float, help="Chance a single value is NaN.")
+    parser.add_argument("--seed", default=0, type=int)
+    parser.add_argument("--data-dir", action="store_true", help="Write a FileStatementProvider snapshot instead of a long file.")
+    args = parser.parse_args()
+
+    provider = SyntheticProvider(periods=args.periods, sparsity=args.sparsity, alias_rate=args.alias_rate,
+                                 missing_rate=args.missing_rate, seed=args.seed)
+    universe = symbols(args.tickers)
+    if args.data_dir:
+        provider.save(args.out, universe)
+        Path(args.out, "tickers.txt").write_text("\n".join(universe) + "\n")
+    else:
+        provider.write_long(args.out, universe)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,36 +1,134 @@
 import argparse
-import yfinance as yf
+import atexit
 import logging
+import sys
 
-from ratios import Efficiency, Growth, Leverage, Liquidity, Profitability
-from valuation import Valuation, WACCCalculator
+# numpy, pandas and the analysis packages are imported in main() once the
+# arguments parse, so --help and argument errors return without loading them.
+
+
+def parse_range(spec: str) -> "np.ndarray":
+    """'start:stop:num' (inclusive linspace) or a comma-separated list of values."""
+    import numpy as np
+    if ":" in spec:
+        start, stop, num = spec.split(":")
+        return np.linspace(float(start), float(stop), int(num))
+    return np.array([float(v) for v in spec.split(",")])
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts and sizes that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 
 def main():
     # --- Setup Logging ---
     logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s') 
     parser = argparse.ArgumentParser()
-    parser.add_argument("-t", "--ticker", required=True, help="Stock ticker symbol (e.g., AAPL)")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("-t", "--ticker", help="Stock ticker symbol (e.g., AAPL)")
+    source.add_argument("--tickers", help="Comma-separated ticker symbols to screen in batch mode.")
+    source.add_argument("--tickers-file", help="File with ticker symbols (one per line) to screen in batch mode.")
+    parser.add_argument("--workers", default=8, type=int, help="Concurrent fetches in batch mode.")
+    parser.add_argument("--executor", default="thread", choices=("thread", "process"),
+                        help="Batch mode: analyse on the fetch threads, or on a pool of worker processes. The pool costs "
+                             "about a second to start and serializes each ticker's statements, so it only pays off for "
+                             "cached batches of a few hundred tickers or more on several cores; otherwise threads are faster.")
+    parser.add_argument("--processes", type=int, help="Worker processes for --executor process (default: one per CPU).")
     parser.add_argument("--wacc", type=float, help="Directly input WACC, overriding calculation.")
     parser.add_argument("--risk-free-rate", default=0.04, type=float, help="Risk-free rate for CAPM.")
     parser.add_argument("--equity-risk-premium", default=0.05, type=float, help="Equity risk premium for CAPM.")
     parser.add_argument("--dcf", action="store_true")
+    parser.add_argument("--horizon", default=5, type=int, help="DCF explicit projection horizon in years.")
+    parser.add_argument("--terminal-growth", default=0.025, type=float, help="DCF terminal (Gordon) growth rate.")
+    parser.add_argument("--exit-multiple", type=float, help="Use an EV/EBITDA exit multiple for the DCF terminal value.")
+    parser.add_argument("--simulate", type=positive_int, metavar="N", help="Monte Carlo DCF valuation with N scenarios.")
+    parser.add_argument("--chunk-size", default=250_000, type=positive_int, help="Scenarios evaluated per vectorized chunk.")
+    parser.add_argument("--seed", type=int, help="Random seed for --simulate.")
+    parser.add_argument("--sensitivity", action="store_true", help="Print a WACC x terminal-growth value table.")
+    parser.add_argument("--rf-range", type=parse_range, help="Risk-free rate range for the sensitivity grid (start:stop:num or a,b,c).")
+    parser.add_argument("--erp-range", type=parse_range, help="Equity risk premium range for the sensitivity grid.")
+    parser.add_argument("--beta-range", type=parse_range, help="Beta override range for the sensitivity grid.")
+    parser.add_argument("--tax-range", type=parse_range, help="Tax rate range for the sensitivity grid.")
+    parser.add_argument("--tg-range", type=parse_range, help="Terminal growth range for the sensitivity grid.")
+    parser.add_argument("--data-dir", help="Read statements from a FileStatementProvider snapshot instead of yfinance.")
+    parser.add_argument("--api-url", help="Read statements from a JSON HTTP API at this base URL (see core.remote) instead of yfinance.")
+    parser.add_argument("--rate-limit", default=10.0, type=float, help="Requests per second allowed against --api-url.")
+    parser.add_argument("--cache-dir", help="Directory of the on-disk statement cache (default: ~/.cache/evw).")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk statement cache.")
+    parser.add_argument("--refresh-cache", action="store_true", help="Refetch everything and overwrite cached entries.")
+    parser.add_argument("--output", help="Write report rows to this file as they complete ('-' for stdout) instead of printing a table.")
+    parser.add_argument("--format", choices=("jsonl", "csv", "parquet"),
+                        help="Format of --output (default: from its suffix, else jsonl).")
+    parser.add_argument("--profile", action="store_true", help="Print fetch/metric/ratio timings, lookup paths and cache hit rates at exit.")
  
     args = parser.parse_args()
-    print("DCF: ",args.dcf)
+
+    import numpy as np
+    from core import STATS, CachingProvider, DiagnosticsCollector, FinancialContext, FileStatementProvider, HTTPProvider, YFinanceProvider
+    from ratios import Efficiency, Growth, Leverage, Liquidity, Profitability
+    from valuation import DCFAssumptions, Valuation, WACCCalculator, sensitivity_grid, simulate, wacc_growth_table
+    from screening import ProcessExecutor, ThreadExecutor, compute_report, open_sink, read_tickers_file, run_batch, stream_batch
+
+    if args.profile:
+        STATS.enable()
+        atexit.register(lambda: print("\nProfile:\n" + STATS.report(), file=sys.stderr))
+    if args.output != "-":
+        print("DCF: ",args.dcf)
     
     risk_free_rate = args.risk_free_rate
     equity_risk_premium = args.equity_risk_premium 
+    if args.data_dir:
+        provider = FileStatementProvider(args.data_dir)
+    else:
+        if args.api_url:
+            source = HTTPProvider(args.api_url, rate=args.rate_limit, burst=max(1, int(args.rate_limit)))
+        else:
+            source = YFinanceProvider()
+        if args.no_cache:
+            provider = source
+        else:
+            cache_kwargs = {"cache_dir": args.cache_dir} if args.cache_dir else {}
+            provider = CachingProvider(source, refresh=args.refresh_cache, **cache_kwargs)
+
+    if args.tickers or args.tickers_file:
+        symbols = args.tickers.split(",") if args.tickers else read_tickers_file(args.tickers_file)
+        symbols = [s.strip().upper() for s in symbols if s.strip()]
+        diagnostics = DiagnosticsCollector()
+        if args.executor == "process":
+            executor = ProcessExecutor(args.processes, fetch_workers=args.workers)
+        else:
+            executor = ThreadExecutor(args.workers)
+        if args.output:
+            with open_sink(args.output, args.format) as sink:
+                written = stream_batch(symbols, sink, risk_free_rate, equity_risk_premium, wacc=args.wacc,
+                                       provider=provider, diagnostics=diagnostics, executor=executor)
+            logging.info("Wrote %d rows to %s.", written, args.output)
+        else:
+            table = run_batch(symbols, risk_free_rate, equity_risk_premium, wacc=args.wacc, provider=provider,
+                              diagnostics=diagnostics, executor=executor)
+            print(table.to_string(float_format=lambda v: f"{v:.4f}"))
+        diagnostics.emit()
+        return
 
-    ticker = yf.Ticker(args.ticker)
-    # print(ticker.financials.index)
-    # print(ticker.balance_sheet.index)
+    # One shared session: statements, info and price are fetched once for every ratio class.
+    context = FinancialContext(args.ticker, provider).load()
+    if args.output:
+        with open_sink(args.output, args.format) as sink:
+            sink.write({**compute_report(context, risk_free_rate, equity_risk_premium, args.wacc), "error": None})
+        if args.output == "-":
+            return
+    # print(context.fs.income.index)
+    # print(context.fs.balance.index)
 
 
     def print_metric(name, value):
         print(f"{name:<25} {f'{value:.4f}' if value is not None else 'Not Available'}")
 
-    profitability = Profitability(ticker)
+    profitability = Profitability(context)
     print("\nProfitability: ")
     print_metric("Return on Equity", profitability.roe())
     print_metric("Return on Assets", profitability.roa())
@@ -39,31 +137,31 @@ def main():
     print_metric("Net Income Margin", profitability.net_margin())
     print_metric("EBITDA Margin", profitability.ebitda_margin())
     
-    leverage = Leverage(ticker=ticker)
+    leverage = Leverage(context)
     print("\nLeverage: ")
     print_metric("Debt to Equity", leverage.debt_to_equity())
     print_metric("Debt ratio", leverage.debt_ratio())
     print_metric("Equity ratio", leverage.equity_ratio())
     print_metric("Interest Coverage", leverage.interest_coverage())
 
-    efficiency = Efficiency(ticker=ticker)
+    efficiency = Efficiency(context)
     print("\nEfficiency: ")
     print_metric("Asset Turnover", efficiency.asset_turnover())
     print_metric("Inventory Turnover", efficiency.inventory_turnover())
     print_metric("Receivables Turnover", efficiency.receivables_turnover())
 
-    growth = Growth(ticker=ticker)
+    growth = Growth(context)
     print("\nGrowth: ")
     print_metric("Revenue Growth", growth.revenue_growth())
     print_metric("Net Income Growth", growth.net_income_growth())
     print_metric("EPS Growth", growth.eps_growth())
 
-    liquidity = Liquidity(ticker)
+    liquidity = Liquidity(context)
     print("\nLiquidity:")
     print_metric("Current Ratio", liquidity.current_ratio())
     print_metric("Quick Ratio", liquidity.quick_ratio())
 
-    valuation = Valuation(ticker)
+    valuation = Valuation(context)
     print("\nValuation: ")
     print_metric("P/E Ratio", valuation.pe_ratio())
     print_metric("P/B Ratio", valuation.pb_ratio())
@@ -72,9 +170,10 @@ def main():
     # --- New WACC Calculation Section ---
     print("\nDiscount Rate (WACC):")
     if args.wacc:
+        wacc = args.wacc
         print_metric("WACC (provided)", args.wacc)
     else:
-        wacc_calculator = WACCCalculator(ticker)
+        wacc_calculator = WACCCalculator(context)
         wacc = wacc_calculator.calculate(risk_free_rate, equity_risk_premium)
         
         print_metric("Risk-Free Rate", risk_free_rate)
@@ -84,9 +183,82 @@ def main():
         print_metric("Effective Tax Rate", wacc_calculator.effective_tax_rate())
         print_metric("WACC (calculated)", wacc)
 
-        if(args.dcf):
-            print("FCFF:\n", valuation.dcf())    
+    assumptions = DCFAssumptions(
+        horizon=args.horizon,
+        terminal_growth=args.terminal_growth,
+        terminal_method="exit_multiple" if args.exit_multiple else "gordon",
+        exit_multiple=args.exit_multiple,
+    )
+    if args.dcf:
+        print("\nDCF:")
+        print("FCFF:\n", valuation.fcff_series_from_statements())
+        result = valuation.dcf(wacc=wacc, assumptions=assumptions) if wacc is not None else None
+        if result is None:
+            print_metric("Enterprise Value", None)
+        else:
+            print_metric("PV of FCFF", result.pv_fcff)
+            print_metric("PV of Terminal Value", result.pv_terminal)
+            print_metric("Enterprise Value", result.enterprise_value)
+            print_metric("Equity Value", result.equity_value)
+            print_metric("Value per Share", result.value_per_share)
+
+    if args.simulate:
+        wacc_inputs = WACCCalculator(context).inputs()
+        dcf_inputs = valuation.dcf_inputs()
+        print(f"\nMonte Carlo ({args.simulate} scenarios):")
+        if wacc_inputs is None or dcf_inputs is None:
+            print("Not Available")
+        else:
+            sim = simulate(wacc_inputs, dcf_inputs, args.simulate, assumptions=assumptions,
+                           risk_free_rate=risk_free_rate, equity_risk_premium=equity_risk_premium,
+                           chunk_size=args.chunk_size, seed=args.seed)
+            target = "value_per_share" if dcf_inputs.shares_outstanding else "enterprise_value"
+            print_metric("Valid scenarios", float(sim.valid.mean()))
+            for q, v in sim.percentiles(of="wacc").items():
+                print_metric(f"WACC P{q:g}", v)
+            for q, v in sim.percentiles(of=target).items():
+                print_metric(f"Value P{q:g}", v)
+            counts, edges = sim.histogram(bins=20, of=target)
+            peak = counts.max() if counts.size else 1
+            for count, lo in zip(counts, edges[:-1]):
+                print(f"{lo:>14.2f} | {'#' * int(40 * count / peak)}")
+
+    if args.sensitivity:
+        wacc_inputs = WACCCalculator(context).inputs()
+        dcf_inputs = valuation.dcf_inputs()
+        print("\nSensitivity:")
+        if dcf_inputs is None or (wacc is None and wacc_inputs is None):
+            print("Not Available")
+        else:
+            target = "value_per_share" if dcf_inputs.shares_outstanding else "enterprise_value"
+            growths = args.tg_range if args.tg_range is not None else np.linspace(0.01, 0.035, 6)
+            grid_ranges = {
+                "risk_free_rate": args.rf_range, "equity_risk_premium": args.erp_range,
+                "beta": args.beta_range, "tax_rate": args.tax_range,
+            }
+            if any(r is not None for r in grid_ranges.values()) and wacc_inputs is not None:
+                grid = sensitivity_grid(
+                    wacc_inputs, dcf_inputs, assumptions,
+                    risk_free_rate=risk_free_rate if args.rf_range is None else args.rf_range,
+                    equity_risk_premium=equity_risk_premium if args.erp_range is None else args.erp_range,
+                    beta=args.beta_range, tax_rate=args.tax_range, terminal_growth=growths,
+                )
+                varied = [name for name, axis in grid.axes.items() if len(axis) > 1]
+                print(f"Grid {' x '.join(f'{n}[{len(grid.axes[n])}]' for n in grid.axes)}")
+                if len(varied) > 1:
+                    rows, cols = varied[0], varied[-1]
+                else:  # at most one range has several values: pad with the first other axes
+                    rows, cols = (varied + [n for n in grid.axes if n not in varied])[:2]
+                print(grid.table(rows, cols, of=target).to_string(float_format=lambda v: f"{v:.2f}"))
+            elif wacc is None:
+                print("Not Available")
+            else:
+                waccs = wacc + np.linspace(-0.02, 0.02, 9)
+                print(wacc_growth_table(dcf_inputs, waccs, growths, assumptions, of=target)
+                      .to_string(float_format=lambda v: f"{v:.4f}"))
+
+    context.diagnostics.emit()
 
 if __name__ == "__main__":
     main()
-    print("Done")
+    print("Done", file=sys.stderr)  # stdout may carry --output -
@@ -3,3 +3,4 @@ from .leverage import Leverage
 from .liquidity import Liquidity
 from .efficiency import Efficiency
 from .growth import Growth
+from .panel import RatioPanel
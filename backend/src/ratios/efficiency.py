@@ -1,5 +1,5 @@
-from core import yf, FSAccessor
-import logging
+from core import yf, FinancialContext, instrument
+import pandas as pd
 
 """
 
@@ -12,10 +12,11 @@ Receivables Turnover = Revenue / Average Accounts Receivable
 These measure how well assets are being used.
 
 """
+@instrument
 class Efficiency:
 
-    def __init__(self, ticker: yf.Ticker):
-        self.fs = FSAccessor(ticker)
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.fs = FinancialContext.of(ticker).fs
 
     def asset_turnover(self) -> float | None:
         revenue_series = self.fs.get_metric("Total Revenue")
@@ -33,7 +34,7 @@ class Efficiency:
                 return 0.0
             return total_revenue / avg_assets
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Asset Turnover due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Asset Turnover", "insufficient data: %s", e)
             return None
     
     def inventory_turnover(self) -> float | None:
@@ -52,7 +53,7 @@ class Efficiency:
                 return 0.0
             return cost_of_revenue / avg_inventory
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Inventory Turnover due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Inventory Turnover", "insufficient data: %s", e)
             return None
 
     def receivables_turnover(self) -> float | None:
@@ -71,5 +72,16 @@ class Efficiency:
                 return 0.0
             return total_revenue / avg_ar
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Receivables Turnover due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Receivables Turnover", "insufficient data: %s", e)
             return None
+
+    def series(self) -> pd.DataFrame:
+        """Every efficiency ratio for every available period (rows latest first)."""
+        revenue = self.fs.get_metric("Total Revenue")
+        return self.fs.to_frame({
+            "asset_turnover": self.fs.divide(revenue, self.fs.average(self.fs.get_metric("Total Assets"))),
+            "inventory_turnover": self.fs.divide(
+                self.fs.get_metric("Cost Of Revenue"), self.fs.average(self.fs.get_metric("Inventory"))
+            ),
+            "receivables_turnover": self.fs.divide(revenue, self.fs.average(self.fs.get_metric("Accounts Receivable"))),
+        })
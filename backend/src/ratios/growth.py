@@ -1,5 +1,5 @@
-from core import yf, FSAccessor
-import logging
+from core import yf, FinancialContext, instrument
+import pandas as pd
 
 """
 Revenue Growth = (Revenue this year - Revenue last year) / Revenue last year
@@ -12,10 +12,11 @@ Growth rates show trends over time.
 
 """
 
+@instrument
 class Growth:
 
-    def __init__(self, ticker: yf.Ticker):
-        self.fs = FSAccessor(ticker)
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.fs = FinancialContext.of(ticker).fs
 
     def revenue_growth(self) -> float | None:
         revenue_series = self.fs.get_metric("Total Revenue")
@@ -28,7 +29,7 @@ class Growth:
                 return 0.0
             return (curr_revenue - prev_revenue) / prev_revenue
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Revenue Growth due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Revenue Growth", "insufficient data: %s", e)
             return None
         
     def net_income_growth(self) -> float | None:
@@ -42,7 +43,7 @@ class Growth:
                 return 0.0
             return (curr_ni - prev_ni) / prev_ni
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Net Income Growth due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Net Income Growth", "insufficient data: %s", e)
             return None
     
     def eps_growth(self) -> float | None:
@@ -56,6 +57,13 @@ class Growth:
                 return 0.0
             return (curr_eps - prev_eps) / prev_eps
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate EPS Growth due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("EPS Growth", "insufficient data: %s", e)
             return None
-        
\ No newline at end of file
+
+    def series(self) -> pd.DataFrame:
+        """Every growth rate for every available period (rows latest first; the oldest period is NaN)."""
+        return self.fs.to_frame({
+            "revenue_growth": self.fs.growth(self.fs.get_metric("Total Revenue")),
+            "net_income_growth": self.fs.growth(self.fs.get_metric("Net Income")),
+            "eps_growth": self.fs.growth(self.fs.get_metric("Diluted EPS")),
+        })
@@ -1,11 +1,12 @@
 
-from core import yf, FSAccessor
-import logging
+from core import yf, FinancialContext, instrument
+import pandas as pd
 
+@instrument
 class Leverage:
 
-    def __init__(self, ticker: yf.Ticker):
-        self.fs = FSAccessor(ticker)
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.fs = FinancialContext.of(ticker).fs
     
     def debt_to_equity(self) -> float | None:
         debt_series = self.fs.get_metric("Total Debt")
@@ -21,7 +22,7 @@ class Leverage:
                 return 0.0
             return total_debt / equity
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Debt to Equity due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Debt to Equity", "insufficient data: %s", e)
             return None
     
     def debt_ratio(self) -> float | None:
@@ -38,7 +39,7 @@ class Leverage:
                 return 0.0
             return total_debt / total_assets
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Debt Ratio due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Debt Ratio", "insufficient data: %s", e)
             return None
 
     def equity_ratio(self) -> float | None:
@@ -55,7 +56,7 @@ class Leverage:
                 return 0.0
             return total_equity / total_assets
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Equity Ratio due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Equity Ratio", "insufficient data: %s", e)
             return None
 
     def interest_coverage(self) -> float | None:
@@ -72,5 +73,19 @@ class Leverage:
                 return float('inf') # Or a large number to signify high coverage
             return ebit / interest_expense
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Interest Coverage due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Interest Coverage", "insufficient data: %s", e)
             return None
+
+    def series(self) -> pd.DataFrame:
+        """Every leverage ratio for every available period (rows latest first)."""
+        debt = self.fs.get_metric("Total Debt")
+        equity = self.fs.get_metric("Stockholders Equity")
+        assets = self.fs.get_metric("Total Assets")
+        return self.fs.to_frame({
+            "debt_to_equity": self.fs.divide(debt, equity),
+            "debt_ratio": self.fs.divide(debt, assets),
+            "equity_ratio": self.fs.divide(equity, assets),
+            "interest_coverage": self.fs.divide(
+                self.fs.get_metric("EBIT"), self.fs.get_metric("Interest Expense"), on_zero=float('inf')
+            ),
+        })
@@ -1,5 +1,5 @@
-from core import yf, FSAccessor
-import logging
+from core import yf, FinancialContext, instrument
+import pandas as pd
 
 """
 Liquidity Ratios
@@ -12,10 +12,11 @@ These test short-term financial health (ability to pay obligations).
 
 """
 
+@instrument
 class Liquidity:
 
-    def __init__(self, ticker: yf.Ticker):
-        self.fs = FSAccessor(ticker)
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.fs = FinancialContext.of(ticker).fs
 
     def current_ratio(self) -> float | None:
         assets_series = self.fs.get_metric("Current Assets")
@@ -31,7 +32,7 @@ class Liquidity:
                 return 0.0
             return assets / liabilities
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Current Ratio due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Current Ratio", "insufficient data: %s", e)
             return None
         
     def quick_ratio(self) -> float | None:
@@ -50,6 +51,16 @@ class Liquidity:
                 return 0.0
             return (assets - inventory) / liabilities
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Quick Ratio due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Quick Ratio", "insufficient data: %s", e)
             return None
-        
\ No newline at end of file
+
+    def series(self) -> pd.DataFrame:
+        """Every liquidity ratio for every available period (rows latest first)."""
+        assets = self.fs.get_metric("Current Assets")
+        liabilities = self.fs.get_metric("Current Liabilities")
+        inventory = self.fs.get_metric("Inventory")
+        quick_assets = None if assets is None or inventory is None else assets.astype(float) - inventory.astype(float)
+        return self.fs.to_frame({
+            "current_ratio": self.fs.divide(assets, liabilities),
+            "quick_ratio": self.fs.divide(quick_assets, liabilities),
+        })
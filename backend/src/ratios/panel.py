@@ -0,0 +1,146 @@
+from typing import Iterable, Sequence
+import numpy as np
+import pandas as pd
+
+from core import FSAccessor
+
+"""
+Cross-sectional ratio engine.
+
+Stacks the resolved metrics of many tickers into one (ticker x period x metric)
+array and computes every ratio from ratios/*.py for all tickers in a handful of
+NumPy expressions. The rules match the per-ticker classes:
+
+- "latest"/"previous" are the first two non-missing periods of each metric
+  (like FSAccessor.latest and latest_and_prev), so periods line up the same way.
+- A missing metric or too few periods gives NaN (the classes return None).
+- A zero denominator gives 0.0, except Interest Coverage which gives inf.
+"""
+
+
+class RatioPanel:
+
+    METRICS = (
+        "Total Revenue",
+        "Cost Of Revenue",
+        "Gross Profit",
+        "Operating Income",
+        "Net Income",
+        "EBITDA",
+        "EBIT",
+        "Interest Expense",
+        "Diluted EPS",
+        "Total Assets",
+        "Current Assets",
+        "Current Liabilities",
+        "Inventory",
+        "Accounts Receivable",
+        "Stockholders Equity",
+        "Total Debt",
+    )
+
+    def __init__(self, values: np.ndarray, tickers: Sequence[str], metrics: Sequence[str] = METRICS):
+        """`values` has shape (tickers, periods, metrics), periods ordered latest first."""
+        if values.ndim != 3 or values.shape[0] != len(tickers) or values.shape[2] != len(metrics):
+            raise ValueError(f"Expected values of shape ({len(tickers)}, periods, {len(metrics)}). Got: {values.shape}")
+        self.values = values.astype(float, copy=False)
+        self.tickers = list(tickers)
+        self.metrics = list(metrics)
+        self._col = {m: i for i, m in enumerate(self.metrics)}
+
+    @classmethod
+    def from_accessors(cls, accessors: Iterable[FSAccessor]) -> "RatioPanel":
+        """Resolves the panel metrics through each ticker's FSAccessor and stacks them."""
+        accessors = list(accessors)
+        rows = []
+        for fs in accessors:
+            resolved = [fs.get_metric(m) for m in cls.METRICS]
+            rows.append([np.array([], dtype=float) if s is None else s.to_numpy(dtype=float) for s in resolved])
+        n_periods = max((len(v) for row in rows for v in row), default=0)
+        values = np.full((len(accessors), n_periods, len(cls.METRICS)), np.nan)
+        for t, row in enumerate(rows):
+            for m, v in enumerate(row):
+                values[t, :len(v), m] = v
+        return cls(values, [fs.symbol for fs in accessors])
+
+    @classmethod
+    def from_long(cls, df: pd.DataFrame) -> "RatioPanel":
+        """
+        Builds a panel from a long frame with `ticker`, `period`, `metric` and `value` columns
+        (e.g. a bulk export), without going through FSAccessor.
+        """
+        df = df[df["metric"].isin(cls.METRICS)]
+        tickers = pd.Index(df["ticker"].unique())
+        # Rank periods latest-first within each ticker
+        rank = df.groupby("ticker")["period"].rank(method="dense", ascending=False).astype(int) - 1
+        n_periods = int(rank.max()) + 1 if len(rank) else 0
+        values = np.full((len(tickers), n_periods, len(cls.METRICS)), np.nan)
+        metric_idx = pd.Index(cls.METRICS).get_indexer(df["metric"])
+        values[tickers.get_indexer(df["ticker"]), rank.to_numpy(), metric_idx] = df["value"].to_numpy(dtype=float)
+        return cls(values, list(tickers))
+
+    # --- Panel primitives ---
+
+    def _compact(self) -> np.ndarray:
+        # Shift the non-missing periods of every (ticker, metric) to the front, keeping order
+        order = np.argsort(np.isnan(self.values), axis=1, kind="stable")
+        return np.take_along_axis(self.values, order, axis=1)
+
+    def _latest(self, compact: np.ndarray, metric: str) -> np.ndarray:
+        if compact.shape[1] < 1:
+            return np.full(len(self.tickers), np.nan)
+        return compact[:, 0, self._col[metric]]
+
+    def _prev(self, compact: np.ndarray, metric: str) -> np.ndarray:
+        if compact.shape[1] < 2:
+            return np.full(len(self.tickers), np.nan)
+        return compact[:, 1, self._col[metric]]
+
+    def _average(self, compact: np.ndarray, metric: str) -> np.ndarray:
+        return (self._latest(compact, metric) + self._prev(compact, metric)) / 2
+
+    @staticmethod
+    def _divide(num: np.ndarray, den: np.ndarray, on_zero: float = 0.0) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where(den == 0, on_zero, num / den)
+        out[np.isnan(num) | np.isnan(den)] = np.nan
+        return out
+
+    def _growth(self, compact: np.ndarray, metric: str) -> np.ndarray:
+        curr, prev = self._latest(compact, metric), self._prev(compact, metric)
+        return self._divide(curr - prev, prev)
+
+    # --- Ratios ---
+
+    def compute(self) -> pd.DataFrame:
+        """Every ratio for every ticker, one column per ratio (NaN where the classes return None)."""
+        c = self._compact()
+        latest = lambda m: self._latest(c, m)
+        revenue = latest("Total Revenue")
+
+        ratios = {
+            # Profitability
+            "roe": self._divide(latest("Net Income"), self._average(c, "Stockholders Equity")),
+            "roa": self._divide(latest("Net Income"), self._average(c, "Total Assets")),
+            "gross_margin": self._divide(latest("Gross Profit"), revenue),
+            "operating_margin": self._divide(latest("Operating Income"), revenue),
+            "net_margin": self._divide(latest("Net Income"), revenue),
+            "ebitda_margin": self._divide(latest("EBITDA"), revenue),
+            # Leverage
+            "debt_to_equity": self._divide(latest("Total Debt"), latest("Stockholders Equity")),
+            "debt_ratio": self._divide(latest("Total Debt"), latest("Total Assets")),
+            "equity_ratio": self._divide(latest("Stockholders Equity"), latest("Total Assets")),
+            "interest_coverage": self._divide(latest("EBIT"), latest("Interest Expense"), on_zero=np.inf),
+            # Efficiency
+            "asset_turnover": self._divide(revenue, self._average(c, "Total Assets")),
+            "inventory_turnover": self._divide(latest("Cost Of Revenue"), self._average(c, "Inventory")),
+            "receivables_turnover": self._divide(revenue, self._average(c, "Accounts Receivable")),
+            # Growth
+            "revenue_growth": self._growth(c, "Total Revenue"),
+            "net_income_growth": self._growth(c, "Net Income"),
+            "eps_growth": self._growth(c, "Diluted EPS"),
+            # Liquidity
+            "current_ratio": self._divide(latest("Current Assets"), latest("Current Liabilities")),
+            "quick_ratio": self._divide(latest("Current Assets") - latest("Inventory"), latest("Current Liabilities")),
+        }
+        return pd.DataFrame(ratios, index=pd.Index(self.tickers, name="ticker"))
@@ -1,10 +1,11 @@
-from core import yf, FSAccessor
-import logging
+from core import yf, FinancialContext, instrument
+import pandas as pd
 
+@instrument
 class Profitability:
 
-    def __init__(self, ticker: yf.Ticker):
-        self.fs = FSAccessor(ticker)
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.fs = FinancialContext.of(ticker).fs
 
     def net_margin(self) -> float | None:
         ni_series = self.fs.get_metric("Net Income")
@@ -20,7 +21,7 @@ class Profitability:
                 return 0.0
             return ni / rev
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Net Margin due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Net Margin", "insufficient data: %s", e)
             return None
         
     def gross_profit_margin(self) -> float | None:
@@ -37,7 +38,7 @@ class Profitability:
                 return 0.0
             return gp / rev
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Gross Profit Margin due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Gross Profit Margin", "insufficient data: %s", e)
             return None
     
     def operating_margin(self) -> float | None:
@@ -54,7 +55,7 @@ class Profitability:
                 return 0.0
             return op_income / rev
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Operating Margin due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Operating Margin", "insufficient data: %s", e)
             return None
         
     def ebitda_margin(self) -> float | None:
@@ -71,7 +72,7 @@ class Profitability:
                 return 0.0
             return ebitda / rev
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate EBITDA Margin due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("EBITDA Margin", "insufficient data: %s", e)
             return None
 
     def roa(self) -> float | None:
@@ -89,7 +90,7 @@ class Profitability:
                 return 0.0
             return ni / avg_assets
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate ROA due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("ROA", "insufficient data: %s", e)
             return None
         
     def roe(self) -> float | None:
@@ -107,5 +108,18 @@ class Profitability:
                 return 0.0
             return ni / avg_eq
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate ROE due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("ROE", "insufficient data: %s", e)
             return None
+
+    def series(self) -> pd.DataFrame:
+        """Every profitability ratio for every available period (rows latest first)."""
+        ni = self.fs.get_metric("Net Income")
+        revenue = self.fs.get_metric("Total Revenue")
+        return self.fs.to_frame({
+            "roe": self.fs.divide(ni, self.fs.average(self.fs.get_metric("Stockholders Equity"))),
+            "roa": self.fs.divide(ni, self.fs.average(self.fs.get_metric("Total Assets"))),
+            "gross_margin": self.fs.divide(self.fs.get_metric("Gross Profit"), revenue),
+            "operating_margin": self.fs.divide(self.fs.get_metric("Operating Income"), revenue),
+            "net_margin": self.fs.divide(ni, revenue),
+            "ebitda_margin": self.fs.divide(self.fs.get_metric("EBITDA"), revenue),
+        })
@@ -0,0 +1,4 @@
+from .report import REPORT_FIELDS, compute_report
+from .batch import run_batch, screen_ticker, stream_batch, read_tickers_file
+from .executor import BatchExecutor, ProcessExecutor, ScreenJob, ThreadExecutor
+from .sinks import FIELDS, CSVSink, JSONLinesSink, ParquetSink, ResultSink, normalize_row, open_sink
@@ -0,0 +1,97 @@
+from typing import Dict, Iterable, List, Tuple
+import pandas as pd
+import logging
+import time
+
+from core import DiagnosticsCollector, StatementProvider, YFinanceProvider, last_closes
+from .executor import BatchExecutor, ScreenJob, ThreadExecutor, record_diagnostics
+from .sinks import ResultSink
+
+
+def read_tickers_file(path: str) -> List[str]:
+    """Reads ticker symbols from a file: one or more per line (comma/space separated), '#' starts a comment."""
+    symbols = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            symbols.extend(s.strip().upper() for s in line.replace(",", " ").split() if s.strip())
+    return symbols
+
+
+def screen_ticker(symbol: str, risk_free_rate: float, equity_risk_premium: float,
+                  wacc: float | None = None, provider: StatementProvider | None = None,
+                  close: float | None = None, diagnostics: DiagnosticsCollector | None = None) -> dict:
+    """
+    Fetches and reports a single ticker. Any failure is captured in the row's `error` field.
+
+    A `close` loaded in bulk beforehand skips the per-ticker price request. The
+    ticker's diagnostics go to `diagnostics` if given, otherwise they are logged
+    as one line.
+    """
+    row, ticker_diagnostics = ScreenJob(risk_free_rate, equity_risk_premium, wacc).screen(
+        symbol, provider or YFinanceProvider(), close)
+    record_diagnostics(ticker_diagnostics, diagnostics)
+    return row
+
+
+def _prepare(symbols: Iterable[str], provider: StatementProvider) -> Tuple[List[str], Dict[str, float | None]]:
+    """De-duplicated symbols (input order) and their closes, bulk-loaded if the provider supports `last_closes`."""
+    symbols = list(dict.fromkeys(symbols))
+    closes = {}
+    try:
+        if hasattr(provider, "last_closes"):
+            closes = last_closes(provider, symbols)
+    except Exception as e:
+        logging.warning("Bulk price download failed, falling back to per-ticker requests: %r", e)
+    return symbols, closes
+
+
+def run_batch(symbols: Iterable[str], risk_free_rate: float, equity_risk_premium: float,
+              wacc: float | None = None, workers: int = 8,
+              provider: StatementProvider | None = None,
+              diagnostics: DiagnosticsCollector | None = None,
+              executor: BatchExecutor | None = None) -> pd.DataFrame:
+    """
+    Screens many tickers concurrently and returns one table (one row per ticker, input order).
+
+    Fetching is network bound, so by default a ThreadExecutor of `workers` threads
+    overlaps the statement and info requests of different tickers. Once the data is
+    cached the pandas analysis dominates; pass a ProcessExecutor to spread it over
+    worker processes. If the provider supports `last_closes`, prices for all
+    symbols are loaded up front in one bulk request. `provider` defaults to
+    yfinance and can be swapped for an offline one (e.g. FileStatementProvider).
+    Pass a DiagnosticsCollector to gather every ticker's missing/derived metrics
+    for one aggregate report instead of a line per ticker.
+    """
+    provider = provider or YFinanceProvider()
+    executor = executor or ThreadExecutor(workers)
+    start = time.perf_counter()
+    symbols, closes = _prepare(symbols, provider)
+    rows = executor.map(ScreenJob(risk_free_rate, equity_risk_premium, wacc), symbols, provider, closes, diagnostics)
+    elapsed = time.perf_counter() - start
+    logging.info("Screened %d tickers in %.2fs with %s.", len(symbols), elapsed, type(executor).__name__)
+    return pd.DataFrame(rows).set_index("ticker") if rows else pd.DataFrame()
+
+
+def stream_batch(symbols: Iterable[str], sink: ResultSink, risk_free_rate: float, equity_risk_premium: float,
+                 wacc: float | None = None, workers: int = 8,
+                 provider: StatementProvider | None = None,
+                 diagnostics: DiagnosticsCollector | None = None,
+                 executor: BatchExecutor | None = None) -> int:
+    """
+    Like run_batch, but writes each row to `sink` (see screening.sinks) as soon as
+    it and every earlier ticker are done instead of building a table, so memory
+    does not grow with the number of tickers. Returns the number of rows written;
+    closing the sink is left to the caller.
+    """
+    provider = provider or YFinanceProvider()
+    executor = executor or ThreadExecutor(workers)
+    start = time.perf_counter()
+    symbols, closes = _prepare(symbols, provider)
+    written = 0
+    for row in executor.iter(ScreenJob(risk_free_rate, equity_risk_premium, wacc), symbols, provider, closes, diagnostics):
+        sink.write(row)
+        written += 1
+    elapsed = time.perf_counter() - start
+    logging.info("Screened %d tickers in %.2fs with %s.", written, elapsed, type(executor).__name__)
+    return written
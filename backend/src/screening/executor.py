@@ -0,0 +1,222 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Protocol, Tuple
+import logging
+import multiprocessing
+import os
+
+from core import Diagnostics, DiagnosticsCollector, FinancialContext, MarketSnapshot, StatementBundle, StatementProvider
+from .report import compute_report
+
+"""
+Batch executors
+
+run_batch splits a screening job into fetching (network or disk bound) and
+analysis (pandas bound). A BatchExecutor decides where each stage runs:
+
+- ThreadExecutor: both stages on one thread pool. Right while the network
+  dominates, and the default.
+- ProcessExecutor: fetching on a thread pool in the parent, analysis on a
+  process pool. Each ticker's inputs travel to a worker as a StatementBundle
+  (Arrow IPC statements), so once the data is cached the analysis can use every
+  core instead of being serialized by the GIL. It has fixed and per-ticker
+  costs the threads do not: starting the workers (about a second: each imports
+  pandas) and encoding/decoding every bundle (a few ms per ticker). On one core
+  it is slower throughout (64 cached tickers: 1.7s vs 0.6s in the benchmark
+  baseline), and by that arithmetic it breaks even only at a few hundred tickers
+  on 2-4 cores. Measure with `benchmarks/run.py -k run_batch` on the target
+  machine.
+
+Either way rows come back in input order, whatever order tickers finish in, and
+`iter` yields each one as soon as it and every earlier row are done, so a sink can
+write a long batch incrementally.
+"""
+
+
+@dataclass(frozen=True)
+class ScreenJob:
+    """The per-ticker work of a batch: the report for each symbol at one set of assumptions."""
+    risk_free_rate: float
+    equity_risk_premium: float
+    wacc: float | None = None
+
+    def report(self, context: FinancialContext) -> dict:
+        row = compute_report(context, self.risk_free_rate, self.equity_risk_premium, self.wacc)
+        row["error"] = None
+        return row
+
+    def screen(self, symbol: str, provider: StatementProvider, close: float | None = None) -> Tuple[dict, Diagnostics | None]:
+        """Fetches and reports one ticker in this thread; failures become an error row."""
+        try:
+            context = FinancialContext(symbol, provider)
+            if close is not None:  # reuse the context's info so it is fetched once
+                context.snapshot = MarketSnapshot.from_info(symbol, context.info, close)
+            context.load()
+            return self.report(context), context.diagnostics
+        except Exception as e:  # isolate per-ticker failures from the rest of the batch
+            return error_row(symbol, e), None
+
+    def screen_bundle(self, bundle: StatementBundle) -> Tuple[dict, Diagnostics | None]:
+        """Reports one ticker from already fetched inputs, without any I/O."""
+        try:
+            context = FinancialContext(bundle.symbol, bundle, snapshot=bundle.snapshot)
+            if bundle.diagnostics is not None:
+                context.diagnostics.merge(bundle.diagnostics)
+            return self.report(context), context.diagnostics
+        except Exception as e:
+            return error_row(bundle.symbol, e), None
+
+
+def error_row(symbol: str, error: Exception) -> dict:
+    logging.warning("For ticker %s, screening failed: %r", symbol, error)
+    return {"ticker": symbol, "error": repr(error)}
+
+
+def record_diagnostics(diagnostics: Diagnostics | None, collector: DiagnosticsCollector | None) -> None:
+    """Adds a ticker's diagnostics to the batch collector, or logs them as one line without one."""
+    if diagnostics is None:
+        return
+    if collector is not None:
+        collector.add(diagnostics)
+    else:
+        diagnostics.emit()
+
+
+class BatchExecutor(Protocol):
+    def iter(self, job: ScreenJob, symbols: List[str], provider: StatementProvider,
+             closes: Dict[str, float | None], diagnostics: DiagnosticsCollector | None = None) -> Iterator[dict]:
+        """One report row per symbol, yielded in the order of `symbols` as soon as it and all earlier rows are done."""
+        ...
+
+
+class ThreadExecutor:
+    """
+    Fetches and analyses each ticker on a bounded thread pool of `workers`.
+
+    Tickers are submitted through a window of 2 * `workers`, which keeps every thread
+    busy while the oldest row is awaited; a new ticker is submitted only as a row is
+    consumed. Tickers still queued when iteration stops early (or the sink fails)
+    are cancelled rather than fetched.
+    """
+
+    def __init__(self, workers: int = 8):
+        self.workers = max(1, workers)
+
+    def iter(self, job: ScreenJob, symbols: List[str], provider: StatementProvider,
+             closes: Dict[str, float | None], diagnostics: DiagnosticsCollector | None = None) -> Iterator[dict]:
+        window: Deque[Future] = deque()
+        limit = 2 * self.workers
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            try:
+                for symbol in symbols:
+                    window.append(pool.submit(job.screen, symbol, provider, closes.get(symbol)))
+                    if len(window) >= limit:
+                        yield self._row(window.popleft(), diagnostics)
+                while window:
+                    yield self._row(window.popleft(), diagnostics)
+            finally:
+                for future in window:
+                    future.cancel()
+
+    @staticmethod
+    def _row(future: Future, diagnostics: DiagnosticsCollector | None) -> dict:
+        row, diag = future.result()
+        record_diagnostics(diag, diagnostics)
+        return row
+
+    def map(self, *args, **kwargs) -> List[dict]:
+        return list(self.iter(*args, **kwargs))
+
+
+def _screen_chunk(job: ScreenJob, bundles: List[StatementBundle]) -> List[Tuple[dict, Diagnostics | None]]:
+    """Worker entry point; module level so the process pool can pickle it by reference."""
+    return [job.screen_bundle(bundle) for bundle in bundles]
+
+
+def _chunks(items: Iterable, size: int) -> Iterator[list]:
+    items = iter(items)
+    while chunk := list(islice(items, size)):
+        yield chunk
+
+
+class ProcessExecutor:
+    """
+    Fetches on a thread pool of `fetch_workers` in this process and analyses on a
+    pool of `processes` worker processes (default: one per CPU).
+
+    Tickers are sent to workers `chunk_size` at a time as they are fetched, so
+    fetching and analysis overlap. At most `max_pending` chunks per process are in
+    flight and at most `fetch_workers + chunk_size` fetches run ahead of them, so the
+    bundles and results held at once do not grow with the number of tickers.
+    Workers are started with `start_method` ("spawn" by default: forking a process
+    that is running fetch threads is not safe). Workers have their own STATS, so
+    --profile only covers fetching.
+    """
+
+    def __init__(self, processes: int | None = None, fetch_workers: int = 8, chunk_size: int = 8,
+                 start_method: str = "spawn", max_pending: int = 4):
+        self.processes = processes or os.cpu_count() or 1
+        self.fetch_workers = max(1, fetch_workers)
+        self.chunk_size = max(1, chunk_size)
+        self.start_method = start_method
+        self.max_pending = max(1, max_pending)
+
+    @staticmethod
+    def _fetch(symbol: str, provider: StatementProvider, close: float | None) -> StatementBundle | Exception:
+        try:
+            return StatementBundle.fetch(symbol, provider, close)
+        except Exception as e:
+            return e
+
+    def _fetched(self, fetchers: ThreadPoolExecutor, symbols: List[str], provider: StatementProvider,
+                 closes: Dict[str, float | None]) -> Iterator[Tuple[str, StatementBundle | Exception]]:
+        """(symbol, bundle or fetch error) in input order; a new fetch is submitted only as one is consumed."""
+        window: Deque[Tuple[str, Future]] = deque()
+        limit = self.fetch_workers + self.chunk_size
+        for symbol in symbols:
+            window.append((symbol, fetchers.submit(self._fetch, symbol, provider, closes.get(symbol))))
+            if len(window) >= limit:
+                head, future = window.popleft()
+                yield head, future.result()
+        while window:
+            head, future = window.popleft()
+            yield head, future.result()
+
+    @staticmethod
+    def _outcomes(chunk: List[Tuple[str, Exception | None]], future: Future | None):
+        """(row, diagnostics) per ticker of a chunk: fetch failures inline, the rest from the worker."""
+        try:
+            done = iter(future.result() if future is not None else ())
+        except Exception as e:  # e.g. a worker died; fail only this chunk's tickers
+            done = iter([(error_row(symbol, e), None) for symbol, error in chunk if error is None])
+        for symbol, error in chunk:
+            yield (error_row(symbol, error), None) if error is not None else next(done)
+
+    def iter(self, job: ScreenJob, symbols: List[str], provider: StatementProvider,
+             closes: Dict[str, float | None], diagnostics: DiagnosticsCollector | None = None) -> Iterator[dict]:
+        pending: Deque[Tuple[list, Future | None]] = deque()
+        context = multiprocessing.get_context(self.start_method)
+        with ThreadPoolExecutor(max_workers=self.fetch_workers) as fetchers, \
+                ProcessPoolExecutor(max_workers=self.processes, mp_context=context) as pool:
+            for chunk in _chunks(self._fetched(fetchers, symbols, provider, closes), self.chunk_size):
+                bundles = [item for _, item in chunk if not isinstance(item, Exception)]
+                future = pool.submit(_screen_chunk, job, bundles) if bundles else None
+                # Keep only the fetch errors: the bundles now live in the worker's call queue
+                pending.append(([(symbol, item if isinstance(item, Exception) else None) for symbol, item in chunk], future))
+                # Yield finished chunks in order; block on the oldest once too many are in flight,
+                # which in turn stops new fetches from being submitted
+                while pending and (len(pending) > self.processes * self.max_pending
+                                   or pending[0][1] is None or pending[0][1].done()):
+                    yield from self._drain(*pending.popleft(), diagnostics)
+            while pending:
+                yield from self._drain(*pending.popleft(), diagnostics)
+
+    def _drain(self, chunk, future, diagnostics) -> Iterator[dict]:
+        for row, diag in self._outcomes(chunk, future):
+            record_diagnostics(diag, diagnostics)
+            yield row
+
+    def map(self, *args, **kwargs) -> List[dict]:
+        return list(self.iter(*args, **kwargs))
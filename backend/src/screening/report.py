@@ -0,0 +1,63 @@
+from core import FinancialContext
+from ratios import Efficiency, Growth, Leverage, Liquidity, Profitability
+from valuation import Valuation, WACCCalculator
+
+REPORT_FIELDS = (
+    "ticker", "roe", "roa", "gross_margin", "operating_margin", "net_margin", "ebitda_margin",
+    "debt_to_equity", "debt_ratio", "equity_ratio", "interest_coverage",
+    "asset_turnover", "inventory_turnover", "receivables_turnover",
+    "revenue_growth", "net_income_growth", "eps_growth", "current_ratio", "quick_ratio",
+    "pe_ratio", "pb_ratio", "ev_ebitda",
+    "cost_of_equity", "cost_of_debt", "effective_tax_rate", "wacc",
+)  # every key compute_report can return, in column order
+
+
+def compute_report(context: FinancialContext, risk_free_rate: float, equity_risk_premium: float,
+                   wacc: float | None = None) -> dict:
+    """
+    Computes every ratio, valuation multiple and the WACC for one ticker.
+
+    Returns a flat dict (one row of a screening table). If `wacc` is given it is
+    reported as-is instead of being calculated.
+    """
+    profitability = Profitability(context)
+    leverage = Leverage(context)
+    efficiency = Efficiency(context)
+    growth = Growth(context)
+    liquidity = Liquidity(context)
+    valuation = Valuation(context)
+
+    row = {
+        "ticker": context.symbol,
+        "roe": profitability.roe(),
+        "roa": profitability.roa(),
+        "gross_margin": profitability.gross_profit_margin(),
+        "operating_margin": profitability.operating_margin(),
+        "net_margin": profitability.net_margin(),
+        "ebitda_margin": profitability.ebitda_margin(),
+        "debt_to_equity": leverage.debt_to_equity(),
+        "debt_ratio": leverage.debt_ratio(),
+        "equity_ratio": leverage.equity_ratio(),
+        "interest_coverage": leverage.interest_coverage(),
+        "asset_turnover": efficiency.asset_turnover(),
+        "inventory_turnover": efficiency.inventory_turnover(),
+        "receivables_turnover": efficiency.receivables_turnover(),
+        "revenue_growth": growth.revenue_growth(),
+        "net_income_growth": growth.net_income_growth(),
+        "eps_growth": growth.eps_growth(),
+        "current_ratio": liquidity.current_ratio(),
+        "quick_ratio": liquidity.quick_ratio(),
+        "pe_ratio": valuation.pe_ratio(),
+        "pb_ratio": valuation.pb_ratio(),
+        "ev_ebitda": valuation.ev_ebitda(),
+    }
+
+    if wacc is not None:
+        row["wacc"] = wacc
+    else:
+        wacc_calculator = WACCCalculator(context)
+        row["cost_of_equity"] = wacc_calculator.cost_of_equity(risk_free_rate, equity_risk_premium)
+        row["cost_of_debt"] = wacc_calculator.cost_of_debt()
+        row["effective_tax_rate"] = wacc_calculator.effective_tax_rate()
+        row["wacc"] = wacc_calculator.calculate(risk_free_rate, equity_risk_premium)
+    return row
@@ -0,0 +1,167 @@
+from pathlib import Path
+from typing import Dict, List, Protocol, Sequence, TextIO
+import csv
+import json
+import math
+import os
+import shutil
+import sys
+
+from core import lazy_import
+from .report import REPORT_FIELDS
+
+pl = lazy_import("polars")
+
+"""
+Result sinks
+
+A batch screen can stream its rows to a file instead of printing one table at
+the end. Every sink writes the same fixed schema, FIELDS (every compute_report
+column plus `error`), whatever subset a row has: missing keys and non-finite
+values (NaN, inf) become nulls, so files from different runs line up column for
+column and load without type inference.
+
+Rows are buffered `buffer_rows` at a time and flushed to disk, so memory stays
+flat however many tickers a run has and finished rows can be read while it is
+still going:
+
+- JSONLinesSink: one JSON object per line ("-" writes to stdout).
+- CSVSink: a header row, then one line per ticker; nulls are empty cells.
+- ParquetSink: each flush is a part file in `<path>.parts/`; close() streams
+  the parts into the single file at `path` and removes them.
+"""
+
+FIELDS = REPORT_FIELDS + ("error",)
+TEXT_FIELDS = ("ticker", "error")
+
+
+def normalize_row(row: dict, fields: Sequence[str] = FIELDS) -> Dict[str, object]:
+    """`row` restricted to `fields` in schema order, with numbers as float and missing/non-finite values as None."""
+    out = {}
+    for name in fields:
+        value = row.get(name)
+        if value is not None and name not in TEXT_FIELDS:
+            value = float(value)
+            if not math.isfinite(value):
+                value = None
+        out[name] = value
+    return out
+
+
+class ResultSink(Protocol):
+    def write(self, row: dict) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class BufferedSink:
+    """Base class of the sinks: buffers normalized rows and hands them to `_flush_rows` in batches."""
+
+    def __init__(self, path: str, fields: Sequence[str] = FIELDS, buffer_rows: int = 256):
+        self.path = path
+        self.fields = tuple(fields)
+        self.buffer_rows = max(1, buffer_rows)
+        self.rows = 0
+        self._buffer: List[Dict[str, object]] = []
+
+    def write(self, row: dict) -> None:
+        self._buffer.append(normalize_row(row, self.fields))
+        self.rows += 1
+        if len(self._buffer) >= self.buffer_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._flush_rows(self._buffer)
+            self._buffer = []
+
+    def close(self) -> None:
+        self.flush()
+        self._finish()
+
+    def _flush_rows(self, rows: List[Dict[str, object]]) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _TextSink(BufferedSink):
+
+    def __init__(self, path: str, fields: Sequence[str] = FIELDS, buffer_rows: int = 256):
+        super().__init__(path, fields, buffer_rows)
+        self._stdout = path == "-"
+        self._file: TextIO = sys.stdout if self._stdout else open(path, "w", newline="", encoding="utf-8")
+
+    def _finish(self) -> None:
+        if self._stdout:
+            self._file.flush()
+        else:
+            self._file.close()
+
+
+class JSONLinesSink(_TextSink):
+
+    def _flush_rows(self, rows: List[Dict[str, object]]) -> None:
+        self._file.write("".join(json.dumps(row, allow_nan=False) + "\n" for row in rows))
+        self._file.flush()
+
+
+class CSVSink(_TextSink):
+
+    def __init__(self, path: str, fields: Sequence[str] = FIELDS, buffer_rows: int = 256):
+        super().__init__(path, fields, buffer_rows)
+        self._writer = csv.DictWriter(self._file, fieldnames=self.fields, lineterminator="\n")
+        self._writer.writeheader()
+
+    def _flush_rows(self, rows: List[Dict[str, object]]) -> None:
+        self._writer.writerows(rows)
+        self._file.flush()
+
+
+class ParquetSink(BufferedSink):
+    """Writes with polars; defaults to larger batches since each flush becomes a Parquet row group."""
+
+    def __init__(self, path: str, fields: Sequence[str] = FIELDS, buffer_rows: int = 4096):
+        if path == "-":
+            raise ValueError("Parquet output needs a file path, not stdout.")
+        super().__init__(path, fields, buffer_rows)
+        self.parts_dir = Path(f"{path}.parts")
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
+        self.parts_dir.mkdir(parents=True)
+        self._parts: List[Path] = []
+
+    @property
+    def schema(self) -> dict:
+        return {name: pl.Utf8 if name in TEXT_FIELDS else pl.Float64 for name in self.fields}
+
+    def _flush_rows(self, rows: List[Dict[str, object]]) -> None:
+        part = self.parts_dir / f"part-{len(self._parts):05d}.parquet"
+        pl.DataFrame(rows, schema=self.schema, orient="row").write_parquet(part)
+        self._parts.append(part)
+
+    def _finish(self) -> None:
+        if self._parts:
+            pl.scan_parquet(self._parts).sink_parquet(self.path)
+        else:
+            pl.DataFrame(schema=self.schema).write_parquet(self.path)
+        shutil.rmtree(self.parts_dir, ignore_errors=True)
+
+
+SINKS = {"jsonl": JSONLinesSink, "csv": CSVSink, "parquet": ParquetSink}
+SUFFIXES = {".jsonl": "jsonl", ".ndjson": "jsonl", ".json": "jsonl", ".csv": "csv", ".parquet": "parquet", ".pq": "parquet"}
+
+
+def open_sink(path: str, format: str | None = None, **kwargs) -> BufferedSink:
+    """A sink writing to `path` ("-" for stdout) in `format`, inferred from the file suffix if not given (default: jsonl)."""
+    if format is None:
+        format = SUFFIXES.get(os.path.splitext(path)[1].lower(), "jsonl")
+    if format not in SINKS:
+        raise ValueError(f"Unknown output format {format!r}. Expected one of: {', '.join(SINKS)}.")
+    return SINKS[format](path, **kwargs)
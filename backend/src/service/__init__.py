@@ -0,0 +1,3 @@
+from .metrics import LatencyMetrics, RouteStats
+from .app import ValuationService, to_json
+from .server import ServiceHandler, make_server
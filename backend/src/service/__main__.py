@@ -0,0 +1,57 @@
+import argparse
+import logging
+
+"""
+Runs the valuation service:
+
+    python -m service --port 8000                       # yfinance behind the SQLite cache
+    python -m service --data-dir snapshots/             # FileStatementProvider snapshot
+    python -m service --synthetic --port 0              # SyntheticProvider, no network (tests, load tests)
+"""
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    parser = argparse.ArgumentParser(description="HTTP/JSON valuation service with warm in-memory caches.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", default=8000, type=int, help="Port to listen on (0 picks a free one).")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--data-dir", help="Serve statements from a FileStatementProvider snapshot.")
+    source.add_argument("--api-url", help="Serve statements from a JSON HTTP API (see core.remote).")
+    source.add_argument("--synthetic", action="store_true", help="Serve generated statements (core.SyntheticProvider).")
+    parser.add_argument("--cache-dir", help="Directory of the on-disk statement cache (default: ~/.cache/evw).")
+    parser.add_argument("--no-cache", action="store_true", help="Bypass the on-disk statement cache.")
+    parser.add_argument("--max-contexts", default=1024, type=int, help="Tickers kept warm in memory.")
+    parser.add_argument("--workers", default=8, type=int, help="Threads per batch request.")
+    parser.add_argument("--profile", action="store_true", help="Include fetch/metric/ratio timings in /metrics.")
+    args = parser.parse_args()
+
+    from core import STATS, CachingProvider, FileStatementProvider, HTTPProvider, SyntheticProvider, YFinanceProvider
+    from .app import ValuationService
+    from .server import make_server
+
+    if args.profile:
+        STATS.enable()
+    if args.data_dir:
+        provider = FileStatementProvider(args.data_dir)
+    elif args.synthetic:
+        provider = SyntheticProvider()
+    else:
+        source = HTTPProvider(args.api_url) if args.api_url else YFinanceProvider()
+        cache_kwargs = {"cache_dir": args.cache_dir} if args.cache_dir else {}
+        provider = source if args.no_cache else CachingProvider(source, **cache_kwargs)
+
+    service = ValuationService(provider, max_contexts=args.max_contexts, workers=args.workers)
+    server = make_server(service, args.host, args.port)
+    logging.info("Serving on http://%s:%d", *server.server_address[:2])
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,230 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field, is_dataclass
+from datetime import timedelta
+from typing import Dict, Iterable, List
+import inspect
+import logging
+import math
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from core import STATS, FinancialContext, SharedProvider, StatementProvider, frame_to_json
+from ratios import Efficiency, Growth, Leverage, Liquidity, Profitability
+from screening import compute_report
+from valuation import DCFAssumptions, Valuation, WACCCalculator
+from .metrics import LatencyMetrics
+
+"""
+Valuation service
+
+ValuationService answers the questions main.py prints (ratios, WACC, DCF, the
+screening report) as JSON-ready dicts, for one ticker or a batch, and keeps
+everything warm between requests:
+
+- statements, info and prices in a SharedProvider (single-flight fetches plus an
+  in-memory LRU) over the configured provider;
+- one FinancialContext per ticker (and so its FSAccessor's resolved metrics) in
+  an LRU of `max_contexts`, rebuilt after `context_ttl`.
+
+A context is not thread-safe, so requests for the same ticker take turns on it
+while different tickers are served concurrently. server.py exposes it over HTTP;
+any StatementProvider works underneath, e.g. SyntheticProvider for tests.
+"""
+
+RATIO_CLASSES = (Profitability, Leverage, Liquidity, Efficiency, Growth)
+MULTIPLES = ("price_per_share", "book_value_per_share", "enterprise_value", "pe_ratio", "pb_ratio", "ev_ebitda", "fcff_latest")
+
+
+def _scalar_methods(cls) -> List[str]:
+    """Public no-argument methods of a ratio class except `series`, e.g. Profitability.roe."""
+    return [
+        name for name, fn in inspect.getmembers(cls, inspect.isfunction)
+        if not name.startswith("_") and name != "series" and len(inspect.signature(fn).parameters) == 1
+    ]
+
+
+RATIOS = {cls.__name__.lower(): _scalar_methods(cls) for cls in RATIO_CLASSES}
+
+
+def to_json(value):
+    """`value` with NumPy/pandas types, dataclasses and non-finite floats made JSON-safe (NaN/inf -> null)."""
+    if isinstance(value, dict):
+        return {str(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_json(value.tolist())
+    if isinstance(value, pd.Series):
+        return {_label(k): to_json(v) for k, v in value.items()}
+    if isinstance(value, pd.DataFrame):  # {row label: {column: value}}, e.g. {"2024-12-31": {"roe": ...}}
+        return {_label(k): to_json(row) for k, row in zip(value.index, value.to_dict("records"))}
+    if is_dataclass(value):
+        return to_json(asdict(value))
+    if isinstance(value, (np.floating, np.integer)):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _label(key) -> str:
+    return str(key.date()) if isinstance(key, pd.Timestamp) else str(key)
+
+
+@dataclass
+class _Warm:
+    context: FinancialContext
+    created: float = field(default_factory=time.monotonic)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class ValuationService:
+
+    def __init__(self, provider: StatementProvider, max_contexts: int = 1024,
+                 context_ttl: timedelta = timedelta(minutes=15), workers: int = 8, **shared_options):
+        self.provider = SharedProvider(provider, **shared_options)
+        self.max_contexts = max_contexts
+        self.context_ttl = context_ttl
+        self.metrics = LatencyMetrics()
+        self._contexts: OrderedDict[str, _Warm] = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="batch")
+
+    # --- Warm contexts ---
+
+    def _warm(self, symbol: str) -> _Warm:
+        symbol = symbol.upper()
+        with self._lock:
+            warm = self._contexts.get(symbol)
+            if warm is not None and time.monotonic() - warm.created < self.context_ttl.total_seconds():
+                self._contexts.move_to_end(symbol)
+                if STATS.enabled:
+                    STATS.cache("service.context", hit=True)
+                return warm
+            if STATS.enabled:
+                STATS.cache("service.context", hit=False)
+            warm = self._contexts[symbol] = _Warm(FinancialContext(symbol, self.provider))
+            self._contexts.move_to_end(symbol)
+            while len(self._contexts) > self.max_contexts:
+                self._contexts.popitem(last=False)
+        return warm
+
+    def _with_context(self, symbol: str, fn):
+        """Runs fn(context) holding the ticker's lock; the first request also loads the context."""
+        warm = self._warm(symbol)
+        with warm.lock:
+            return fn(warm.context.load())
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        """Forgets the warm context and cached data of `symbol`, or of every ticker."""
+        with self._lock:
+            if symbol is None:
+                self._contexts.clear()
+            else:
+                self._contexts.pop(symbol.upper(), None)
+        self.provider.invalidate(None if symbol is None else symbol.upper())
+
+    # --- Queries ---
+
+    def ratios(self, symbol: str, history: bool = False) -> dict:
+        """Latest value of every ratio and valuation multiple; with `history`, every ratio for every period too."""
+        def compute(context):
+            ratios = {
+                name: {method: getattr(cls(context), method)() for method in RATIOS[name]}
+                for name, cls in zip(RATIOS, RATIO_CLASSES)
+            }
+            valuation = Valuation(context)
+            ratios["valuation"] = {name: getattr(valuation, name)() for name in MULTIPLES}
+            out = {"ticker": context.symbol, "ratios": ratios}
+            if history:
+                out["history"] = {name: cls(context).series() for name, cls in zip(RATIOS, RATIO_CLASSES)}
+            return out
+        return to_json(self._with_context(symbol, compute))
+
+    def wacc(self, symbol: str, risk_free_rate: float = 0.04, equity_risk_premium: float = 0.05) -> dict:
+        def compute(context):
+            calculator = WACCCalculator(context)
+            return {
+                "ticker": context.symbol,
+                "risk_free_rate": risk_free_rate,
+                "equity_risk_premium": equity_risk_premium,
+                "beta": context.market.beta,
+                "cost_of_equity": calculator.cost_of_equity(risk_free_rate, equity_risk_premium),
+                "cost_of_debt": calculator.cost_of_debt(),
+                "effective_tax_rate": calculator.effective_tax_rate(),
+                "market_values": calculator.market_values(),
+                "wacc": calculator.calculate(risk_free_rate, equity_risk_premium),
+            }
+        return to_json(self._with_context(symbol, compute))
+
+    def dcf(self, symbol: str, wacc: float | None = None, assumptions: DCFAssumptions | None = None,
+            risk_free_rate: float = 0.04, equity_risk_premium: float = 0.05) -> dict:
+        assumptions = assumptions or DCFAssumptions()
+
+        def compute(context):
+            valuation = Valuation(context)
+            rate = wacc if wacc is not None else WACCCalculator(context).calculate(risk_free_rate, equity_risk_premium)
+            result = valuation.dcf(wacc=rate, assumptions=assumptions) if rate is not None else None
+            return {
+                "ticker": context.symbol,
+                "wacc": rate,
+                "assumptions": assumptions,
+                "inputs": valuation.dcf_inputs(),
+                "fcff_history": valuation.fcff_series_from_statements(),
+                "result": result,
+            }
+        return to_json(self._with_context(symbol, compute))
+
+    def report(self, symbol: str, risk_free_rate: float = 0.04, equity_risk_premium: float = 0.05,
+               wacc: float | None = None) -> dict:
+        """The screening row of `symbol` (see screening.compute_report)."""
+        return to_json(self._with_context(
+            symbol, lambda context: compute_report(context, risk_free_rate, equity_risk_premium, wacc)))
+
+    def diagnostics(self, symbol: str) -> dict:
+        return self._with_context(symbol, lambda context: {
+            "ticker": context.symbol,
+            "summary": context.diagnostics.summary(),
+            "events": [{"kind": e.kind, "subject": e.subject, "message": e.message} for e in context.diagnostics.events],
+        })
+
+    def batch(self, symbols: Iterable[str], risk_free_rate: float = 0.04, equity_risk_premium: float = 0.05,
+              wacc: float | None = None) -> dict:
+        """Report rows for many tickers (input order, duplicates removed); a failing ticker gets an `error` row."""
+        symbols = list(dict.fromkeys(s.strip().upper() for s in symbols if s.strip()))
+
+        def one(symbol):
+            try:
+                return {**self.report(symbol, risk_free_rate, equity_risk_premium, wacc), "error": None}
+            except Exception as e:  # isolate per-ticker failures from the rest of the batch
+                logging.warning("For ticker %s, service batch failed: %r", symbol, e)
+                return {"ticker": symbol, "error": repr(e)}
+        return {"rows": list(self._pool.map(one, symbols))}
+
+    def data(self, symbol: str, resource: str, period: str = "1d"):
+        """Raw provider data in the core.remote JSON layout, so an HTTPProvider can read from this service."""
+        symbol = symbol.upper()
+        if resource in ("income", "balance"):
+            return frame_to_json(getattr(self.provider, resource)(symbol))
+        if resource == "history":
+            return frame_to_json(self.provider.history(symbol, period=period)[["Close"]])
+        if resource == "info":
+            return to_json(self.provider.info(symbol))
+        raise KeyError(resource)
+
+    def status(self) -> dict:
+        with self._lock:
+            contexts = len(self._contexts)
+        return to_json({
+            **self.metrics.snapshot(),
+            "contexts": contexts,
+            "provider_cache": {"entries": len(self.provider.cache), "bytes": self.provider.cache.nbytes},
+            "stats": STATS.snapshot() if STATS.enabled else None,
+        })
+
+    def close(self) -> None:
+        self._pool.shutdown(wait=False)
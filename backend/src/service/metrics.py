@@ -0,0 +1,59 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict
+import threading
+import time
+
+"""
+Request latency metrics for the service: per route, the request and error counts
+and latency percentiles over the most recent requests.
+"""
+
+
+@dataclass
+class RouteStats:
+    count: int = 0
+    errors: int = 0  # responses with status >= 500
+    total: float = 0.0
+    max: float = 0.0
+    recent: Deque[float] = field(default_factory=lambda: deque(maxlen=2048))
+
+    def observe(self, seconds: float, status: int) -> None:
+        self.count += 1
+        self.errors += status >= 500
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.recent.append(seconds)
+
+    def snapshot(self) -> dict:
+        recent = sorted(self.recent)
+        pick = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))] * 1e3 if recent else None
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "mean_ms": self.total / self.count * 1e3 if self.count else None,
+            "p50_ms": pick(0.50),
+            "p90_ms": pick(0.90),
+            "p99_ms": pick(0.99),
+            "max_ms": self.max * 1e3,
+        }
+
+
+class LatencyMetrics:
+    """Thread-safe RouteStats per route template (e.g. "GET /tickers/{symbol}/ratios")."""
+
+    def __init__(self):
+        self.started = time.time()
+        self._routes: Dict[str, RouteStats] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, seconds: float, status: int) -> None:
+        with self._lock:
+            self._routes.setdefault(route, RouteStats()).observe(seconds, status)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "uptime_s": time.time() - self.started,
+                "routes": {route: stats.snapshot() for route, stats in sorted(self._routes.items())},
+            }
@@ -0,0 +1,171 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+import json
+import logging
+import math
+import re
+import time
+
+from valuation import DCFAssumptions
+from .app import ValuationService
+
+"""
+HTTP/JSON front end of ValuationService (stdlib ThreadingHTTPServer, one thread
+per connection, keep-alive).
+
+    GET  /health
+    GET  /metrics                               latency per route, cache sizes, STATS
+    GET  /tickers/<SYMBOL>/ratios?history=1     latest ratios (every period too with history=1)
+    GET  /tickers/<SYMBOL>/wacc?risk_free_rate=&equity_risk_premium=
+    GET  /tickers/<SYMBOL>/dcf?wacc=&horizon=&terminal_growth=&exit_multiple=&risk_free_rate=&equity_risk_premium=
+    GET  /tickers/<SYMBOL>/report?risk_free_rate=&equity_risk_premium=&wacc=
+    GET  /tickers/<SYMBOL>/diagnostics
+    GET  /batch?tickers=A,B,C&risk_free_rate=&equity_risk_premium=&wacc=
+    POST /batch                                 {"tickers": [...], "risk_free_rate": ..., ...}
+    POST /invalidate?ticker=<SYMBOL>            drop warm data (all tickers without ?ticker)
+    GET  /data/<SYMBOL>/{income,balance,info,history}?period=1d
+                                                core.remote layout: the service can feed an HTTPProvider
+
+Errors are JSON {"error": ...} with 400 for bad parameters, 404 for unknown
+routes and 500 otherwise.
+"""
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _float(params: dict, name: str, default: float | None = None) -> float | None:
+    value = params.get(name)
+    if value in (None, ""):
+        return default
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        number = math.nan
+    if not math.isfinite(number):
+        raise BadRequest(f"Parameter {name} must be a finite number. Got: {value!r}")
+    return number
+
+
+def _rates(params: dict) -> dict:
+    return {
+        "risk_free_rate": _float(params, "risk_free_rate", 0.04),
+        "equity_risk_premium": _float(params, "equity_risk_premium", 0.05),
+    }
+
+
+def _assumptions(params: dict) -> DCFAssumptions:
+    exit_multiple = _float(params, "exit_multiple")
+    try:
+        return DCFAssumptions(
+            horizon=int(_float(params, "horizon", 5)),
+            terminal_growth=_float(params, "terminal_growth", 0.025),
+            terminal_method="exit_multiple" if exit_multiple is not None else "gordon",
+            exit_multiple=exit_multiple,
+        )
+    except ValueError as e:
+        raise BadRequest(str(e)) from None
+
+
+def _tickers(params: dict) -> List[str]:
+    tickers = params.get("tickers")
+    if isinstance(tickers, str):
+        tickers = tickers.split(",")
+    if not isinstance(tickers, list):
+        tickers = []
+    tickers = [str(t).strip() for t in tickers if str(t).strip()]
+    if not tickers:
+        raise BadRequest("Parameter tickers is required (comma-separated, or a JSON list).")
+    return tickers
+
+
+Route = Tuple[str, "re.Pattern", str, Callable[[ValuationService, dict, dict], object]]
+
+ROUTES: List[Route] = [
+    (method, re.compile(f"^{pattern}$"), f"{method} {template}", handler)
+    for method, pattern, template, handler in [
+        ("GET", "/health", "/health", lambda s, m, p: {"status": "ok"}),
+        ("GET", "/metrics", "/metrics", lambda s, m, p: s.status()),
+        ("GET", r"/tickers/(?P<symbol>[^/]+)/ratios", "/tickers/{symbol}/ratios",
+         lambda s, m, p: s.ratios(m["symbol"], history=p.get("history") in ("1", "true", True))),
+        ("GET", r"/tickers/(?P<symbol>[^/]+)/wacc", "/tickers/{symbol}/wacc",
+         lambda s, m, p: s.wacc(m["symbol"], **_rates(p))),
+        ("GET", r"/tickers/(?P<symbol>[^/]+)/dcf", "/tickers/{symbol}/dcf",
+         lambda s, m, p: s.dcf(m["symbol"], wacc=_float(p, "wacc"), assumptions=_assumptions(p), **_rates(p))),
+        ("GET", r"/tickers/(?P<symbol>[^/]+)/report", "/tickers/{symbol}/report",
+         lambda s, m, p: s.report(m["symbol"], wacc=_float(p, "wacc"), **_rates(p))),
+        ("GET", r"/tickers/(?P<symbol>[^/]+)/diagnostics", "/tickers/{symbol}/diagnostics",
+         lambda s, m, p: s.diagnostics(m["symbol"])),
+        ("GET", "/batch", "/batch",
+         lambda s, m, p: s.batch(_tickers(p), wacc=_float(p, "wacc"), **_rates(p))),
+        ("POST", "/batch", "/batch",
+         lambda s, m, p: s.batch(_tickers(p), wacc=_float(p, "wacc"), **_rates(p))),
+        ("POST", "/invalidate", "/invalidate",
+         lambda s, m, p: s.invalidate(p.get("ticker")) or {"invalidated": p.get("ticker") or "all"}),
+        ("GET", r"/data/(?P<symbol>[^/]+)/(?P<resource>income|balance|info|history)", "/data/{symbol}/{resource}",
+         lambda s, m, p: s.data(m["symbol"], m["resource"], p.get("period") or "1d")),
+    ]
+]
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    service: ValuationService  # set on the subclass make_server creates
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str) -> None:
+        start = time.perf_counter()
+        url = urlsplit(self.path)
+        route, status = f"{method} (unmatched)", 404
+        body: object = {"error": f"No route for {method} {url.path}"}
+        try:
+            params: Dict[str, object] = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            if method == "POST":
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    payload = json.loads(self.rfile.read(length))
+                    if not isinstance(payload, dict):
+                        raise BadRequest("Request body must be a JSON object.")
+                    params.update(payload)
+            for route_method, pattern, template, handler in ROUTES:
+                match = pattern.match(url.path) if route_method == method else None
+                if match:
+                    route = template
+                    body, status = handler(self.service, match.groupdict(), params), 200
+                    break
+            data = json.dumps(body, allow_nan=False).encode()
+        except (BadRequest, json.JSONDecodeError) as e:
+            status, data = 400, json.dumps({"error": str(e)}).encode()
+        except Exception as e:
+            logging.exception("Request %s %s failed", method, self.path)
+            status, data = 500, json.dumps({"error": repr(e)}).encode()
+        # Observed before sending, so /metrics already counts every response a client has seen
+        elapsed = time.perf_counter() - start
+        self.service.metrics.observe(route, elapsed, status)
+        self._send(status, data)
+        logging.debug("%s %s -> %d in %.1fms", method, self.path, status, elapsed * 1e3)
+
+    def _send(self, status: int, data: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass  # requests are logged in _dispatch and counted in the latency metrics
+
+
+def make_server(service: ValuationService, host: str = "127.0.0.1", port: int = 8000) -> ThreadingHTTPServer:
+    """A ThreadingHTTPServer for `service`; port 0 picks a free port (see server.server_port)."""
+    handler = type("BoundServiceHandler", (ServiceHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
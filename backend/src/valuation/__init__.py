@@ -1,2 +1,5 @@
 from .valuation import Valuation
-from .wacc import WACCCalculator
\ No newline at end of file
+from .wacc import WACCCalculator, WACCInputs
+from .dcf import DCFAssumptions, DCFInputs, DCFResult
+from .simulation import Normal, SimulationSpec, SimulationResult, simulate
+from .sensitivity import SensitivityGrid, sensitivity_grid, wacc_growth_table
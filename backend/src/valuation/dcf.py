@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+
+"""
+Discounted Cash Flow (FCFF) model
+
+Revenue_t  = Revenue_0 * (1 + g)^t                        t = 1..horizon
+FCFF_t     = Revenue_t * FCFF margin
+PV(FCFF)   = sum FCFF_t / (1 + WACC)^t
+Terminal   = FCFF_N * (1 + g_T) / (WACC - g_T)             (Gordon growth)
+           or EBITDA_N * exit multiple                     (exit multiple)
+EV         = PV(FCFF) + Terminal / (1 + WACC)^N
+Equity     = EV - Total Debt + Cash;  per share = Equity / Shares Outstanding
+
+Every function takes scalars or NumPy arrays and broadcasts, so one call can
+value a single scenario, a sensitivity grid or a batch of Monte Carlo draws.
+"""
+
+
+@dataclass(frozen=True)
+class DCFInputs:
+    """Fundamentals the DCF needs, resolved once from the statements and market data."""
+    base_revenue: float
+    fcff_margin: float          # historical average FCFF / Revenue
+    ebitda_margin: float | None  # latest EBITDA / Revenue, for the exit-multiple terminal value
+    revenue_growth: float       # historical revenue CAGR
+    total_debt: float
+    cash: float
+    shares_outstanding: float | None
+
+
+@dataclass(frozen=True)
+class DCFAssumptions:
+    """Projection drivers. Growth and margins left as None fall back to the historical values in DCFInputs."""
+    horizon: int = 5
+    revenue_growth: float | None = None
+    fcff_margin: float | None = None
+    ebitda_margin: float | None = None
+    terminal_growth: float = 0.025
+    terminal_method: str = "gordon"  # "gordon" or "exit_multiple"
+    exit_multiple: float | None = None
+
+    def __post_init__(self):
+        if self.horizon < 1:
+            raise ValueError(f"DCF horizon must be at least 1 year. Got: {self.horizon}")
+        if self.terminal_method not in ("gordon", "exit_multiple"):
+            raise ValueError(f"Unknown terminal method: {self.terminal_method}")
+        if self.terminal_method == "exit_multiple" and self.exit_multiple is None:
+            raise ValueError("terminal_method='exit_multiple' needs an exit_multiple.")
+
+
+@dataclass(frozen=True)
+class DCFResult:
+    enterprise_value: np.ndarray | float
+    equity_value: np.ndarray | float
+    value_per_share: np.ndarray | float | None
+    pv_fcff: np.ndarray | float
+    pv_terminal: np.ndarray | float
+    projected_fcff: np.ndarray
+    wacc: np.ndarray | float
+
+
+def project_revenue(base_revenue, growth, horizon: int) -> np.ndarray:
+    """Revenue for years 1..horizon; the trailing axis is time."""
+    t = np.arange(1, horizon + 1)
+    return np.asarray(base_revenue, dtype=float)[..., None] * (1.0 + np.asarray(growth, dtype=float)[..., None]) ** t
+
+
+def discount_factors(wacc, horizon: int) -> np.ndarray:
+    """1 / (1 + WACC)^t for years 1..horizon; the trailing axis is time."""
+    t = np.arange(1, horizon + 1)
+    return (1.0 + np.asarray(wacc, dtype=float)[..., None]) ** -t
+
+
+def gordon_terminal_value(final_fcff, wacc, terminal_growth) -> np.ndarray:
+    """FCFF_N * (1 + g) / (WACC - g); NaN where WACC <= g (no finite value)."""
+    wacc = np.asarray(wacc, dtype=float)
+    terminal_growth = np.asarray(terminal_growth, dtype=float)
+    spread = wacc - terminal_growth
+    with np.errstate(divide="ignore", invalid="ignore"):
+        tv = final_fcff * (1.0 + terminal_growth) / spread
+    return np.where(spread > 0, tv, np.nan)
+
+
+def enterprise_value(inputs: DCFInputs, assumptions: DCFAssumptions, wacc,
+                     revenue_growth=None, fcff_margin=None, terminal_growth=None) -> DCFResult:
+    """
+    Values the firm for every broadcast combination of `wacc` and the optional driver
+    overrides (each may be a scalar or an array; defaults come from `assumptions`,
+    then from `inputs`).
+    """
+    horizon = assumptions.horizon
+    growth = _pick(revenue_growth, assumptions.revenue_growth, inputs.revenue_growth)
+    margin = _pick(fcff_margin, assumptions.fcff_margin, inputs.fcff_margin)
+    tg = assumptions.terminal_growth if terminal_growth is None else terminal_growth
+    wacc = np.asarray(wacc, dtype=float)
+
+    growth, margin, tg, wacc = np.broadcast_arrays(
+        np.asarray(growth, dtype=float), np.asarray(margin, dtype=float), np.asarray(tg, dtype=float), wacc
+    )
+    revenue = project_revenue(inputs.base_revenue, growth, horizon)
+    fcff = revenue * margin[..., None]
+    factors = discount_factors(wacc, horizon)
+    pv_fcff = (fcff * factors).sum(axis=-1)
+
+    if assumptions.terminal_method == "exit_multiple":
+        ebitda_margin = _pick(None, assumptions.ebitda_margin, inputs.ebitda_margin)
+        if ebitda_margin is None:
+            raise ValueError("Exit-multiple terminal value needs an EBITDA margin.")
+        terminal = revenue[..., -1] * ebitda_margin * assumptions.exit_multiple
+    else:
+        terminal = gordon_terminal_value(fcff[..., -1], wacc, tg)
+    pv_terminal = terminal * factors[..., -1]
+
+    ev = pv_fcff + pv_terminal
+    equity = ev - inputs.total_debt + inputs.cash
+    per_share = equity / inputs.shares_outstanding if inputs.shares_outstanding else None
+    return DCFResult(
+        enterprise_value=_scalar(ev),
+        equity_value=_scalar(equity),
+        value_per_share=_scalar(per_share) if per_share is not None else None,
+        pv_fcff=_scalar(pv_fcff),
+        pv_terminal=_scalar(pv_terminal),
+        projected_fcff=fcff,
+        wacc=_scalar(wacc),
+    )
+
+
+def revenue_cagr(revenue: pd.Series) -> float:
+    """Compound annual growth between the oldest and latest revenue (columns latest first)."""
+    vals = revenue.dropna().astype(float)
+    if len(vals) < 2 or vals.iloc[-1] <= 0 or vals.iloc[0] <= 0:
+        return 0.0
+    return float((vals.iloc[0] / vals.iloc[-1]) ** (1.0 / (len(vals) - 1)) - 1.0)
+
+
+def _pick(override, assumption, fallback):
+    if override is not None:
+        return override
+    return assumption if assumption is not None else fallback
+
+
+def _scalar(x):
+    x = np.asarray(x)
+    return float(x) if x.ndim == 0 else x
@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Dict, Sequence
+import numpy as np
+import pandas as pd
+
+from .dcf import DCFAssumptions, DCFInputs, enterprise_value
+from .wacc import WACCInputs
+
+"""
+Sensitivity grids
+
+The fundamentals are resolved once (WACCInputs, DCFInputs). Each input range gets
+its own array axis, and the WACC and the DCF are evaluated for the whole grid with
+NumPy broadcasting. The tax rate only enters through the WACC debt tax shield; the
+projected FCFF uses the historical margin.
+"""
+
+AXES = ("risk_free_rate", "equity_risk_premium", "beta", "tax_rate", "terminal_growth")
+
+
+@dataclass(frozen=True)
+class SensitivityGrid:
+    axes: Dict[str, np.ndarray]  # ordered as AXES
+    wacc: np.ndarray             # one value per grid point, shape = axis lengths
+    enterprise_value: np.ndarray
+    value_per_share: np.ndarray | None
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(v) for v in self.axes.values())
+
+    def table(self, rows: str, columns: str, of: str = "value_per_share", at: Dict[str, int] | None = None) -> pd.DataFrame:
+        """
+        2-D slice of the grid as a DataFrame. Every other axis is held at the index
+        given in `at` (default: its middle value).
+        """
+        values = getattr(self, of)
+        if values is None:
+            raise ValueError(f"Grid has no '{of}' values.")
+        at = at or {}
+        index = []
+        for name, axis in self.axes.items():
+            if name in (rows, columns):
+                index.append(slice(None))
+            else:
+                index.append(at.get(name, len(axis) // 2))
+        data = values[tuple(index)]
+        if list(self.axes).index(rows) > list(self.axes).index(columns):
+            data = data.T
+        return pd.DataFrame(
+            data,
+            index=pd.Index(self.axes[rows], name=rows),
+            columns=pd.Index(self.axes[columns], name=columns),
+        )
+
+
+def sensitivity_grid(wacc_inputs: WACCInputs, dcf_inputs: DCFInputs, assumptions: DCFAssumptions | None = None,
+                     risk_free_rate: Sequence[float] | float = 0.04,
+                     equity_risk_premium: Sequence[float] | float = 0.05,
+                     beta: Sequence[float] | float | None = None,
+                     tax_rate: Sequence[float] | float | None = None,
+                     terminal_growth: Sequence[float] | float | None = None) -> SensitivityGrid:
+    """Evaluates WACC and DCF value on the full cartesian grid of the given ranges (scalars become length-1 axes)."""
+    assumptions = assumptions or DCFAssumptions()
+    values = {
+        "risk_free_rate": risk_free_rate,
+        "equity_risk_premium": equity_risk_premium,
+        "beta": wacc_inputs.beta if beta is None else beta,
+        "tax_rate": wacc_inputs.tax_rate if tax_rate is None else tax_rate,
+        "terminal_growth": assumptions.terminal_growth if terminal_growth is None else terminal_growth,
+    }
+    axes = {name: np.atleast_1d(np.asarray(values[name], dtype=float)) for name in AXES}
+
+    # Give every range its own dimension so arithmetic broadcasts to the full grid
+    ndim = len(AXES)
+    grid = {
+        name: axis.reshape([-1 if i == d else 1 for i in range(ndim)])
+        for d, (name, axis) in enumerate(axes.items())
+    }
+    wacc = wacc_inputs.wacc(
+        grid["risk_free_rate"], grid["equity_risk_premium"], beta=grid["beta"], tax_rate=grid["tax_rate"]
+    )
+    result = enterprise_value(dcf_inputs, assumptions, wacc, terminal_growth=grid["terminal_growth"])
+    shape = tuple(len(a) for a in axes.values())
+    return SensitivityGrid(
+        axes=axes,
+        wacc=np.broadcast_to(wacc, shape),
+        enterprise_value=np.broadcast_to(result.enterprise_value, shape),
+        value_per_share=np.broadcast_to(result.value_per_share, shape) if result.value_per_share is not None else None,
+    )
+
+
+def wacc_growth_table(dcf_inputs: DCFInputs, waccs: Sequence[float], terminal_growths: Sequence[float],
+                      assumptions: DCFAssumptions | None = None, of: str = "value_per_share") -> pd.DataFrame:
+    """The classic WACC x terminal-growth table, computed in one broadcast DCF evaluation."""
+    waccs = np.asarray(waccs, dtype=float)
+    growths = np.asarray(terminal_growths, dtype=float)
+    result = enterprise_value(dcf_inputs, assumptions or DCFAssumptions(), waccs[:, None], terminal_growth=growths[None, :])
+    data = getattr(result, of)
+    if data is None:
+        raise ValueError(f"DCF result has no '{of}' values.")
+    return pd.DataFrame(
+        np.broadcast_to(data, (len(waccs), len(growths))),
+        index=pd.Index(waccs, name="wacc"),
+        columns=pd.Index(growths, name="terminal_growth"),
+    )
@@ -0,0 +1,126 @@
+from dataclasses import dataclass, field
+from typing import Dict, Tuple
+import numpy as np
+
+from .dcf import DCFAssumptions, DCFInputs, enterprise_value
+from .wacc import WACCInputs
+
+"""
+Monte Carlo valuation
+
+Draws every scenario for the WACC inputs (beta, risk-free rate, ERP, cost of debt)
+and the DCF drivers (revenue growth, FCFF margin, terminal growth) as arrays and
+values all of them with one broadcast WACC + DCF evaluation per chunk. Only the
+per-path outputs are kept, so intermediate memory is bounded by `chunk_size`.
+"""
+
+
+@dataclass(frozen=True)
+class Normal:
+    """Normal distribution truncated to [low, high] by clipping."""
+    mean: float
+    std: float
+    low: float = -np.inf
+    high: float = np.inf
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.std == 0:
+            return np.full(n, self.mean)
+        return np.clip(rng.normal(self.mean, self.std, n), self.low, self.high)
+
+
+@dataclass(frozen=True)
+class SimulationSpec:
+    """
+    Standard deviations of each driver. Means come from the resolved fundamentals
+    (or the CAPM inputs) unless a full distribution is given in `overrides`.
+    """
+    beta_std: float = 0.2
+    risk_free_rate_std: float = 0.005
+    equity_risk_premium_std: float = 0.01
+    cost_of_debt_std: float = 0.01
+    revenue_growth_std: float = 0.03
+    fcff_margin_std: float = 0.02
+    terminal_growth_std: float = 0.005
+    overrides: Dict[str, Normal] = field(default_factory=dict)
+
+    def distributions(self, wacc_inputs: WACCInputs, dcf_inputs: DCFInputs, assumptions: DCFAssumptions,
+                      risk_free_rate: float, equity_risk_premium: float) -> Dict[str, Normal]:
+        growth = dcf_inputs.revenue_growth if assumptions.revenue_growth is None else assumptions.revenue_growth
+        margin = dcf_inputs.fcff_margin if assumptions.fcff_margin is None else assumptions.fcff_margin
+        dists = {
+            "beta": Normal(wacc_inputs.beta, self.beta_std, low=0.0),
+            "risk_free_rate": Normal(risk_free_rate, self.risk_free_rate_std, low=0.0),
+            "equity_risk_premium": Normal(equity_risk_premium, self.equity_risk_premium_std, low=0.0),
+            "cost_of_debt": Normal(wacc_inputs.cost_of_debt, self.cost_of_debt_std, low=0.0),
+            "revenue_growth": Normal(growth, self.revenue_growth_std, low=-0.99),
+            "fcff_margin": Normal(margin, self.fcff_margin_std),
+            "terminal_growth": Normal(assumptions.terminal_growth, self.terminal_growth_std),
+        }
+        dists.update(self.overrides)
+        return dists
+
+
+@dataclass(frozen=True)
+class SimulationResult:
+    value_per_share: np.ndarray  # NaN where WACC <= terminal growth
+    enterprise_value: np.ndarray
+    wacc: np.ndarray
+
+    @property
+    def valid(self) -> np.ndarray:
+        return ~np.isnan(self.enterprise_value)
+
+    def percentiles(self, q: Tuple[float, ...] = (5, 25, 50, 75, 95), of: str = "value_per_share") -> Dict[float, float]:
+        values = getattr(self, of)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return {p: float("nan") for p in q}
+        return dict(zip(q, np.percentile(values, q).tolist()))
+
+    def histogram(self, bins: int = 20, of: str = "value_per_share",
+                  tails: float = 1.0) -> Tuple[np.ndarray, np.ndarray]:
+        """Counts and bin edges between the `tails` and 100 - `tails` percentiles (terminal values near WACC = g explode)."""
+        values = getattr(self, of)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return np.histogram(values, bins=bins)
+        lo, hi = np.percentile(values, [tails, 100 - tails])
+        return np.histogram(values, bins=bins, range=(lo, hi))
+
+
+def simulate(wacc_inputs: WACCInputs, dcf_inputs: DCFInputs, n: int,
+             assumptions: DCFAssumptions | None = None, spec: SimulationSpec | None = None,
+             risk_free_rate: float = 0.04, equity_risk_premium: float = 0.05,
+             chunk_size: int = 250_000, seed: int | None = None) -> SimulationResult:
+    """Values `n` scenarios in vectorized chunks of at most `chunk_size` paths."""
+    if n < 1:
+        raise ValueError(f"Number of simulations must be positive. Got: {n}")
+    if chunk_size < 1:
+        raise ValueError(f"Chunk size must be positive. Got: {chunk_size}")
+    assumptions = assumptions or DCFAssumptions()
+    dists = (spec or SimulationSpec()).distributions(
+        wacc_inputs, dcf_inputs, assumptions, risk_free_rate, equity_risk_premium
+    )
+    rng = np.random.default_rng(seed)
+    shares = dcf_inputs.shares_outstanding
+
+    per_share = np.empty(n)
+    ev = np.empty(n)
+    wacc = np.empty(n)
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        draw = {name: dist.sample(rng, stop - start) for name, dist in dists.items()}
+        w = wacc_inputs.wacc(
+            draw["risk_free_rate"], draw["equity_risk_premium"],
+            beta=draw["beta"], cost_of_debt=draw["cost_of_debt"],
+        )
+        result = enterprise_value(
+            dcf_inputs, assumptions, w,
+            revenue_growth=draw["revenue_growth"], fcff_margin=draw["fcff_margin"],
+            terminal_growth=draw["terminal_growth"],
+        )
+        wacc[start:stop] = w
+        ev[start:stop] = result.enterprise_value
+        per_share[start:stop] = result.value_per_share if shares else np.nan
+    return SimulationResult(value_per_share=per_share, enterprise_value=ev, wacc=wacc)
@@ -1,7 +1,8 @@
 import pandas as pd
 import numpy as np
-from core import yf, FSAccessor
-import logging
+from core import yf, FinancialContext, instrument
+from .dcf import DCFAssumptions, DCFInputs, DCFResult, enterprise_value, revenue_cagr
+from .wacc import WACCCalculator
 
 """
 Valuation Ratios (if you include stock price data)
@@ -15,38 +16,35 @@ EV/EBITDA = Enterprise Value / EBITDA
 These help compare valuation relative to earnings or book value.
 """
 
+@instrument
 class Valuation: 
     
-    def __init__(self, ticker: yf.Ticker):
-        self.fs = FSAccessor(ticker)
-        self.ticker = ticker
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.context = FinancialContext.of(ticker)
+        self.fs = self.context.fs
 
     def price_per_share(self) -> float | None:
-        try:
-            return self.ticker.history(period="1d")["Close"].iloc[-1]
-        except IndexError:
-            logging.warning(f"For ticker {self.ticker.ticker}, could not fetch price per share. No history returned.")
-            return None
+        return self.context.price
 
     def book_value_per_share(self) -> float | None:
         equity_series = self.fs.get_metric("Stockholders Equity")
         if equity_series is None:
             return None
 
-        shares = self.ticker.info.get("sharesOutstanding")
+        shares = self.context.market.shares_outstanding
         if not shares or shares == 0:
-            logging.warning(f"For ticker {self.ticker.ticker}, shares outstanding are zero or unavailable.")
+            self.fs.diagnostics.unavailable("Book Value per Share", "shares outstanding are zero or unavailable")
             return None
 
         try:
             equity = self.fs.latest(equity_series)
             return equity / shares
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Book Value per Share due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Book Value per Share", "insufficient data: %s", e)
             return None
 
     def enterprise_value(self) -> float | None:
-        market_cap = self.ticker.info.get("marketCap")
+        market_cap = self.context.market.market_cap
         debt_series = self.fs.get_metric("Total Debt")
         cash_series = self.fs.get_metric("Cash And Cash Equivalents")
 
@@ -58,7 +56,7 @@ class Valuation:
             cash = self.fs.latest(cash_series)
             return market_cap + debt - cash
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Enterprise Value due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Enterprise Value", "insufficient data: %s", e)
             return None
 
     def pe_ratio(self) -> float | None:
@@ -74,7 +72,7 @@ class Valuation:
                 return None
             return price / eps
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate P/E Ratio due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("P/E Ratio", "insufficient data: %s", e)
             return None
     
     def pb_ratio(self) -> float | None:
@@ -99,7 +97,7 @@ class Valuation:
                 return None
             return ev / ebitda
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate EV/EBITDA Ratio due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("EV/EBITDA Ratio", "insufficient data: %s", e)
             return None
     
     def _get_tax_rate_series(self) -> pd.Series | None:
@@ -207,17 +205,10 @@ class Valuation:
         delta_nwc = nwc_op - nwc_op.shift(-1)
         delta_nwc = delta_nwc.fillna(0.0)
 
-        # Compute FCFF with a while loop (your preference)
-        fcff = pd.Series(index=idx, dtype="float64")
-        cols = list(idx)  # periods in descending order per FSAccessor._sort_columns
-        i = 0
-        while i < len(cols):
-            col = cols[i]
-            nopat = ebit[col] * (1.0 - tax_rate[col])
-            fcff[col] = nopat + da[col] - capex[col] - delta_nwc[col]
-            i += 1
-
-        return fcff
+        # Columnar: one expression over all periods (descending per FSAccessor._sort_columns)
+        nopat = ebit * (1.0 - tax_rate)
+        fcff = nopat + da - capex - delta_nwc
+        return fcff.astype("float64")
 
     def fcff_latest(self) -> float | None:
         """
@@ -232,7 +223,53 @@ class Valuation:
         except Exception:
             return None
     
-    def dcf(self):
-        fcff =self.fcff_series_from_statements()
-        
-        return fcff
\ No newline at end of file
+    def dcf_inputs(self) -> DCFInputs | None:
+        """Resolves the fundamentals the DCF needs once, so scenarios never touch the statements again."""
+        revenue = self.fs.get_metric("Total Revenue")
+        fcff = self.fcff_series_from_statements()
+        debt_series = self.fs.get_metric("Total Debt")
+        if revenue is None or fcff is None or debt_series is None:
+            return None
+
+        try:
+            base_revenue = self.fs.latest(revenue)
+            total_debt = self.fs.latest(debt_series)
+        except ValueError as e:
+            self.fs.diagnostics.unavailable("DCF inputs", "insufficient data: %s", e)
+            return None
+        if base_revenue <= 0:
+            self.fs.diagnostics.unavailable("DCF inputs", "latest revenue is not positive")
+            return None
+
+        cash_series = self.fs.get_metric("Cash And Cash Equivalents")
+        cash = self.fs.latest(cash_series) if cash_series is not None and cash_series.notna().any() else 0.0
+        margins = self.fs.divide(fcff, revenue).replace([np.inf, -np.inf], np.nan).dropna()
+        ebitda_margin = self.fs.divide(self.fs.get_metric("EBITDA"), revenue)
+        ebitda_margin = ebitda_margin.dropna() if ebitda_margin is not None else None
+
+        return DCFInputs(
+            base_revenue=base_revenue,
+            fcff_margin=float(margins.mean()) if not margins.empty else 0.0,
+            ebitda_margin=self.fs.latest(ebitda_margin) if ebitda_margin is not None and not ebitda_margin.empty else None,
+            revenue_growth=revenue_cagr(revenue),
+            total_debt=total_debt,
+            cash=cash,
+            shares_outstanding=self.context.market.shares_outstanding,
+        )
+
+    def dcf(self, wacc: float | None = None, assumptions: DCFAssumptions | None = None,
+            risk_free_rate: float = 0.04, equity_risk_premium: float = 0.05) -> DCFResult | None:
+        """
+        FCFF discounted cash flow valuation.
+
+        Uses `wacc` if given, otherwise WACCCalculator with the CAPM inputs. `wacc`
+        may also be an array to value several discount rates in one call.
+        """
+        inputs = self.dcf_inputs()
+        if inputs is None:
+            return None
+        if wacc is None:
+            wacc = WACCCalculator(self.context).calculate(risk_free_rate, equity_risk_premium)
+            if wacc is None:
+                return None
+        return enterprise_value(inputs, assumptions or DCFAssumptions(), wacc)
@@ -1,16 +1,51 @@
-from core import yf, FSAccessor
-import logging
-
+from dataclasses import dataclass
+from core import yf, FinancialContext, instrument
+from core.diagnostics import FALLBACK
+import numpy as np
+
+
+@dataclass(frozen=True)
+class WACCInputs:
+    """Fundamentals behind the WACC, resolved once so many scenarios can be evaluated as arrays."""
+    beta: float
+    market_equity: float
+    market_debt: float
+    cost_of_debt: float
+    tax_rate: float
+
+    @property
+    def weight_equity(self) -> float:
+        total = self.market_equity + self.market_debt
+        return self.market_equity / total if total else 0.0
+
+    @property
+    def weight_debt(self) -> float:
+        total = self.market_equity + self.market_debt
+        return self.market_debt / total if total else 0.0
+
+    def wacc(self, risk_free_rate, equity_risk_premium, beta=None, cost_of_debt=None, tax_rate=None):
+        """
+        WACC for scalars or broadcastable arrays of CAPM inputs. `beta`, `cost_of_debt`
+        and `tax_rate` override the resolved values when given.
+        """
+        beta = self.beta if beta is None else beta
+        rd = self.cost_of_debt if cost_of_debt is None else cost_of_debt
+        tc = self.tax_rate if tax_rate is None else tax_rate
+        re = np.asarray(risk_free_rate, dtype=float) + np.asarray(beta, dtype=float) * np.asarray(equity_risk_premium, dtype=float)
+        return WACCCalculator.weighted(self.weight_equity, self.weight_debt, re, rd, tc)
+
+
+@instrument
 class WACCCalculator:
-    def __init__(self, ticker: yf.Ticker):
-        self.ticker = ticker
-        self.fs = FSAccessor(ticker)
+    def __init__(self, ticker: "yf.Ticker | FinancialContext"):
+        self.context = FinancialContext.of(ticker)
+        self.fs = self.context.fs
 
     def cost_of_equity(self, risk_free_rate: float, equity_risk_premium: float) -> float | None:
         """Calculates the cost of equity using the Capital Asset Pricing Model (CAPM)."""
-        beta = self.ticker.info.get("beta")
+        beta = self.context.market.beta
         if beta is None:
-            logging.warning(f"For ticker {self.ticker.ticker}, Beta not available. Cannot calculate Cost of Equity.")
+            self.fs.diagnostics.unavailable("Cost of Equity", "Beta not available")
             return None
         return risk_free_rate + beta * equity_risk_premium
 
@@ -31,7 +66,7 @@ class WACCCalculator:
             
             return abs(interest_expense / total_debt)
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Cost of Debt due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Cost of Debt", "insufficient data: %s", e)
             return None
 
     def effective_tax_rate(self) -> float | None:
@@ -40,7 +75,7 @@ class WACCCalculator:
         ebt_series = self.fs.get_metric("Pretax Income")
 
         if tax_series is None or ebt_series is None:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, Tax or Pretax income not found. Falling back to default rate.")
+            self.fs.diagnostics.record(FALLBACK, "Effective Tax Rate", "Tax or Pretax income not found, using %s", 0.21)
             return 0.21 # Fallback to a default rate
 
         try:
@@ -52,24 +87,41 @@ class WACCCalculator:
             
             return tax_expense / ebt
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not calculate Effective Tax Rate due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Effective Tax Rate", "insufficient data: %s", e)
             return None
 
     def market_values(self) -> dict | None:
         """Gets the market value of equity and debt."""
-        market_cap = self.ticker.info.get("marketCap")
+        market_cap = self.context.market.market_cap
         debt_series = self.fs.get_metric("Total Debt")
 
         if market_cap is None or debt_series is None:
-            logging.warning(f"For ticker {self.ticker.ticker}, Market Cap or Total Debt not available.")
+            self.fs.diagnostics.unavailable("Market Values", "Market Cap or Total Debt not available")
             return None
 
         try:
             total_debt = self.fs.latest(debt_series)
             return {"equity": market_cap, "debt": total_debt}
         except ValueError as e:
-            logging.warning(f"For ticker {self.fs.ticker.ticker}, could not get market values due to insufficient data: {e}")
+            self.fs.diagnostics.unavailable("Market Values", "insufficient data: %s", e)
+            return None
+
+    @staticmethod
+    def weighted(weight_equity, weight_debt, cost_of_equity, cost_of_debt, tax_rate):
+        """(E/V) * Re + (D/V) * Rd * (1 - Tc); broadcasts over NumPy arrays."""
+        return (weight_equity * cost_of_equity) + (weight_debt * cost_of_debt * (1 - tax_rate))
+
+    def inputs(self) -> WACCInputs | None:
+        """Resolves beta, market values, cost of debt and tax rate once."""
+        market_vals = self.market_values()
+        beta = self.context.market.beta
+        rd = self.cost_of_debt()
+        tc = self.effective_tax_rate()
+        if market_vals is None or any(v is None for v in [beta, rd, tc]):
+            self.fs.diagnostics.unavailable("WACC inputs", "market values, Beta, Cost of Debt or Tax Rate missing")
             return None
+        return WACCInputs(beta=beta, market_equity=market_vals["equity"], market_debt=market_vals["debt"],
+                          cost_of_debt=rd, tax_rate=tc)
 
     def calculate(self, risk_free_rate: float, equity_risk_premium: float) -> float | None:
         """Calculates the Weighted Average Cost of Capital (WACC)."""
@@ -92,8 +144,8 @@ class WACCCalculator:
         tc = self.effective_tax_rate()
 
         if any(v is None for v in [re, rd, tc]):
-            logging.warning(f"For ticker {self.ticker.ticker}, could not calculate WACC due to missing components (Cost of Equity, Debt, or Tax Rate).")
+            self.fs.diagnostics.unavailable("WACC", "missing components (Cost of Equity, Debt, or Tax Rate)")
             return None
 
-        wacc = (weight_equity * re) + (weight_debt * rd * (1 - tc))
+        wacc = self.weighted(weight_equity, weight_debt, re, rd, tc)
         return wacc
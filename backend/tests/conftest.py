@@ -0,0 +1,50 @@
+from dataclasses import dataclass
+from pathlib import Path
+import sys
+import threading
+import time
+
+HERE = Path(__file__).resolve().parent
+sys.path[:0] = [str(HERE.parent / "src"), str(HERE.parents[1])]  # backend/src packages and the repo-root modules
+
+from core import SyntheticProvider
+
+"""
+Shared stubs for the tests: every provider here is offline and deterministic, so
+the suite runs without network access or yfinance.
+"""
+
+
+@dataclass(frozen=True)
+class SlowProvider(SyntheticProvider):
+    """SyntheticProvider that sleeps `latency` seconds per request, like a remote API, and fails for `failing` symbols."""
+    latency: float = 0.0
+    failing: tuple = ()
+
+    def __post_init__(self):
+        object.__setattr__(self, "counts", {})
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _request(self, symbol: str, kind: str) -> None:
+        with self._lock:
+            self.counts[kind] = self.counts.get(kind, 0) + 1
+        if self.latency:
+            time.sleep(self.latency)
+        if symbol in self.failing:
+            raise ConnectionError(f"stub failure for {symbol}")
+
+    def income(self, symbol):
+        self._request(symbol, "income")
+        return super().income(symbol)
+
+    def balance(self, symbol):
+        self._request(symbol, "balance")
+        return super().balance(symbol)
+
+    def info(self, symbol):
+        self._request(symbol, "info")
+        return super().info(symbol)
+
+    def last_closes(self, symbols):
+        self._request("", "last_closes")  # one bulk request for every symbol
+        return {s: SyntheticProvider.info(self, s)["currentPrice"] for s in symbols}
@@ -0,0 +1,125 @@
+from collections import defaultdict, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Deque, Dict, List, Tuple
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+import time
+
+from core import SyntheticProvider, frame_to_json
+
+"""
+Local stand-in for the statement API core.remote expects, serving SyntheticProvider
+data in its JSON layout (<SYMBOL>/{income,balance,info,history}).
+
+Failures are scripted per path: `fail(path, status, times, retry_after)` answers
+the next `times` requests for `path` with `status` before serving it normally.
+`delay` slows every response down (to keep requests in flight), `chunked` sends
+bodies with Transfer-Encoding: chunked and `drop_connections` closes every
+connection after one response while still advertising keep-alive, like a server
+whose idle timeout already expired.
+
+    with StubServer() as stub:
+        provider = HTTPProvider(stub.url)
+"""
+
+
+class StubServer:
+
+    def __init__(self, provider: SyntheticProvider | None = None, delay: float = 0.0,
+                 chunked: bool = False, drop_connections: bool = False):
+        self.provider = provider or SyntheticProvider()
+        self.delay = delay
+        self.chunked = chunked
+        self.drop_connections = drop_connections
+        self.requests: List[Tuple[float, str, int]] = []  # (arrival, path, status)
+        self.connections = 0
+        self._failures: Dict[str, Deque[Tuple[int, float | None]]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        handler = type("BoundStubHandler", (_StubHandler,), {"stub": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+
+    def fail(self, path: str, status: int, times: int = 1, retry_after: float | None = None) -> None:
+        with self._lock:
+            self._failures[path].extend([(status, retry_after)] * times)
+
+    def count(self, path: str | None = None) -> int:
+        with self._lock:
+            return sum(1 for _, p, _ in self.requests if path is None or p == path)
+
+    def arrivals(self, path: str) -> List[float]:
+        with self._lock:
+            return [t for t, p, _ in self.requests if p == path]
+
+    def __enter__(self):
+        threading.Thread(target=self.server.serve_forever, name="stub-server", daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def _respond(self, path: str, query: dict) -> Tuple[int, dict, object]:
+        with self._lock:
+            failures = self._failures.get(path)
+            failure = failures.popleft() if failures else None
+        if failure is not None:
+            status, retry_after = failure
+            headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else {}
+            return status, headers, {"error": "scripted failure"}
+        parts = path.strip("/").split("/")
+        if len(parts) != 2:
+            return 404, {}, {"error": "not found"}
+        symbol, resource = parts
+        if symbol == "MISSING":
+            return 404, {}, {"error": "no data"}
+        if resource in ("income", "balance"):
+            return 200, {}, frame_to_json(getattr(self.provider, resource)(symbol))
+        if resource == "info":
+            return 200, {}, self.provider.info(symbol)
+        if resource == "history":
+            history = self.provider.history(symbol, period=query.get("period", ["1d"])[-1])
+            return 200, {}, frame_to_json(history[["Close"]])
+        return 404, {}, {"error": "not found"}
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    stub: StubServer
+
+    def setup(self):
+        super().setup()
+        with self.stub._lock:
+            self.stub.connections += 1
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        arrival = time.monotonic()
+        status, headers, body = self.stub._respond(url.path, parse_qs(url.query))
+        with self.stub._lock:
+            self.stub.requests.append((arrival, url.path, status))
+        if self.stub.delay:
+            time.sleep(self.stub.delay)
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if self.stub.chunked:
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for start in range(0, len(data), 1000):
+                piece = data[start:start + 1000]
+                self.wfile.write(f"{len(piece):x}\r\n".encode() + piece + b"\r\n")
+            self.wfile.write(b"0\r\n\r\n")
+        else:
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+        if self.stub.drop_connections:
+            self.close_connection = True  # without a Connection: close header
+
+    def log_message(self, format, *args):
+        pass
@@ -0,0 +1,32 @@
+import polars as pl
+import pytest
+
+from FCFFBuilder import FCFFBuilder
+
+WIDE = pl.DataFrame({
+    "period": ["2021", "2022", "2023"],
+    "OperatingIncome": [100.0, 120.0, 90.0],
+    "DepreciationAmortization": [10.0, 12.0, 11.0],
+    "Capex": [15.0, 18.0, 14.0],
+    "ChangeInAR": [1.0, 2.0, -1.0],
+    "ChangeInInventory": [0.0, 1.0, 0.0],
+    "ChangeInAP": [0.5, 0.5, 0.5],
+})
+
+
+def test_tax_rate_falls_back_to_one_value_per_row():
+    rates = FCFFBuilder.estimate_tax_rate(WIDE)
+    assert rates.name == "TaxRateEst"
+    assert rates.to_list() == [0.21, 0.21, 0.21]
+
+
+def test_tax_rate_is_clamped_effective_rate():
+    df = WIDE.with_columns(EBT=pl.Series([100.0, -5.0, 50.0]), TaxExpense=pl.Series([20.0, 3.0, 40.0]))
+    assert FCFFBuilder.estimate_tax_rate(df).to_list() == [0.2, 0.5, 0.5]
+
+
+def test_fcff_uses_the_fallback_rate():
+    fcff = FCFFBuilder().compute_fcff(WIDE)
+    expected = [oi * 0.79 + da - capex - dnwc for oi, da, capex, dnwc in
+                zip([100.0, 120.0, 90.0], [10.0, 12.0, 11.0], [15.0, 18.0, 14.0], [0.5, 2.5, -1.5])]
+    assert fcff["FCFF"].to_list() == pytest.approx(expected)
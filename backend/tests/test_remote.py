@@ -0,0 +1,139 @@
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from core import AsyncHTTPProvider, HTTPProvider, SyntheticProvider, frame_from_json, frame_to_json
+from core.remote import HTTPError
+from stub_server import StubServer
+
+SYMBOLS = [f"T{i:02d}" for i in range(6)]
+
+
+def run(coroutine_fn, url, **options):
+    """Runs coroutine_fn(provider) against `url` on a fresh event loop."""
+    async def main():
+        provider = AsyncHTTPProvider(url, **{"backoff": 0.01, "rate": 1000, "burst": 1000, **options})
+        try:
+            return await coroutine_fn(provider)
+        finally:
+            await provider.close()
+    return asyncio.run(main())
+
+
+def test_frame_json_round_trip():
+    frame = SyntheticProvider(missing_rate=0.2).income("AAA")
+    pd.testing.assert_frame_equal(frame_from_json(frame_to_json(frame)), frame, check_freq=False)
+
+
+@pytest.mark.parametrize("chunked", [False, True])
+def test_http_provider_matches_the_data_it_serves(chunked):
+    source = SyntheticProvider()
+    with StubServer(source, chunked=chunked) as stub:
+        provider = HTTPProvider(stub.url)
+        try:
+            for symbol in SYMBOLS[:2]:
+                pd.testing.assert_frame_equal(provider.income(symbol), source.income(symbol), check_freq=False)
+                pd.testing.assert_frame_equal(provider.balance(symbol), source.balance(symbol), check_freq=False)
+                assert provider.info(symbol) == source.info(symbol)
+            assert provider.last_closes(SYMBOLS) == pytest.approx(source.last_closes(SYMBOLS))
+        finally:
+            provider.close()
+
+
+def test_missing_data_is_empty_not_an_error():
+    with StubServer() as stub:
+        assert run(lambda p: p.income("MISSING"), stub.url).empty
+        assert run(lambda p: p.info("MISSING"), stub.url) == {}
+
+
+def test_5xx_is_retried_after_retry_after():
+    with StubServer() as stub:
+        stub.fail("/AAA/info", 503, times=2, retry_after=0.2)
+        start = time.monotonic()
+        info = run(lambda p: p.info("AAA"), stub.url)
+    assert info == SyntheticProvider().info("AAA")
+    assert stub.count("/AAA/info") == 3
+    assert time.monotonic() - start >= 0.4
+
+
+def test_gives_up_after_the_last_retry():
+    with StubServer() as stub:
+        stub.fail("/AAA/info", 500, times=5)
+        with pytest.raises(HTTPError) as error:
+            run(lambda p: p.info("AAA"), stub.url, retries=2)
+    assert error.value.status == 500
+    assert stub.count("/AAA/info") == 3
+
+
+def test_client_errors_are_not_retried():
+    with StubServer() as stub:
+        stub.fail("/AAA/info", 401)
+        with pytest.raises(HTTPError):
+            run(lambda p: p.info("AAA"), stub.url)
+    assert stub.count("/AAA/info") == 1
+
+
+def test_429_pauses_every_request_not_just_the_limited_one():
+    async def fetch(provider):
+        first = asyncio.ensure_future(provider.info("AAA"))
+        await asyncio.sleep(0.1)  # AAA has had its 429 by now
+        return await asyncio.gather(first, provider.info("BBB"))
+
+    with StubServer() as stub:
+        stub.fail("/AAA/info", 429, retry_after=0.5)
+        run(fetch, stub.url)
+        limited, retried = stub.arrivals("/AAA/info")
+        (other,) = stub.arrivals("/BBB/info")
+    assert retried - limited >= 0.5
+    assert other - limited >= 0.5  # BBB waited for the pause although it never got a 429
+
+
+def test_concurrent_requests_for_one_resource_are_coalesced():
+    async def fetch(provider):
+        return await asyncio.gather(*(provider.income("AAA") for _ in range(10)))
+
+    with StubServer(delay=0.1) as stub:
+        frames = run(fetch, stub.url)
+    assert stub.count("/AAA/income") == 1
+    assert all(frame.equals(frames[0]) for frame in frames)
+
+
+def test_keep_alive_connections_are_reused():
+    async def fetch(provider):
+        for symbol in SYMBOLS:
+            await provider.info(symbol)
+
+    with StubServer() as stub:
+        run(fetch, stub.url)
+    assert stub.count() == len(SYMBOLS)
+    assert stub.connections == 1
+
+
+def test_stale_keep_alive_connection_is_replaced_without_a_retry():
+    async def fetch(provider):
+        return [await provider.info(symbol) for symbol in SYMBOLS]
+
+    with StubServer(drop_connections=True) as stub:
+        infos = run(fetch, stub.url, retries=0)
+    assert infos == [SyntheticProvider().info(s) for s in SYMBOLS]
+    assert stub.count() == len(SYMBOLS)
+    assert stub.connections == len(SYMBOLS)
+
+
+def test_http_provider_can_be_used_again_after_close():
+    with StubServer(delay=0.02) as stub:
+        provider = HTTPProvider(stub.url, max_connections=2, rate=1000, burst=1000)
+        try:
+            # More threads than connections, so requests wait on the pool's semaphore,
+            # which binds it to the running loop
+            with ThreadPoolExecutor(8) as pool:
+                list(pool.map(provider.info, SYMBOLS))
+            provider.close()
+            with ThreadPoolExecutor(8) as pool:
+                infos = list(pool.map(provider.info, SYMBOLS))
+        finally:
+            provider.close()
+    assert infos == [SyntheticProvider().info(s) for s in SYMBOLS]
@@ -0,0 +1,123 @@
+from concurrent.futures import ThreadPoolExecutor
+from urllib.error import HTTPError
+from urllib.request import Request, urlopen
+import json
+import threading
+
+import pandas as pd
+import pytest
+
+from conftest import SlowProvider
+from core import DiagnosticsCollector, FinancialContext, HTTPProvider, SyntheticProvider
+from screening import compute_report, run_batch
+from service import ValuationService, make_server
+from service.app import to_json
+
+SYMBOLS = [f"T{i:02d}" for i in range(20)]
+
+
+@pytest.fixture
+def provider():
+    return SlowProvider()
+
+
+@pytest.fixture
+def service_url(provider):
+    service = ValuationService(provider)
+    server = make_server(service, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    service.close()
+
+
+def call(url: str, body: dict | None = None, data: bytes | None = None):
+    """(status, decoded JSON) of a GET, or of a POST when a body is given."""
+    if body is not None:
+        data = json.dumps(body).encode()
+    request = Request(url, data=data, method="POST" if data is not None else "GET")
+    try:
+        with urlopen(request, timeout=30) as response:
+            return response.status, json.loads(response.read())
+    except HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_report_matches_compute_report(service_url):
+    context = FinancialContext("T01", SyntheticProvider()).load()
+    status, body = call(f"{service_url}/tickers/T01/report")
+    assert status == 200
+    assert body == pytest.approx(to_json(compute_report(context, 0.04, 0.05)), nan_ok=True)
+
+
+@pytest.mark.parametrize("route", ["ratios", "ratios?history=1", "wacc", "dcf", "dcf?exit_multiple=8", "diagnostics"])
+def test_ticker_routes(service_url, route):
+    status, body = call(f"{service_url}/tickers/t02/{route}")
+    assert status == 200
+    assert body["ticker"] == "T02"
+
+
+def test_batch_get_and_post_return_rows_in_order(service_url):
+    status, body = call(f"{service_url}/batch?tickers=T03,T01,T03,T02&wacc=0.08")
+    assert status == 200
+    assert [row["ticker"] for row in body["rows"]] == ["T03", "T01", "T02"]
+    assert all(row["wacc"] == 0.08 and row["error"] is None for row in body["rows"])
+    status, posted = call(f"{service_url}/batch", {"tickers": ["T03", "T01", "T02"], "wacc": 0.08})
+    assert status == 200
+    assert posted == body
+
+
+@pytest.mark.parametrize("url, body, data", [
+    ("/batch?tickers=,", None, None),
+    ("/batch", {"tickers": []}, None),
+    ("/batch", {"tickers": "T01", "wacc": "abc"}, None),
+    ("/tickers/T01/wacc?risk_free_rate=nan", None, None),
+    ("/tickers/T01/dcf?terminal_growth=inf", None, None),
+    ("/batch", None, b"{not json"),
+    ("/batch", None, b"[1, 2]"),
+])
+def test_bad_parameters_are_400(service_url, url, body, data):
+    status, payload = call(service_url + url, body, data)
+    assert status == 400
+    assert "error" in payload
+
+
+def test_unknown_route_is_404(service_url):
+    status, payload = call(f"{service_url}/nope")
+    assert status == 404
+    assert "error" in payload
+
+
+def test_concurrent_requests_share_warm_data(service_url, provider):
+    urls = [f"{service_url}/tickers/{SYMBOLS[i % len(SYMBOLS)]}/{route}"
+            for i in range(100) for route in ("report", "ratios", "wacc", "dcf")]
+    with ThreadPoolExecutor(32) as pool:
+        statuses = [status for status, _ in pool.map(call, urls)]
+    assert statuses == [200] * len(urls)
+    # Every ticker was fetched once, however many requests asked for it
+    assert provider.counts["income"] == provider.counts["balance"] == len(SYMBOLS)
+    _, metrics = call(f"{service_url}/metrics")
+    assert sum(route["count"] for name, route in metrics["routes"].items() if name.startswith("GET /tickers")) == len(urls)
+    assert metrics["contexts"] == len(SYMBOLS)
+
+
+def test_invalidate_refetches(service_url, provider):
+    call(f"{service_url}/tickers/T01/report")
+    status, _ = call(f"{service_url}/invalidate?ticker=T01", data=b"")
+    assert status == 200
+    call(f"{service_url}/tickers/T01/report")
+    assert provider.counts["income"] == 2
+
+
+def test_http_provider_reads_the_data_routes(service_url):
+    source = SyntheticProvider()
+    remote = HTTPProvider(f"{service_url}/data")
+    try:
+        pd.testing.assert_frame_equal(remote.income("T01"), source.income("T01"), check_freq=False)
+        assert remote.info("T01") == source.info("T01")
+        through = run_batch(SYMBOLS[:5], 0.04, 0.05, provider=remote, diagnostics=DiagnosticsCollector())
+    finally:
+        remote.close()
+    direct = run_batch(SYMBOLS[:5], 0.04, 0.05, provider=source, diagnostics=DiagnosticsCollector())
+    pd.testing.assert_frame_equal(through, direct)